@@ -0,0 +1,231 @@
+'''Micro-benchmark comparing the BufferedIterator ring buffer engine with the
+original deque based engine.
+
+Usage (from the repository root):
+    python benchmarks/bench_buffered_iterator.py [num_items] [repeats]
+'''
+# pylint: disable=protected-access
+#%% Imports
+import sys
+import timeit
+import logging
+from pathlib import Path
+from collections import deque
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from buffered_iterator import BufferedIterator  # pylint: disable=wrong-import-position
+from buffered_iterator import BufferedIteratorEOF  # pylint: disable=wrong-import-position
+from buffered_iterator import BufferedIteratorValueError  # pylint: disable=wrong-import-position
+from buffered_iterator import BufferOverflowWarning  # pylint: disable=wrong-import-position
+
+
+#%% Reference Engine
+logger = logging.getLogger('Buffered Iterator')
+
+
+class DequeBufferedIterator():
+    '''The original BufferedIterator engine, using two deques.
+
+    Only the methods exercised by the benchmarks are included, with the
+    original debug logging calls.  Items are moved one at a time between
+    previous_items and future_items.
+    '''
+    def __init__(self, source, buffer_size=5):
+        self._buffer_size = buffer_size
+        self.source_gen = iter(source)
+        self.previous_items = deque(maxlen=buffer_size)
+        self.future_items = deque(maxlen=buffer_size)
+        self._step_back = 0
+        self._item_count = 0
+
+    @property
+    def buffer_size(self)->int:
+        return self._buffer_size
+
+    @property
+    def item_count(self) -> int:
+        return int(self._item_count)
+
+    @property
+    def step_back(self) -> int:
+        return self._step_back
+
+    @step_back.setter
+    def step_back(self, steps: int):
+        logger.debug(f'Have {len(self.previous_items)} Previous Items')
+        logger.debug(f'Need {steps} Steps back')
+        steps = self.check_steps(steps)
+        self._step_back = steps
+        self.rewind()
+
+    def get_next_item(self):
+        if len(self.future_items) > 0:
+            next_item = self.future_items.popleft()
+            self._item_count += 1
+            logger.debug(f'Getting item: {next_item}\t from future_items')
+        else:
+            try:
+                next_item = self.source_gen.__next__()
+            except (StopIteration, RuntimeError) as eof:
+                raise BufferedIteratorEOF from eof
+            self._item_count += 1
+            logger.debug(f'Getting item: {next_item}\t from source')
+        return next_item
+
+    def __next__(self):
+        next_line = self.get_next_item()
+        self.previous_items.append(next_line)
+        return next_line
+
+    def __iter__(self):
+        while True:
+            try:
+                next_line = self.__next__()
+            except BufferedIteratorEOF:
+                break
+            yield next_line
+
+    def check_steps(self, steps: int, backwards=True, skip=False)->int:
+        steps = int(steps)
+        if steps < 0:
+            raise BufferedIteratorValueError(
+                f'steps must be a positive integer. Got: {steps}')
+        if backwards:
+            if len(self.previous_items) < steps:
+                raise BufferedIteratorValueError(
+                    f"Can't step back {steps} items.")
+        elif not skip:
+            if steps > self.buffer_size:
+                raise BufferedIteratorValueError(
+                    f'The value of steps ({steps}) exceeds the buffer_size.')
+        return steps
+
+    def rewind(self):
+        for step in range(self._step_back): # pylint: disable=unused-variable
+            self._step_back -= 1
+            self._item_count -= 1
+            if len(self.previous_items) > 0:
+                self.future_items.appendleft(self.previous_items.pop())
+        self._step_back = 0
+
+    def backup(self, steps: int = 1):
+        self.step_back = steps
+        self.rewind()
+
+    def advance(self, steps: int = 1, buffer_overrun=False):
+        steps = self.check_steps(steps, backwards=False, skip=buffer_overrun)
+        for step in range(steps):  # pylint: disable=unused-variable
+            try:
+                next_item = self.get_next_item()
+            except BufferedIteratorEOF as eof:
+                raise BufferOverflowWarning('advance exceeds source') from eof
+            self.previous_items.append(next_item)
+
+    def look_ahead(self, steps: int = 1):
+        steps = self.check_steps(steps, backwards=False, skip=False)
+        read_ahead = steps - len(self.future_items)
+        if read_ahead > 0:
+            self.advance(read_ahead)
+            self.backup(read_ahead)
+        return self.future_items[steps-1]
+
+    def goto_item(self, item_num: int, buffer_overrun=False):
+        current_item = self.item_count
+        steps = current_item - item_num
+        if steps == 0:
+            logger.debug(f'Current item number is {current_item}. '
+                         f'Requested item is {item_num}.'
+                         'Already at requested item.')
+        elif steps < 0:
+            logger.debug(f'Current item number is {current_item}. '
+                         f'Requested item is {item_num}.'
+                         f'Advancing {-steps} item(s).')
+            self.advance(-steps, buffer_overrun)
+        else:
+            logger.debug(f'Current item number is {current_item}. '
+                         f'Requested item is {item_num}. '
+                         f'Moving backwards {steps} item(s).')
+            self.backup(steps)
+
+    def link(self, other, include_previous_items=True,
+             include_future_items=False):
+        self._step_back = other._step_back
+        self._item_count = other._item_count
+        self.previous_items.clear()
+        self.future_items.clear()
+        if include_previous_items:
+            self.previous_items.extend(other.previous_items)
+        if include_future_items:
+            self.future_items.extend(other.future_items)
+
+
+#%% Benchmark Cases
+def iterate(engine: type, items: List[str]):
+    '''Plain iteration through all items.'''
+    for item in engine(items):  # pylint: disable=unused-variable
+        pass
+
+
+def peek_each(engine: type, items: List[str]):
+    '''Look ahead one item before consuming each item.'''
+    source = engine(items)
+    for idx in range(len(items) - 1):  # pylint: disable=unused-variable
+        source.look_ahead(1)
+        next(source)
+
+
+def step_back_each(engine: type, items: List[str]):
+    '''Read two items and step back one, as a 'Before' SectionBreak does.'''
+    source = engine(items)
+    for idx in range(len(items) - 1):  # pylint: disable=unused-variable
+        next(source)
+        next(source)
+        source.backup(1)
+
+
+def goto_jumps(engine: type, items: List[str]):
+    '''Read ahead and jump back within the buffer with goto_item.'''
+    source = engine(items)
+    for idx in range(0, len(items) - 5, 4):
+        source.goto_item(idx + 5)
+        source.goto_item(idx + 4)
+
+
+def link_each(engine: type, items: List[str]):
+    '''Link a second iterator to the first after every item.'''
+    source = engine(items)
+    linked = engine([])
+    for item in source:  # pylint: disable=unused-variable
+        linked.link(source)
+
+
+BENCHMARKS: Dict[str, Callable[[type, List[str]], None]] = {
+    'iterate': iterate,
+    'look_ahead(1)': peek_each,
+    'next, next, backup(1)': step_back_each,
+    'goto_item': goto_jumps,
+    'link': link_each,
+    }
+
+
+def run(num_items: int = 200000, repeats: int = 3):
+    '''Time each benchmark case with both engines and print a summary table.
+    '''
+    items = [f'Line {i}' for i in range(num_items)]
+    print(f'{num_items} items, best of {repeats}')
+    print(f'{"Case":<24s}{"deque (s)":>12s}{"ring (s)":>12s}{"speedup":>10s}')
+    for name, case in BENCHMARKS.items():
+        times = {}
+        for engine in (DequeBufferedIterator, BufferedIterator):
+            timer = timeit.Timer(lambda: case(engine, items))  # pylint: disable=cell-var-from-loop
+            times[engine] = min(timer.repeat(repeat=repeats, number=1))
+        old_time = times[DequeBufferedIterator]
+        new_time = times[BufferedIterator]
+        print(f'{name:<24s}{old_time:>12.4f}{new_time:>12.4f}'
+              f'{old_time / new_time:>9.2f}x')
+
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in sys.argv[1:3]])
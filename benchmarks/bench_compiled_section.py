@@ -0,0 +1,145 @@
+'''Benchmark comparing Section.read with a compiled section tree.
+
+Two section trees are read from synthetic text:
+    nested records: Four levels of subsections with light processing, where
+        the cost of passing items between the levels dominates.
+    DVH file: The section definitions from examples/read_dvh_file.py, with
+        list assemblers for the top two levels and the DVH curve read as
+        lists of floats.
+
+Usage (from the repository root):
+    python benchmarks/bench_compiled_section.py [num_blocks] [repeats]
+'''
+#%% Imports
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'examples'))
+
+from sections import Section  # pylint: disable=wrong-import-position
+
+
+#%% Nested Records
+def nested_records_text(num_blocks: int)->List[str]:
+    '''Build text with chapters containing records of field lines.'''
+    lines = ['Document header', '']
+    for chapter in range(num_blocks):
+        lines.append(f'CHAPTER {chapter}')
+        for record in range(5):
+            lines.append(f'RECORD {chapter}.{record}')
+            lines.extend(f'  field {field}: value {field * record}'
+                         for field in range(8))
+    return lines
+
+
+def nested_records_section()->Section:
+    '''Document -> Chapter -> Record -> (Title, Fields).'''
+    title = Section(name='Title', end_section=True)
+    fields = Section(name='Fields', processor=[str.strip])
+    record = Section(name='Record',
+                     start_section=('RECORD', 'START', 'Before'),
+                     end_section=('RECORD', 'START', 'Before'),
+                     processor=[(title, fields)])
+    chapter = Section(name='Chapter',
+                      start_section=('CHAPTER', 'START', 'Before'),
+                      end_section=('CHAPTER', 'START', 'Before'),
+                      processor=[record])
+    return Section(name='Document', processor=[chapter])
+
+
+#%% DVH File
+def dvh_text(num_blocks: int)->List[str]:
+    '''Build a DVH text file with num_blocks structures.'''
+    lines = [
+        'Patient Name         : ____, ____',
+        'Patient ID           : 1234567',
+        'Comment              : DVHs for multiple plans and plan sums',
+        'Date                 : Friday, January 17, 2020 09:45:07',
+        'Exported by          : gsal',
+        'Type                 : Cumulative Dose Volume Histogram',
+        'Description          : The cumulative DVH displays the percentage',
+        '',
+        'Plan: PARR',
+        'Course: C1',
+        'Plan Status: Treatment Approved Thursday, January 02, 2020 '
+        '12:55:56 by gsal',
+        'Prescribed dose [cGy]: 5000.0',
+        '% for dose (%): 100.0',
+        '',
+        ]
+    for structure in range(num_blocks):
+        lines.extend([
+            f'Structure: PTV {structure}',
+            'Approval Status: Approved',
+            'Plan: PARR',
+            'Course: C1',
+            'Volume [cm³]: 121.5',
+            'Dose Cover.[%]: 100.0',
+            'Min Dose [cGy]: 36.7',
+            'Max Dose [cGy]: 3670.1',
+            'Mean Dose [cGy]: 891.9',
+            '',
+            'Dose [cGy] Ratio of Total Structure Volume [%]',
+            ])
+        lines.extend(f'{dose:10d}{100 - dose / 100:26.4f}'
+                     for dose in range(0, 5000, 250))
+        lines.append('')
+    return lines
+
+
+def dvh_section()->Section:
+    '''The examples/read_dvh_file.py section tree, assembled as lists.'''
+    import read_dvh_file as dvh  # pylint: disable=import-outside-toplevel
+    dose_curve_section = Section(
+        name='DVH Curve',
+        start_search=False,
+        end_section=('Structure:', 'START', 'Before'),
+        processor=[dvh.split_data_points, dvh.drop_blanks])
+    dvh_dose = Section(
+        name='DVH Dose',
+        start_section=('Structure:', 'START', 'Before'),
+        processor=[(dvh.dose_info_section,
+                    dvh.dose_header_section,
+                    dose_curve_section)])
+    all_plans = Section(
+        name='All Plans',
+        start_section=(['Plan:', 'Plan sum:'], 'START', 'Before'),
+        end_section=('Structure', 'START', 'Before'),
+        processor=[dvh.plan_info_section])
+    return Section(name='DVH File',
+                   processor=[(dvh.dvh_info_section, all_plans, dvh_dose)])
+
+
+BENCHMARKS: Dict[str, Tuple[Callable[[], Section],
+                            Callable[[int], List[str]]]] = {
+    'nested records': (nested_records_section, nested_records_text),
+    'DVH file': (dvh_section, dvh_text),
+    }
+
+
+def run(num_blocks: int = 500, repeats: int = 3):
+    '''Time Section.read and CompiledSection.read on each section tree and
+    print a summary table.
+    '''
+    print(f'{num_blocks} blocks, best of {repeats}')
+    print(f'{"Case":<18s}{"lines":>8s}{"read (s)":>12s}{"compiled (s)":>14s}'
+          f'{"speedup":>10s}')
+    for name, (make_section, make_text) in BENCHMARKS.items():
+        section = make_section()
+        compiled = section.compile()
+        lines = make_text(num_blocks)
+        if section.read(lines) != compiled.read(lines):
+            raise AssertionError(f'{name}: compiled output does not match.')
+        read_time = min(timeit.Timer(lambda: section.read(lines)).repeat(  # pylint: disable=cell-var-from-loop
+            repeat=repeats, number=1))
+        compiled_time = min(timeit.Timer(lambda: compiled.read(lines)).repeat(  # pylint: disable=cell-var-from-loop
+            repeat=repeats, number=1))
+        print(f'{name:<18s}{len(lines):>8d}{read_time:>12.4f}'
+              f'{compiled_time:>14.4f}{read_time / compiled_time:>9.2f}x')
+
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,80 @@
+'''Benchmark comparing per-line numeric parsing with NumericBlockParser.
+
+A DVH curve style section of numeric rows is read two ways:
+    per line: split_data_points and drop_blanks from
+        examples/read_dvh_file.py, followed by np.array.
+    block: NumericBlockParser as the section assemble function.
+
+Both the run time and the peak memory allocated during the read are
+reported.
+
+Usage (from the repository root):
+    python benchmarks/bench_numeric_block.py [num_rows] [repeats]
+'''
+#%% Imports
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'examples'))
+
+import text_reader as tp  # pylint: disable=wrong-import-position
+from sections import Section  # pylint: disable=wrong-import-position
+
+
+#%% Sections
+def curve_text(num_rows: int)->List[str]:
+    '''Build DVH curve rows of dose, relative dose and volume.'''
+    lines = ['Dose [cGy] Relative dose [%] Ratio of Total Structure Volume [%]']
+    lines.extend(f'{dose:10d}{dose / 50:18.3f}{100 - dose / num_rows:26.6f}'
+                 for dose in range(num_rows))
+    lines.append('')
+    return lines
+
+
+def per_line_section()->Section:
+    '''The original DVH curve section, assembled into an array.'''
+    import read_dvh_file as dvh  # pylint: disable=import-outside-toplevel
+    return Section(name='DVH Curve', start_search=False,
+                   processor=[dvh.split_data_points, dvh.drop_blanks],
+                   assemble=lambda rows: np.array(list(rows)))
+
+
+def block_section()->Section:
+    '''The DVH curve section using NumericBlockParser.'''
+    return Section(name='DVH Curve', start_search=False,
+                   assemble=tp.NumericBlockParser())
+
+
+def peak_memory(read: Callable[[], np.ndarray])->int:
+    '''The peak memory in bytes allocated while calling read.'''
+    tracemalloc.start()
+    read()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def run(num_rows: int = 100000, repeats: int = 3):
+    '''Time both readers and print a summary table.'''
+    lines = curve_text(num_rows)[1:]
+    readers = {'per line': per_line_section(), 'block': block_section()}
+    results = {name: section.read(lines) for name, section in readers.items()}
+    if not np.array_equal(results['per line'], results['block']):
+        raise AssertionError('Block parser output does not match.')
+    print(f'{num_rows} rows, best of {repeats}')
+    print(f'{"Reader":<12s}{"time (s)":>10s}{"peak (MB)":>12s}')
+    for name, section in readers.items():
+        read = lambda: section.read(lines)  # pylint: disable=cell-var-from-loop
+        read_time = min(timeit.Timer(read).repeat(repeat=repeats, number=1))
+        peak = peak_memory(read) / 2**20
+        print(f'{name:<12s}{read_time:>10.4f}{peak:>12.1f}')
+
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,387 @@
+'''Deterministic synthetic text corpora for benchmarks.
+
+Each generator builds a list of text lines in the style of one of the example
+file types, with the size and shape set by its arguments.  Generators use
+random.Random(seed), so the same arguments always give the same text.
+
+Corpora:
+    dvh:        Eclipse DVH exports (examples/read_dvh_file.py): a file header,
+                plan sections and one structure section with a dose curve
+                table for each structure.
+    dir:        Windows DIR command listings (examples/read_dir_file.py): one
+                section per folder, with folders nested to a given depth.
+    printout:   Plan check printouts ("PlanCheckText Test.txt"): upper case
+                section headings followed by 'Name;Value' lines.
+    nested:     Generic nested sections, with the nesting depth and the number
+                of different start sentinels set independently.
+
+Each corpus also has a section tree that reads it (see corpus_section).  Use
+sized_corpus to generate a corpus with approximately a given number of
+lines.
+'''
+#%% Imports
+import re
+import sys
+import inspect
+import random
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'examples'))
+
+from sections import Rule, RuleSet, Section  # pylint: disable=wrong-import-position
+
+
+#%% Generators
+def dvh_corpus(num_sections: int = 100, curve_rows: int = 100,
+               num_plans: int = 1, seed: int = 0)->List[str]:
+    '''Build a DVH export.
+
+    Args:
+        num_sections (int, optional): The number of structures. Defaults to
+            100.
+        curve_rows (int, optional): The number of dose curve rows for each
+            structure. Defaults to 100.
+        num_plans (int, optional): The number of plan sections. Defaults to 1.
+        seed (int, optional): The random seed. Defaults to 0.
+    Returns:
+        List[str]: The lines of the file.
+    '''
+    rng = random.Random(seed)
+    lines = [
+        'Patient Name         : ____, ____',
+        'Patient ID           : 1234567',
+        'Comment              : DVHs for multiple plans and plan sums',
+        'Date                 : Friday, January 17, 2020 09:45:07',
+        'Exported by          : gsal',
+        'Type                 : Cumulative Dose Volume Histogram',
+        'Description          : The cumulative DVH displays the percentage',
+        '',
+        ]
+    for plan in range(num_plans):
+        lines.extend([
+            f'Plan: PLAN{plan}',
+            'Course: C1',
+            'Plan Status: Treatment Approved Thursday, January 02, 2020 '
+            '12:55:56 by gsal',
+            f'Prescribed dose [cGy]: {rng.choice([4500, 5000, 6000])}.0',
+            '% for dose (%): 100.0',
+            '',
+            ])
+    for structure in range(num_sections):
+        max_dose = rng.uniform(1000, 7000)
+        lines.extend([
+            f'Structure: ROI {structure}',
+            'Approval Status: Approved',
+            f'Plan: PLAN{structure % num_plans}',
+            'Course: C1',
+            f'Volume [cm³]: {rng.uniform(1, 1500):.1f}',
+            'Dose Cover.[%]: 100.0',
+            f'Min Dose [cGy]: {rng.uniform(0, 100):.1f}',
+            f'Max Dose [cGy]: {max_dose:.1f}',
+            f'Mean Dose [cGy]: {max_dose / 2:.1f}',
+            '',
+            'Dose [cGy] Ratio of Total Structure Volume [%]',
+            ])
+        step = max_dose / max(curve_rows, 1)
+        lines.extend(f'{row * step:10.0f}{100 * (1 - row / curve_rows):26.4f}'
+                     for row in range(curve_rows))
+        lines.append('')
+    return lines
+
+
+def dir_corpus(num_sections: int = 100, files_per_folder: int = 10,
+               depth: int = 3, seed: int = 0)->List[str]:
+    '''Build a DIR /S listing.
+
+    Args:
+        num_sections (int, optional): The number of folders. Defaults to 100.
+        files_per_folder (int, optional): The number of files listed in each
+            folder. Defaults to 10.
+        depth (int, optional): The maximum folder nesting depth. Defaults to
+            3.
+        seed (int, optional): The random seed. Defaults to 0.
+    Returns:
+        List[str]: The lines of the listing.
+    '''
+    rng = random.Random(seed)
+    lines = [' Volume in drive C is Windows',
+             ' Volume Serial Number is DAE7-D5BA',
+             '']
+    folders = [r'c:\Test Dir Structure']
+    for folder_num in range(1, num_sections):
+        parent = rng.choice([folder for folder in folders
+                             if folder.count('\\') < depth])
+        folders.append(f'{parent}\\Dir{folder_num}')
+    total_files = 0
+    total_size = 0
+    for folder in sorted(folders):
+        lines.extend([f' Directory of {folder}', '',
+                      '2021-12-27  03:33 PM    <DIR>          .',
+                      '2021-12-27  03:33 PM    <DIR>          ..'])
+        folder_size = 0
+        for file_num in range(files_per_folder):
+            size = rng.randint(0, 10**6)
+            folder_size += size
+            month = rng.randint(1, 12)
+            day = rng.randint(1, 28)
+            lines.append(f'2016-{month:02d}-{day:02d}  09:59 PM'
+                         f'{size:>18d} File{file_num}.txt')
+        lines.append(f'{files_per_folder:>16d} File(s)'
+                     f'{folder_size:>15d} bytes')
+        lines.append('')
+        total_files += files_per_folder
+        total_size += folder_size
+    lines.extend(['     Total Files Listed:',
+                  f'{total_files:>16d} File(s){total_size:>15d} bytes',
+                  f'{len(folders):>16d} Dir(s)  63927545856 bytes free'])
+    return lines
+
+
+PRINTOUT_HEADINGS = ['PRESCRIPTION', 'IMAGE', 'CALCULATIONS', 'FIELDS',
+                     'DOSE', 'STRUCTURES', 'REFERENCE POINTS', 'OPTIMIZATION',
+                     'APPROVAL', 'SCHEDULE']
+
+
+def printout_corpus(num_sections: int = 100, lines_per_section: int = 20,
+                    num_sentinels: int = 8, seed: int = 0)->List[str]:
+    '''Build a plan check printout.
+
+    Args:
+        num_sections (int, optional): The number of headed sections. Defaults
+            to 100.
+        lines_per_section (int, optional): The number of 'Name;Value' lines in
+            each section. Defaults to 20.
+        num_sentinels (int, optional): The number of different section
+            headings used.  Defaults to 8.
+        seed (int, optional): The random seed. Defaults to 0.
+    Returns:
+        List[str]: The lines of the printout.
+    '''
+    rng = random.Random(seed)
+    headings = printout_headings(num_sentinels)
+    lines = ['PlanCheck;Test 1234567 TestPlan',
+             'Patient Name;Patient, Test ',
+             'Patient Id; 01234567']
+    for section_num in range(num_sections):
+        lines.append(headings[section_num % len(headings)])
+        for line_num in range(lines_per_section):
+            if rng.random() < 0.2:
+                value = f'{rng.uniform(0, 5000):.1f} cGy'
+            else:
+                value = rng.choice(['PELB FB', 'Head First-Supine', '-',
+                                    'Standard', 'CT', 'Dr Bob'])
+            lines.append(f'Item {line_num};{value}')
+    return lines
+
+
+def printout_headings(num_sentinels: int)->List[str]:
+    '''The first num_sentinels printout section headings.'''
+    headings = list(PRINTOUT_HEADINGS)
+    while len(headings) < num_sentinels:
+        headings.append(f'SECTION {len(headings)}')
+    return headings[:max(num_sentinels, 1)]
+
+
+def nested_corpus(num_sections: int = 100, depth: int = 3,
+                  lines_per_section: int = 10, num_sentinels: int = 1,
+                  seed: int = 0)->List[str]:
+    '''Build text with sections nested depth levels deep.
+
+    Every level starts with a marker line 'LEVEL<level> <tag> <number>',
+    where the tag is one of num_sentinels tags.  The innermost level contains
+    lines_per_section 'key: value' lines.
+
+    Args:
+        num_sections (int, optional): The number of top level sections.
+            Defaults to 100.
+        depth (int, optional): The number of nested levels. Defaults to 3.
+        lines_per_section (int, optional): The number of data lines in each
+            innermost section. Defaults to 10.
+        num_sentinels (int, optional): The number of different marker tags.
+            Defaults to 1.
+        seed (int, optional): The random seed. Defaults to 0.
+    Returns:
+        List[str]: The lines of the text.
+    '''
+    rng = random.Random(seed)
+    tags = nested_tags(num_sentinels)
+    lines = ['Document header', '']
+
+    def add_level(level: int, number: int):
+        lines.append(f'LEVEL{level} {rng.choice(tags)} {number}')
+        if level == depth - 1:
+            lines.extend(f'  key {idx}: {rng.randint(0, 1000)}'
+                         for idx in range(lines_per_section))
+            return
+        for child in range(2):
+            add_level(level + 1, child)
+
+    for number in range(num_sections):
+        add_level(0, number)
+    return lines
+
+
+def nested_tags(num_sentinels: int)->List[str]:
+    '''The marker tags used by nested_corpus.'''
+    return [f'TAG{idx}' for idx in range(max(num_sentinels, 1))]
+
+
+#%% Section Definitions
+def split_pair(line: str, separator: str)->List[str]:
+    '''Split a line into a stripped name and value.'''
+    return [part.strip() for part in line.split(separator, maxsplit=1)]
+
+
+def split_semicolon(line: str)->List[str]:
+    return split_pair(line, ';')
+
+
+def split_colon(line: str)->List[str]:
+    return split_pair(line, ':')
+
+
+def dvh_sections()->Section:
+    '''The examples/read_dvh_file.py section tree, assembled as lists.'''
+    import read_dvh_file as dvh  # pylint: disable=import-outside-toplevel
+    dose_curve_section = Section(
+        name='DVH Curve',
+        start_search=False,
+        end_section=('Structure:', 'START', 'Before'),
+        processor=[dvh.split_data_points, dvh.drop_blanks])
+    dvh_dose = Section(
+        name='DVH Dose',
+        start_section=('Structure:', 'START', 'Before'),
+        processor=[(dvh.dose_info_section,
+                    dvh.dose_header_section,
+                    dose_curve_section)])
+    all_plans = Section(
+        name='All Plans',
+        start_section=(['Plan:', 'Plan sum:'], 'START', 'Before'),
+        end_section=('Structure', 'START', 'Before'),
+        processor=[dvh.plan_info_section])
+    return Section(name='DVH File',
+                   processor=[(dvh.dvh_info_section, all_plans, dvh_dose)])
+
+
+FILE_PATTERN = re.compile(r'^(?P<date>[0-9-]+) +(?P<time>[0-9:]+ [AP]M)'
+                          r' +(?P<size>[0-9]+) (?P<name>.*)$')
+
+
+def file_fields(line: str, event)->List[str]:
+    '''Extract the name and size from a file listing line.'''
+    match = event.test_value
+    return [match['name'], int(match['size'])]
+
+
+def dir_sections()->Section:
+    '''A folder listing section containing a file table.'''
+    files = RuleSet([Rule(FILE_PATTERN, pass_method=file_fields)],
+                    default='None', name='File Rules')
+    folder = Section(name='Folder',
+                     start_section=(' Directory of', 'START', 'Before'),
+                     end_section=('File(s)', 'IN', 'After'),
+                     processor=[files],
+                     assemble=drop_none)
+    return Section(name='Listing', processor=[folder])
+
+
+def drop_none(items: List)->List:
+    '''Remove None items.'''
+    return [item for item in items if item is not None]
+
+
+def printout_sections(num_sentinels: int = 8)->Section:
+    '''A headed printout section reading 'Name;Value' lines.'''
+    headings = printout_headings(num_sentinels)
+    section = Section(name='Printout Section',
+                      start_section=(headings, 'FULL', 'Before'),
+                      end_section=(headings, 'FULL', 'Before'),
+                      processor=[split_semicolon])
+    return Section(name='Printout', processor=[section])
+
+
+def nested_sections(num_sentinels: int = 1, depth: int = 3)->Section:
+    '''Nested sections matching nested_corpus.'''
+    tags = nested_tags(num_sentinels)
+    section = None
+    for level in range(depth - 1, -1, -1):
+        markers = [f'LEVEL{level} {tag}' for tag in tags]
+        if section is None:
+            processor = [split_colon]
+        else:
+            processor = [section]
+        section = Section(name=f'Level {level}',
+                          start_section=(markers, 'START', 'Before'),
+                          end_section=(markers, 'START', 'Before'),
+                          processor=processor)
+    return Section(name='Document', processor=[section])
+
+
+#%% Corpus Registry
+CorpusGenerator = Callable[..., List[str]]
+
+CORPORA: Dict[str, CorpusGenerator] = {
+    'dvh': dvh_corpus,
+    'dir': dir_corpus,
+    'printout': printout_corpus,
+    'nested': nested_corpus,
+    }
+
+SECTIONS: Dict[str, Callable[..., Section]] = {
+    'dvh': dvh_sections,
+    'dir': dir_sections,
+    'printout': printout_sections,
+    'nested': nested_sections,
+    }
+
+
+def corpus_sentinels(name: str, num_sentinels: int = 8,
+                     depth: int = 3)->List[str]:
+    '''The strings that mark section boundaries in a corpus.'''
+    if name == 'dvh':
+        return ['Patient Name', 'Plan:', 'Structure:']
+    if name == 'dir':
+        return [' Directory of', 'File(s)']
+    if name == 'printout':
+        return printout_headings(num_sentinels)
+    return [f'LEVEL{level} {tag}' for level in range(depth)
+            for tag in nested_tags(num_sentinels)]
+
+
+def select_arguments(func: Callable, parameters: Dict[str, int]
+                     )->Dict[str, int]:
+    '''The items in parameters that are arguments of func.'''
+    accepted = inspect.signature(func).parameters
+    return {name: value for name, value in parameters.items()
+            if name in accepted}
+
+
+def corpus_section(name: str, **parameters)->Section:
+    '''The section tree for a corpus generated with parameters.'''
+    builder = SECTIONS[name]
+    return builder(**select_arguments(builder, parameters))
+
+
+def sized_corpus(name: str, num_lines: int, **parameters)->List[str]:
+    '''Generate a corpus with approximately num_lines lines.
+
+    The number of sections is chosen to give at least num_lines lines.  Other
+    parameters are passed to the generator if it accepts them.
+
+    Args:
+        name (str): The corpus name (a key of CORPORA).
+        num_lines (int): The minimum number of lines.
+        **parameters: Other generator arguments.
+    Returns:
+        List[str]: The lines of the corpus.
+    '''
+    generator = CORPORA[name]
+    parameters = select_arguments(generator, parameters)
+    parameters.pop('num_sections', None)
+    one = len(generator(num_sections=1, **parameters))
+    two = len(generator(num_sections=2, **parameters))
+    per_section = max(two - one, 1)
+    num_sections = max(1, -(-(num_lines - one + per_section) // per_section))
+    return generator(num_sections=num_sections, **parameters)
@@ -0,0 +1,251 @@
+'''Benchmark suite for the main parsing components over synthetic corpora.
+
+Each corpus from corpus.py is generated at the requested size and the
+following components are timed over it:
+    BufferedIterator:           Iterating with a one item look ahead.
+    Trigger.evaluate:           Testing every line against the corpus
+                                sentinels.
+    RuleSet.apply:              Applying one Rule for each sentinel.
+    ProcessingMethods.reader:   Stripping and splitting every line.
+    Section.read:               Reading the corpus with its section tree.
+    CompiledSection.read:       The same, using the compiled section tree.
+
+For each case the best time of the repeats is converted to a throughput in
+lines/s, and the peak memory allocated during one extra run is measured with
+tracemalloc.  Results can be saved as a JSON baseline and later runs compared
+with it; a case is flagged as a regression if its throughput falls, or its
+peak memory rises, by more than the tolerance.
+
+Usage (from the repository root):
+    python benchmarks/run_benchmarks.py [--lines N] [--corpus NAME ...]
+        [--depth N] [--sentinels N] [--repeats N] [--save FILE]
+        [--baseline FILE] [--tolerance FRACTION]
+
+The exit status is 1 if any regression is found.
+'''
+#%% Imports
+import sys
+import json
+import timeit
+import argparse
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+import corpus  # pylint: disable=wrong-import-position
+from buffered_iterator import BufferedIterator, BufferOverflowWarning  # pylint: disable=wrong-import-position
+from sections import ProcessingMethods, Rule, RuleSet, Trigger  # pylint: disable=wrong-import-position
+
+
+#%% Cases
+Case = Callable[[List[str]], Any]
+
+
+class CaseResult(NamedTuple):
+    '''The measurements for one benchmark case.'''
+    lines: int
+    seconds: float
+    lines_per_s: float
+    peak_mb: float
+
+
+def iterate_buffered(lines: List[str]):
+    '''Step through the lines, looking one line ahead at each step.'''
+    buffer = BufferedIterator(iter(lines))
+    for _ in buffer:
+        try:
+            buffer.look_ahead()
+        except BufferOverflowWarning:
+            break
+
+
+def trigger_case(sentinels: List[str])->Case:
+    '''Evaluate a Trigger for the sentinels on every line.'''
+    trigger = Trigger(sentinels, location='START')
+    def evaluate_all(lines: List[str]):
+        for line in lines:
+            trigger.evaluate(line)
+    return evaluate_all
+
+
+def rule_set_case(sentinels: List[str])->Case:
+    '''Apply a RuleSet with one Rule per sentinel to every line.'''
+    rule_set = RuleSet([Rule(sentinel, location='START', pass_method='Value')
+                        for sentinel in sentinels], default='Original')
+    def apply_all(lines: List[str]):
+        for line in lines:
+            rule_set.apply(line)
+    return apply_all
+
+
+def reader_case()->Case:
+    '''Run every line through a two stage ProcessingMethods pipeline.'''
+    processor = ProcessingMethods([str.strip, corpus.split_colon])
+    def read_all(lines: List[str]):
+        for _ in processor.reader(lines):
+            pass
+    return read_all
+
+
+def section_case(corpus_name: str, parameters: Dict[str, int],
+                 compiled: bool = False)->Case:
+    '''Read the corpus with its section tree.'''
+    section = corpus.corpus_section(corpus_name, **parameters)
+    if compiled:
+        section = section.compile()
+    return section.read
+
+
+def corpus_cases(corpus_name: str, parameters: Dict[str, int]
+                 )->Dict[str, Case]:
+    '''The benchmark cases for one corpus, by component name.'''
+    sentinels = corpus.corpus_sentinels(
+        corpus_name, **corpus.select_arguments(corpus.corpus_sentinels,
+                                               parameters))
+    return {
+        'BufferedIterator': iterate_buffered,
+        'Trigger.evaluate': trigger_case(sentinels),
+        'RuleSet.apply': rule_set_case(sentinels),
+        'ProcessingMethods.reader': reader_case(),
+        'Section.read': section_case(corpus_name, parameters),
+        'CompiledSection.read': section_case(corpus_name, parameters,
+                                             compiled=True),
+        }
+
+
+#%% Measurement
+def peak_memory(case: Case, lines: List[str])->int:
+    '''The peak memory in bytes allocated while running case.'''
+    tracemalloc.start()
+    case(lines)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def measure(case: Case, lines: List[str], repeats: int)->CaseResult:
+    '''Time a case and measure its peak memory.'''
+    seconds = min(timeit.Timer(lambda: case(lines)).repeat(repeat=repeats,
+                                                           number=1))
+    peak = peak_memory(case, lines)
+    return CaseResult(len(lines), seconds, len(lines) / max(seconds, 1e-9),
+                      peak / 2**20)
+
+
+def run_suite(corpus_names: List[str], num_lines: int,
+              parameters: Dict[str, int], repeats: int = 3
+              )->Dict[str, Dict[str, float]]:
+    '''Run every case for every corpus.
+
+    Args:
+        corpus_names (List[str]): The corpora to generate.
+        num_lines (int): The approximate number of lines in each corpus.
+        parameters (Dict[str, int]): Other corpus generator and section
+            arguments (e.g. depth, num_sentinels).
+        repeats (int, optional): The number of timed runs. Defaults to 3.
+    Returns:
+        Dict[str, Dict[str, float]]: The measurements for each case, keyed by
+            '<corpus>/<component>'.
+    '''
+    results = dict()
+    for corpus_name in corpus_names:
+        lines = corpus.sized_corpus(corpus_name, num_lines, **parameters)
+        for component, case in corpus_cases(corpus_name, parameters).items():
+            result = measure(case, lines, repeats)
+            results[f'{corpus_name}/{component}'] = result._asdict()
+    return results
+
+
+#%% Baseline Comparison
+# Peak memory changes smaller than this are measurement noise.
+MEMORY_SLACK_MB = 0.1
+
+
+def find_regressions(results: Dict[str, Dict[str, float]],
+                     baseline: Dict[str, Dict[str, float]],
+                     tolerance: float = 0.2)->Dict[str, List[str]]:
+    '''Compare results with a baseline.
+
+    Args:
+        results (Dict[str, Dict[str, float]]): The current measurements.
+        baseline (Dict[str, Dict[str, float]]): The baseline measurements.
+            Cases missing from either are not compared.
+        tolerance (float, optional): The allowed fractional change. Defaults
+            to 0.2.
+    Returns:
+        Dict[str, List[str]]: For each regressed case, a description of each
+            regression.
+    '''
+    regressions = dict()
+    for case_name, result in results.items():
+        reference = baseline.get(case_name)
+        if reference is None:
+            continue
+        found = list()
+        if result['lines_per_s'] < reference['lines_per_s'] * (1 - tolerance):
+            found.append(f'throughput {result["lines_per_s"]:,.0f} < '
+                         f'{reference["lines_per_s"]:,.0f} lines/s')
+        memory_limit = max(reference['peak_mb'] * (1 + tolerance),
+                           reference['peak_mb'] + MEMORY_SLACK_MB)
+        if result['peak_mb'] > memory_limit:
+            found.append(f'peak memory {result["peak_mb"]:.2f} > '
+                         f'{reference["peak_mb"]:.2f} MB')
+        if found:
+            regressions[case_name] = found
+    return regressions
+
+
+def print_results(results: Dict[str, Dict[str, float]],
+                  regressions: Dict[str, List[str]]):
+    '''Print a summary table.'''
+    print(f'{"Case":<40s}{"lines":>10s}{"time (s)":>10s}'
+          f'{"lines/s":>14s}{"peak (MB)":>11s}')
+    for case_name, result in results.items():
+        flag = '  REGRESSION' if case_name in regressions else ''
+        print(f'{case_name:<40s}{result["lines"]:>10d}'
+              f'{result["seconds"]:>10.4f}{result["lines_per_s"]:>14,.0f}'
+              f'{result["peak_mb"]:>11.2f}{flag}')
+    for case_name, found in regressions.items():
+        print(f'{case_name}: {"; ".join(found)}')
+
+
+def run(argv: List[str] = None)->int:
+    '''Run the suite from the command line and return the exit status.'''
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=100000,
+                        help='Approximate number of lines in each corpus.')
+    parser.add_argument('--corpus', nargs='+', choices=list(corpus.CORPORA),
+                        default=list(corpus.CORPORA),
+                        help='The corpora to benchmark.')
+    parser.add_argument('--depth', type=int, default=3,
+                        help='Section nesting depth (dir and nested).')
+    parser.add_argument('--sentinels', type=int, default=8,
+                        help='Number of distinct start sentinels '
+                        '(printout and nested).')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--save', type=Path,
+                        help='Write the results to this baseline file.')
+    parser.add_argument('--baseline', type=Path,
+                        help='Compare the results with this baseline file.')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed fractional change from the baseline.')
+    args = parser.parse_args(argv)
+    parameters = {'depth': args.depth, 'num_sentinels': args.sentinels}
+    results = run_suite(args.corpus, args.lines, parameters, args.repeats)
+    regressions = dict()
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        regressions = find_regressions(results, baseline['results'],
+                                       args.tolerance)
+    print_results(results, regressions)
+    if args.save:
+        report = {'parameters': {'lines': args.lines, **parameters},
+                  'results': results}
+        args.save.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(run())
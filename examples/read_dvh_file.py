@@ -27,12 +27,13 @@ from sections import Rule, RuleSet, SectionBreak, Section, ProcessingMethods
 
 # %% Line Parsing Functions
 # Date Rule
-def make_date_parse_rule() -> Rule:
-    def date_parse(line: str) -> tp.ProcessedList:
-        '''If Date,don't split beyond first :.'''
-        parsed_line = line.split(':', maxsplit=1)
-        return parsed_line
+def date_parse(line: str) -> tp.ProcessedList:
+    '''If Date,don't split beyond first :.'''
+    parsed_line = line.split(':', maxsplit=1)
+    return parsed_line
+
 
+def make_date_parse_rule() -> Rule:
     date_rule = Rule('Date', location='START', name='date_rule',
                         pass_method=date_parse, fail_method='None')
     return date_rule
@@ -67,6 +68,17 @@ def plan_split(line: str)->List[str]:
     return clean_parts
 
 
+def approved_status_parse(line, event) -> tp.ProcessedList:
+    match_results = event.test_value.groupdict()
+    parsed_lines = [
+        ['Plan Status', match_results['approval']],
+        ['Approved on', match_results['date']],
+        ['Approved by', match_results['user']]
+        ]
+    for line in parsed_lines:
+        yield line
+
+
 def make_approved_status_rule() -> Rule:
     '''If Treatment Approved, Split "Plan Status" into 3 lines.
 
@@ -83,16 +95,6 @@ def make_approved_status_rule() -> Rule:
             ['Approved on', Thursday, January 02, 2020 12:55:56],
             ['Approved by', gsal]
     '''
-    def approved_status_parse(line, event) -> tp.ProcessedList:
-        match_results = event.test_value.groupdict()
-        parsed_lines = [
-            ['Plan Status', match_results['approval']],
-            ['Approved on', match_results['date']],
-            ['Approved by', match_results['user']]
-            ]
-        for line in parsed_lines:
-            yield line
-
     approval_pattern = (
         r'.*'                  # Initial text
         r'(?P<approval>'       # Beginning of approval capture group
@@ -116,6 +118,24 @@ def make_approved_status_rule() -> Rule:
 
 
 # Prescribed Dose Rule
+def parse_prescribed_dose(line, event) -> tp.ProcessedList:
+    match_results = event.test_value.groupdict()
+    # Convert numerical dose value to float and
+    # 'not defined' dose value to np.nan
+    if match_results['dose'] == 'not defined':
+        match_results['dose'] = np.nan
+        match_results['unit'] = ''
+    else:
+        match_results['dose'] = float(match_results['dose'])
+
+    parsed_lines = [
+        ['Prescribed dose', match_results['dose']],
+        ['Prescribed dose unit', match_results['unit']]
+        ]
+    for line in parsed_lines:
+        yield line
+
+
 def make_prescribed_dose_rule() -> Rule:
     '''Split Dose into dose vale and dose unit.
     For a line containing:
@@ -132,23 +152,6 @@ def make_prescribed_dose_rule() -> Rule:
         ['Prescribed dose', ''],
         ['Prescribed dose unit', '']
     '''
-    def parse_prescribed_dose(line, event) -> tp.ProcessedList:
-        match_results = event.test_value.groupdict()
-        # Convert numerical dose value to float and
-        # 'not defined' dose value to np.nan
-        if match_results['dose'] == 'not defined':
-            match_results['dose'] = np.nan
-            match_results['unit'] = ''
-        else:
-            match_results['dose'] = float(match_results['dose'])
-
-        parsed_lines = [
-            ['Prescribed dose', match_results['dose']],
-            ['Prescribed dose unit', match_results['unit']]
-            ]
-        for line in parsed_lines:
-            yield line
-
     prescribed_dose_pattern = (
         r'^(Total|Prescribed)'  # Begins with 'Total' OR 'Prescribed'
         r'\s*dose\s*'           # Literal text 'dose' surrounded by whitespace
@@ -168,6 +171,18 @@ def make_prescribed_dose_rule() -> Rule:
 
 
 # Prescribed Isodose Line Rule
+def parse_isodose(line, event) -> tp.ProcessedList:
+    # Split the line at ':'
+    parts = line.split(':')
+    isodose_text = parts[1].strip()
+    if isodose_text == 'not defined':
+        isodose = np.nan
+    else:
+        isodose = float(isodose_text)
+    parsed_line = ['Prescription Isodose', isodose]
+    return parsed_line
+
+
 def make_prescribed_isodose_rule() -> Rule:
     '''Identify Prescribed isodose text lines. and convert them into a
     two-item list, with the isodose percentage converted to a number.
@@ -176,16 +191,6 @@ def make_prescribed_isodose_rule() -> Rule:
     Return:
         ['Prescription Isodose', 100.0]
     '''
-    def parse_isodose(line, event) -> tp.ProcessedList:
-        # Split the line at ':'
-        parts = line.split(':')
-        isodose_text = parts[1].strip()
-        if isodose_text == 'not defined':
-            isodose = np.nan
-        else:
-            isodose = float(isodose_text)
-        parsed_line = ['Prescription Isodose', isodose]
-        return parsed_line
     prescribed_isodose_rule = Rule(r'% for dose (%)', location='IN',
                                    pass_method=parse_isodose,
                                    fail_method='None',
@@ -194,17 +199,19 @@ def make_prescribed_isodose_rule() -> Rule:
 
 
 # Plan Sum Rule
+def parse_plan_sum(line, event) -> tp.ProcessedList:
+    # Split the line at ':'
+    parts = line.split(':', maxsplit=1)
+    plan_sum_id = parts[1].strip()
+    parsed_line = ['Plan', plan_sum_id]
+    return parsed_line
+
+
 def make_plan_sum_rule() -> Rule:
     '''Identify lines starting with Plan sum and convert them into a two-item
     list, with the first item being 'Plan' and the second item being the text
     after the ':'.
     '''
-    def parse_plan_sum(line, event) -> tp.ProcessedList:
-        # Split the line at ':'
-        parts = line.split(':', maxsplit=1)
-        plan_sum_id = parts[1].strip()
-        parsed_line = ['Plan', plan_sum_id]
-        return parsed_line
     plan_sum_rule = Rule('Plan sum', location='START',
                          pass_method=parse_plan_sum,
                          fail_method='None',
@@ -452,8 +459,8 @@ def convert_volume(dvh_data, vol_idx, hdr, dt, header_dict, context):
 
 
 def build_curve(dt, context):
-    # Convert the list of lists to a 2D numpy array so that columns can be
-    # extracted easier.
+    # Copy the 2D numpy array of curve data so that the unit conversions do
+    # not modify the section result.
     dvh_data = np.array(dt['DVH Curve'])
     # Construct an index for the curve
     header_dict = {
@@ -689,7 +696,7 @@ dose_curve_section = Section(
     name='DVH Curve',
     start_search=False,
     end_section=('Structure:', 'START', 'Before'),
-    processor=[split_data_points, drop_blanks]
+    assemble=tp.NumericBlockParser()
     )
 
 
@@ -4,11 +4,20 @@
 # pylint: disable=logging-fstring-interpolation
 #%% Imports
 from __future__ import annotations
+from bisect import bisect_right
 from copy import copy
 from collections import deque
+from itertools import accumulate, islice
+import asyncio
+import queue
+import re
+import threading
 
-from typing import Sequence, TypeVar, Union
+from typing import AsyncIterable, Iterable, Iterator, List, Sequence, TypeVar
+from typing import Union
 import logging
+
+import tracing
 SourceItem = TypeVar('SourceItem')
 
 #%% Logging
@@ -36,28 +45,302 @@ class BufferOverflowWarning(BufferedIteratorWarnings):
         lines to be dropped.
     '''
 
+class AsyncSourcePending(BufferedIteratorException):
+    '''Raised when an AsyncBufferedIterator needs items that have not been
+    fetched, and can not wait for them.
+    '''
+
+
+#%% Indexed Sources
+def block_matches(pattern: re.Pattern, text: str, starts: Sequence[int],
+                  first_item: int)->Iterator[int]:
+    '''Find the lines of a block of text that contain the start of a match.
+
+    After a match, the search continues at the start of the following line,
+    so each line is reported at most once.
+
+    Args:
+        pattern (re.Pattern): The regular expression to search for.
+        text (str): The block of lines.
+        starts (Sequence[int]): The position in text of the start of each
+            line, followed by the end of the last line.
+        first_item (int): The item number of the first line in text.
+
+    Yields:
+        int: The item numbers of the lines containing the start of a match,
+            in increasing order.
+    '''
+    num_lines = len(starts) - 1
+    position = 0
+    while True:
+        found = pattern.search(text, position)
+        if found is None:
+            return
+        line = bisect_right(starts, found.start()) - 1
+        yield first_item + line
+        if line + 1 >= num_lines:
+            return
+        position = starts[line + 1]
+
+
+class IndexedSource():
+    '''Base class for sources that can return any item by its number.
+
+    A BufferedIterator created from an IndexedSource is not limited by its
+    buffer_size when moving the iterator pointer; items that are no longer in
+    the buffer are read from the source again by item number.
+
+    Subclasses must define __len__ and __getitem__ for integer item numbers.
+    iter_from may be overridden with a faster sequential reader, and search
+    with a faster block search.
+
+    Attributes:
+        search_block (int): The number of items joined into one block of text
+            by search.
+    '''
+    search_block = 4096
+
+    def __len__(self)->int:
+        raise NotImplementedError
+
+    def __getitem__(self, item_num: int)->SourceItem:
+        raise NotImplementedError
+
+    def iter_from(self, item_num: int = 0)->Iterator[SourceItem]:
+        '''Iterate through the source starting at item number item_num.
+
+        Args:
+            item_num (int, optional): The number of the first item returned.
+                Defaults to 0.
+
+        Yields:
+            SourceItem: The items from item_num to the end of the source.
+        '''
+        for idx in range(item_num, len(self)):
+            yield self[idx]
+
+    def __iter__(self)->Iterator[SourceItem]:
+        return self.iter_from(0)
+
+    def search(self, pattern: re.Pattern,
+               item_num: int = 0)->Iterator[int]:
+        '''Find the items that may contain a match for a regular expression.
+
+        String items are joined with '\\n' into blocks of search_block items
+        and each block is searched with a single pattern.search call.  A
+        match that spans more than one item is reported for the item where it
+        starts, so the items reported are candidates, to be tested
+        individually.  Items that are not strings are always reported.
+
+        Args:
+            pattern (re.Pattern): The regular expression to search for.
+            item_num (int, optional): The number of the first item to search.
+                Defaults to 0.
+
+        Yields:
+            int: The item numbers of the candidate items, in increasing order.
+        '''
+        num_items = len(self)
+        items_iter = self.iter_from(item_num)
+        while item_num < num_items:
+            last = min(item_num + self.search_block, num_items)
+            items = list(islice(items_iter, last - item_num))
+            if all(isinstance(item, str) for item in items):
+                starts = list(accumulate((len(item) + 1 for item in items),
+                                         initial=0))
+                yield from block_matches(pattern, '\n'.join(items), starts,
+                                         item_num)
+            else:
+                yield from range(item_num, last)
+            item_num = last
+
+
+class IndexedSequence(IndexedSource):
+    '''An IndexedSource reading from a Sequence such as a list.
+
+    Attributes:
+        sequence (Sequence[SourceItem]): The items.
+    '''
+    def __init__(self, sequence: Sequence[SourceItem]):
+        self.sequence = sequence
+
+    def __len__(self)->int:
+        return len(self.sequence)
+
+    def __getitem__(self, item_num: int)->SourceItem:
+        return self.sequence[item_num]
+
+    def iter_from(self, item_num: int = 0)->Iterator[SourceItem]:
+        # Use the sequence's own iterator for the common case.
+        if item_num == 0:
+            return iter(self.sequence)
+        return super().iter_from(item_num)
+
+
+#%% Prefetching Sources
+class _EndOfBlocks():
+    '''Queue marker for the end of the blocks, carrying any read error.'''
+    def __init__(self, error: BaseException = None):
+        self.error = error
+
+
+def _fill_queue(blocks: Iterator[List[SourceItem]], block_queue: queue.Queue,
+                stop: threading.Event, poll_interval: float):
+    '''Put blocks of items into block_queue until the blocks are exhausted
+    or stop is set.
+
+    Runs on the PrefetchSource background thread.  It holds no reference to
+    the PrefetchSource, so that an abandoned source can be garbage collected
+    (which stops the thread).
+    '''
+    end = _EndOfBlocks()
+    try:
+        for block in blocks:
+            while not stop.is_set():
+                try:
+                    block_queue.put(block, timeout=poll_interval)
+                    break
+                except queue.Full:
+                    continue
+            if stop.is_set():
+                return
+    except BaseException as err:  # pylint: disable=broad-except
+        # Pass the error to the consuming thread.
+        end = _EndOfBlocks(err)
+    finally:
+        close = getattr(blocks, 'close', None)
+        if close is not None:
+            close()
+    while not stop.is_set():
+        try:
+            block_queue.put(end, timeout=poll_interval)
+            return
+        except queue.Full:
+            continue
+
+
+class PrefetchSource():
+    '''Read blocks of items on a background thread.
+
+    The supplied blocks (an iterable of lists of items, such as the lines
+    decoded from successive blocks of a file) are read on a daemon thread and
+    held in a queue of at most queue_depth blocks.  Iterating through the
+    PrefetchSource returns the items in order, so reading and decoding
+    overlap with the processing of the items already read.
+
+    The background thread stops when the blocks are exhausted, when close is
+    called (also on leaving a with block), or when the PrefetchSource is
+    garbage collected.  An error raised while reading the blocks is raised
+    again by the iteration.
+
+    Attributes:
+        queue_depth (int): The maximum number of blocks held in the queue.
+        closed (bool): True once the background thread has been told to stop.
+    '''
+    # Seconds between checks for a stop request while the queue is full.
+    poll_interval = 0.05
+
+    def __init__(self, blocks: Iterable[List[SourceItem]],
+                 queue_depth: int = 8):
+        '''Start reading blocks on a background thread.
+
+        Args:
+            blocks (Iterable[List[SourceItem]]): The blocks of items.  If it
+                has a close method (e.g. a generator), it is closed on the
+                background thread when reading stops.
+            queue_depth (int, optional): The maximum number of blocks read
+                ahead. Defaults to 8.
+
+        Raises:
+            BufferedIteratorValueError: Raised if queue_depth is less than 1.
+        '''
+        if queue_depth < 1:
+            raise BufferedIteratorValueError('Queue depth must be 1 or greater')
+        self.queue_depth = queue_depth
+        self.closed = False
+        self._queue = queue.Queue(maxsize=queue_depth)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=_fill_queue, name='PrefetchSource', daemon=True,
+            args=(iter(blocks), self._queue, self._stop, self.poll_interval))
+        self._thread.start()
+
+    def __iter__(self)->Iterator[SourceItem]:
+        block_queue = self._queue
+        try:
+            while not self.closed:
+                block = block_queue.get()
+                if isinstance(block, _EndOfBlocks):
+                    if block.error is not None:
+                        raise block.error
+                    return
+                yield from block
+        finally:
+            self.close()
+
+    def close(self, timeout: float = 1.0):
+        '''Stop the background thread.
+
+        Blocks already read are discarded and iteration ends.
+
+        Args:
+            timeout (float, optional): The maximum time in seconds to wait for
+                the thread to finish its current block. Defaults to 1.0.
+        '''
+        if self.closed:
+            return
+        self.closed = True
+        self._stop.set()
+        # Make room in the queue, so that the thread is not waiting to add a
+        # block.
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        # End an iteration waiting on another thread.
+        try:
+            self._queue.put_nowait(_EndOfBlocks())
+        except queue.Full:
+            pass
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def __enter__(self)->PrefetchSource:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        if hasattr(self, '_thread'):
+            self.close(timeout=0)
+
 
 #%% Classes
 class BufferedIterator():
     '''Iterate through sequence allowing for backup and look ahead.
 
     BufferedIterator is an iterator tool for any type of Sequence object,
-    providing a means to step in both directions.  It's primary feature are two
-    queues: previous_items and future_items, storing previous visited items.
-    It also contains an internal enumerator, which can be used as an index to
-    move to a particular spot in the sequence.
+    providing a means to step in both directions.  Items read from the source
+    are stored in a single ring of slots, indexed by their position in the
+    source.  A read cursor (item_count) divides the stored items into
+    previous_items (already returned) and future_items (read from the source,
+    but not yet returned).  Moving backwards or forwards through the stored
+    items only moves the cursor; the items themselves are never shifted
+    between queues.
 
     Attributes:
-        previous_items (deque): The last n items consumed by the iterator,
-            where n is the iterator's buffer_size attribute. A next() call will
-            append the item returned to the previous_items queue, and if full,
-            drop an item from the other end of the queue.  The backup() and
-            rewind() calls pull items from this queue.
-        future_items (deque): Contains items consumed by the base iterator, but
-            before the current pointer.  Populated by calls such as
-            look_ahead() and advance()
-        buffer_size (int): The size of the previous_items and future_items
-            queues. buffer_size can only be set at instance creation.
+        previous_items (deque): Read-only. The last n items consumed by the
+            iterator, where n is the iterator's buffer_size attribute. A
+            next() call adds the item returned to previous_items, and if full,
+            drops the oldest item.  The backup() and rewind() calls move the
+            cursor back into these items.
+        future_items (deque): Read-only. Contains items consumed by the base
+            iterator, but after the current pointer.  Populated by calls such
+            as look_ahead() and backup().
+        buffer_size (int): The maximum size of previous_items and
+            future_items. buffer_size can only be set at instance creation.
         item_count (int): A read-only attribute indicating the number of items
             used (position) in the iterator.
             To match normal python indexing, item_count = 0 represents the
@@ -66,6 +349,13 @@ class BufferedIterator():
         source_gen (Iterator): The base iterator created at object
             initialization from the supplied Sequence.  Generally there should
             be no reason to access this directly.
+        indexed_source (IndexedSource, None): The supplied source, if it is an
+            IndexedSource.  Moving the iterator pointer is then not limited by
+            buffer_size; items outside the buffer are read again from
+            indexed_source.
+        prefetch_source (PrefetchSource, None): The supplied source, if it is
+            a PrefetchSource.  Used to stop its background thread (see
+            close()).
         status (str): Possible states are:
             CREATED: Defined, but not started.
             ACTIVE: Currently open with more items in the underlying sequence.
@@ -92,7 +382,7 @@ class BufferedIterator():
     '''
     def __init__(self, source: Sequence[SourceItem], buffer_size=5):
         '''Create a new BufferedIterator, linking it with the supplied Sequence
-            and initialize the forward and reverse buffers.
+            and initialize the ring buffer.
 
         Args:
             source (Sequence[SourceItem]): The sequence to be iterated over.
@@ -108,8 +398,24 @@ class BufferedIterator():
             raise BufferedIteratorValueError('Buffer size must be 1 or greater')
         self._buffer_size = buffer_size
         self.source_gen = iter(source)
-        self.previous_items = deque(maxlen=buffer_size)
-        self.future_items = deque(maxlen=buffer_size)
+        if isinstance(source, IndexedSource):
+            self.indexed_source = source
+        else:
+            self.indexed_source = None
+        if isinstance(source, PrefetchSource):
+            self.prefetch_source = source
+        else:
+            self.prefetch_source = None
+        # The ring holds up to buffer_size previous items and buffer_size
+        # future items.  Slot i % _capacity holds source item number i.
+        self._capacity = 2 * buffer_size
+        self._slots = [None] * self._capacity
+        # Source item numbers bounding the stored items:
+        #   _low <= _item_count <= _high
+        #   previous_items are items _low ... _item_count-1
+        #   future_items are items _item_count ... _high-1
+        self._low = 0
+        self._high = 0
         self._step_back = 0
         self._item_count = 0
         self._status = 'Created'
@@ -119,7 +425,7 @@ class BufferedIterator():
     def status(self):
         if self._item_count == 0:
             return 'CREATED'
-        if len(self.future_items) > 0:
+        if self._high > self._item_count:
             return 'ACTIVE'
         if 'Completed' in self._status:
             return 'CLOSED'
@@ -137,6 +443,29 @@ class BufferedIterator():
         '''
         return int(self._item_count)
 
+    @property
+    def previous_items(self)->deque:
+        '''deque: A copy of the items before the iterator pointer, oldest
+        first.
+        '''
+        return deque(self._stored_items(self._low, self._item_count),
+                     maxlen=self._buffer_size)
+
+    @property
+    def future_items(self)->deque:
+        '''deque: A copy of the items after the iterator pointer that have
+        already been read from the source, next item first.
+        '''
+        return deque(self._stored_items(self._item_count, self._high),
+                     maxlen=self._buffer_size)
+
+    def _stored_items(self, first: int, last: int)->List[SourceItem]:
+        '''Return the stored items with source item numbers first ... last-1.
+        '''
+        capacity = self._capacity
+        slots = self._slots
+        return [slots[idx % capacity] for idx in range(first, last)]
+
     @property
     def step_back(self) -> int:
         '''The number of steps backwards to move the iterator pointer.'''
@@ -164,15 +493,64 @@ class BufferedIterator():
         Returns:
             None.
         '''
-        logger.debug(f'Have {len(self.previous_items)} Previous Items')
+        logger.debug(f'Have {self._item_count - self._low} Previous Items')
         logger.debug(f'Need {steps} Steps back')
         steps = self.check_steps(steps)
         self._step_back = steps
         self.rewind()
 
+    def _read_source(self) -> SourceItem:
+        '''Read the next item from "source_gen".
+
+        Raises:
+            BufferedIteratorEOF: Indicates end of the source file or stream.
+                Raised when the source generator returns a "StopIteration" or
+                "RuntimeError".
+
+        Returns:
+            SourceItem: The next item from "source_gen".
+        '''
+        try:
+            # Read from the iterator source
+            next_item = self.source_gen.__next__()
+        except (StopIteration, RuntimeError) as eof:
+            # Treat "StopIteration" or "RuntimeError" exceptions as
+            # End-of-File indicators.
+            self._status = 'Completed'
+            raise BufferedIteratorEOF from eof
+        self._status = 'Started'
+        return next_item
+
+    def _drop_current(self):
+        '''Remove the item just before the iterator pointer from the
+        previous items.
+
+        The older previous items are shifted up one slot so that
+        previous_items remains contiguous with the iterator pointer.  Used by
+        skip(), where the items passed over cannot be retrieved.
+        '''
+        capacity = self._capacity
+        slots = self._slots
+        for idx in range(self._item_count - 2, self._low - 1, -1):
+            slots[(idx + 1) % capacity] = slots[idx % capacity]
+        self._low += 1
+
+    def _seek(self, item_num: int):
+        '''Clear the stored items and continue reading the indexed source
+        from item_num.  Only used with an IndexedSource.
+
+        Args:
+            item_num (int): The number of the next item to be returned.
+        '''
+        self._item_count = item_num
+        self._low = item_num
+        self._high = item_num
+        self.source_gen = self.indexed_source.iter_from(item_num)
+        self._status = 'Started'
+
     def get_next_item(self) -> SourceItem:
-        '''Get the next item from the source. Called by skip() and advance().
-        Usually not called directly.
+        '''Get the next item from the source without retaining it as a
+        previous item. Called by skip(). Usually not called directly.
 
         If there are items in the "future_items" queue, return the next item
             from the queue.  Otherwise read from the "source_gen".  If reading
@@ -189,34 +567,28 @@ class BufferedIterator():
         Returns:
             SourceItem: The next item from the source.
         '''
-        # Check the "future_items" queue for items.
-        if len(self.future_items) > 0:
+        cursor = self._item_count
+        if cursor < self._high:
             # Get the next item from the queued items
-            next_item = self.future_items.popleft()
-            self._item_count += 1
-            logger.debug(f'Getting item: {next_item}\t from future_items')
+            next_item = self._slots[cursor % self._capacity]
         else:
             # Get the next item from the source iterator
-            try:
-                # Read from the iterator source
-                next_item = self.source_gen.__next__()
-            except (StopIteration, RuntimeError) as eof:
-                # Treat "StopIteration" or "RuntimeError" exceptions as
-                # End-of-File indicators.
-                self._status = 'Completed'
-                raise BufferedIteratorEOF from eof
-            else:
-                self._item_count += 1
-                self._status = 'Started'
-                logger.debug(f'Getting item: {next_item}\t from source')
+            next_item = self._read_source()
+            self._high = cursor + 1
+        self._item_count = cursor + 1
+        self._drop_current()
+        if tracing.trace_hook is not None:
+            tracing.emit(tracing.ITEM_FETCHED, None, 'BufferedIterator',
+                         cursor + 1, next_item)
         return next_item
 
     def __next__(self) -> SourceItem:
         '''Return the next item in a sequence allowing for retracing steps.
 
-        Calls get_next_item checking for "BufferedIteratorEOF" and
-           propagating the exception.  As each item is obtained from the source
-           it is added to the "previous_items" queue to allow for moving
+        If the iterator pointer is behind the most recent item read from the
+           source, return the stored item.  Otherwise read the next item from
+           the source and store it in the ring.  Either way the item becomes
+           the most recent of the "previous_items", allowing for moving
            backwards through the source.
 
         Raises:
@@ -225,29 +597,47 @@ class BufferedIterator():
         Returns:
             SourceItem: The next item from the source.
         '''
-        try:
-            next_line = self.get_next_item()
-        except BufferedIteratorEOF as eof:
-            raise eof
-        self.previous_items.append(next_line)
-        return next_line
+        cursor = self._item_count
+        if cursor < self._high:
+            next_item = self._slots[cursor % self._capacity]
+        else:
+            next_item = self._read_source()
+            self._slots[cursor % self._capacity] = next_item
+            self._high = cursor + 1
+        cursor += 1
+        self._item_count = cursor
+        # Drop the oldest previous item if the buffer is full.
+        if cursor - self._low > self._buffer_size:
+            self._low = cursor - self._buffer_size
+        return next_item
 
     def __iter__(self) -> SourceItem:
         '''Step through a sequence allowing for retracing steps.
 
-        Calls __next__ until "BufferedIteratorEOF" is raised.  Does not
-           propagate the exception.
+        Equivalent to calling __next__ until "BufferedIteratorEOF" is raised.
+           Does not propagate the exception.
 
         Yields:
             SourceItem: The next item from the source.
         '''
         while True:
-            try:
-                next_line = self.__next__()
-            except BufferedIteratorEOF:
-                break
+            # Inlined __next__; the iterator state is re-read on every pass
+            # because backup() etc. may be called between items.
+            cursor = self._item_count
+            if cursor < self._high:
+                next_line = self._slots[cursor % self._capacity]
             else:
-                yield next_line
+                try:
+                    next_line = self._read_source()
+                except BufferedIteratorEOF:
+                    break
+                self._slots[cursor % self._capacity] = next_line
+                self._high = cursor + 1
+            cursor += 1
+            self._item_count = cursor
+            if cursor - self._low > self._buffer_size:
+                self._low = cursor - self._buffer_size
+            yield next_line
         return
 
     def check_steps(self, steps: int, backwards=True, skip=False)->int:
@@ -260,6 +650,8 @@ class BufferedIterator():
         If "backwards", verify that "steps" is less than the size of the
             "previous_items" queue; if not, raise "BufferedIteratorValueError"
             exception.
+        For an IndexedSource, "steps" is only limited by the start of the
+            source.
 
         Args:
             steps (int): The given number of steps to shift the iterator
@@ -288,12 +680,16 @@ class BufferedIterator():
                 f'steps must be a positive integer. Got: {steps}')
         if backwards:
             # Check for available previous items
-            if len(self.previous_items) < steps:
+            if self.indexed_source is None:
+                available = self._item_count - self._low
+            else:
+                available = self._item_count
+            if available < steps:
                 msg = (f"Can't step back {steps} items.\n\t"
-                       f"only have {len(self.previous_items)} previous items "
+                       f"only have {available} previous items "
                         "available.")
                 raise BufferedIteratorValueError(msg)
-        elif not skip:
+        elif not skip and self.indexed_source is None:
             # Check that steps < buffer_size
             if steps > self.buffer_size:
                 raise BufferedIteratorValueError(
@@ -306,31 +702,45 @@ class BufferedIterator():
         Move the iterator pointer back the number of steps set in the
         "step_back" property.  Usually not called directly().
 
-        The appropriate number of items in the "previous_items" queue are
-           moved to the "future_items" queue and the "step_back" property is
-           reset to 0. Called by backup()
+        The iterator pointer is moved back into the "previous_items" and the
+           "step_back" property is reset to 0. Called by backup()
         Returns:
             None.
         '''
-        for step in range(self._step_back): # pylint: disable=unused-variable
-            self._step_back -= 1
-            self._item_count -= 1
-            if len(self.previous_items) > 0:
-                self.future_items.appendleft(self.previous_items.pop())
+        steps = self._step_back
         self._step_back = 0
+        if steps <= 0:
+            return
+        self._item_count -= steps
+        if self._low > self._item_count:
+            # Only possible for an IndexedSource.
+            self._seek(self._item_count)
+            return
+        # Items moved back beyond the pointer are limited to buffer_size.
+        if self._high - self._item_count > self._buffer_size:
+            self._high = self._item_count + self._buffer_size
+            if self.indexed_source is not None:
+                self.source_gen = self.indexed_source.iter_from(self._high)
 
     def backup(self, steps: int = 1):
         '''Move the iterator pointer back the given number of steps.
 
-        Sets the "step_back" property and then calls the "rewind" method.
+        Equivalent to setting the "step_back" property.  Only the iterator
+        pointer moves; the stored items are not copied.
 
          Args:
             steps (int, optional): The number of steps to move the iterator
             pointer backwards in the source. Defaults to 1.
+        Raises:
+            BufferedIteratorValueError: Indicates an invalid "steps" value.
+                Either a larger value than the number of items in the
+                "previous_items" queue, or a negative value.
         Returns:
             None.
        '''
-        self.step_back = steps
+        if steps.__class__ is not int or not 0 <= steps <= self._item_count - self._low:
+            steps = self.check_steps(steps)
+        self._step_back = steps
         self.rewind()
 
     def skip(self, steps: int = 1):
@@ -375,15 +785,30 @@ class BufferedIterator():
             None.
         '''
         steps = self.check_steps(steps, backwards=False, skip=buffer_overrun)
-        for step in range(steps):  # pylint: disable=unused-variable
+        target = self._item_count + steps
+        if self.indexed_source is not None:
+            if target > len(self.indexed_source):
+                self._seek(len(self.indexed_source))
+                raise BufferOverflowWarning(
+                    f'advance({steps}) exceeds the remaining items available '
+                    'in source.  Advancing to the end of source.')
+            # Jump over the items that would not be kept in the buffer.
+            if target - self._buffer_size > self._high:
+                self._seek(target - self._buffer_size)
+                steps = self._buffer_size
+        # Items already in the buffer only require moving the pointer.
+        from_buffer = min(steps, self._high - self._item_count)
+        if from_buffer > 0:
+            self._item_count += from_buffer
+            if self._item_count - self._low > self._buffer_size:
+                self._low = self._item_count - self._buffer_size
+        for step in range(steps - from_buffer):  # pylint: disable=unused-variable
             try:
-                next_item = self.get_next_item()
+                self.__next__()
             except BufferedIteratorEOF as eof:
                 raise BufferOverflowWarning(
                     f'advance({steps}) exceeds the remaining items available '
                     'in source.  Advancing to the end of source.') from eof
-            else:
-                self.previous_items.append(next_item)
 
     def look_back(self, steps: int = 1)->SourceItem:
         '''Return the sequence value the given number of steps back. Do not
@@ -401,12 +826,18 @@ class BufferedIterator():
             SourceLine: The desired previous source item.
         '''
         steps = self.check_steps(steps)
+        if steps > self._item_count - self._low:
+            # Only possible for an IndexedSource.
+            return self.indexed_source[self._item_count - steps]
         return self.previous_items[-steps]
 
     def look_ahead(self, steps: int = 1)->SourceItem:
         '''Return the sequence value the given number of steps Ahead. Do not
             move the iterator pointer position.
 
+        Items not yet in the buffer are read from the source and stored
+        after the iterator pointer.
+
         Args:
             steps (int, optional): The number of steps to forward for the
                 desired item. steps must be a positive integer and must be
@@ -415,19 +846,36 @@ class BufferedIterator():
         Raises:
             BufferedIteratorValueError: Raised if "steps" cannot be converted
                 to an integer, is less than 0.
+            BufferOverflowWarning: Raised if the source does not have "steps"
+                more items.
         Returns:
             SourceLine: The desired previous source item.
         '''
         steps = self.check_steps(steps, backwards=False, skip=False)
-        read_ahead = steps - len(self.future_items)
-        if read_ahead > 0:
-            if read_ahead > self.buffer_size:
-                raise BufferedIteratorValueError(
-                    f'look_ahead({steps}) exceeds the buffer_size. '
-                    'Will not be able to retrieve all skipped items.')
-            self.advance(read_ahead)
-            self.backup(read_ahead)
-        return self.future_items[steps-1]
+        cursor = self._item_count
+        target = cursor + steps
+        if steps > self._buffer_size:
+            # Only possible for an IndexedSource; read the item directly.
+            if target > len(self.indexed_source):
+                raise BufferOverflowWarning(
+                    f'look_ahead({steps}) exceeds the remaining items '
+                    'available in source.')
+            return self.indexed_source[target - 1]
+        while self._high < target:
+            try:
+                next_item = self._read_source()
+            except BufferedIteratorEOF as eof:
+                raise BufferOverflowWarning(
+                    f'look_ahead({steps}) exceeds the remaining items '
+                    'available in source.') from eof
+            self._slots[self._high % self._capacity] = next_item
+            self._high += 1
+        if steps == 0:
+            # Match the original behaviour of returning the last future item.
+            target = self._high
+        if target <= cursor:
+            raise IndexError('deque index out of range')
+        return self._slots[(target - 1) % self._capacity]
 
     def goto_item(self, item_num: int, buffer_overrun=False):
         '''Move to item number item_num in the sequence.
@@ -443,27 +891,11 @@ class BufferedIterator():
             buffer_overrun (bool, optional): If True do not check whether
                 items will be lost from the buffer.
         '''
-        current_item = self.item_count
-        if current_item is None:
-            raise BufferedIteratorValueError(
-                'Iteration has not started. Cannot move to item')
+        current_item = self._item_count
         steps = current_item - item_num
-        if steps == 0:
-            logger.debug(
-                f'Current item number is {current_item}. '
-                f'Requested item is {item_num}.'
-                'Already at requested item.')
-        elif steps < 0:
-            logger.debug(
-                f'Current item number is {current_item}. '
-                f'Requested item is {item_num}.'
-                f'Advancing {-steps} item(s).')
+        if steps < 0:
             self.advance(-steps, buffer_overrun)
-        else:
-            logger.debug(
-                f'Current item number is {current_item}. '
-                f'Requested item is {item_num}. '
-                f'Moving backwards {steps} item(s).')
+        elif steps > 0:
             self.backup(steps)
 
     def link(self, other: BufferedIterator,
@@ -480,26 +912,38 @@ class BufferedIterator():
             other (BufferedIterator): The BufferedIterator instance to copy
                     from.
             include_previous_items (bool, optional): If True, the previous items
-                    dequeue from other replaces this instance's dequeue.
-                    Otherwise, just clear the the previous items  dequeue.
+                    in other replace this instance's previous items.
+                    Otherwise, just clear the the previous items.
                     Defaults to True.
             include_future_items (bool, optional): If True, the future items
-                    dequeue from other replaces this instance's dequeue.
-                    Otherwise, just clear the the future items  dequeue.
+                    in other replace this instance's future items.
+                    Otherwise, just clear the the future items.
                     Defaults to False.
         Returns:
             None.
         '''
-        #self.source_gen = iter(other.source_gen)
-        self._step_back = other._step_back  # pylint: disable=protected-access
-        self._item_count = other._item_count  # pylint: disable=protected-access
-        # clear() and extend() allow for differing buffer sizes
-        self.previous_items.clear()
-        self.future_items.clear()
+        # pylint: disable=protected-access
+        self._step_back = other._step_back
+        cursor = other._item_count
+        self._item_count = cursor
         if include_previous_items:
-            self.previous_items.extend(other.previous_items)
+            low = max(other._low, cursor - self._buffer_size)
+        else:
+            low = cursor
         if include_future_items:
-            self.future_items.extend(other.future_items)
+            high = min(other._high, cursor + self._buffer_size)
+        else:
+            high = cursor
+        if other._capacity == self._capacity:
+            # Matching ring layouts; copy the whole ring in one step.
+            self._slots[:] = other._slots
+        else:
+            # Differing buffer sizes; copy the retained items slot by slot.
+            for idx in range(low, high):
+                self._slots[idx % self._capacity] = \
+                    other._slots[idx % other._capacity]
+        self._low = low
+        self._high = high
 
     def update(self, source: 'BufferedIterator', buffer_overrun=True):
         '''Update the source pointer to match that of the supplied source.
@@ -521,6 +965,18 @@ class BufferedIterator():
             self.goto_item(index)
             logger.debug(f'Moving BufferedIterator to item #{index}')
 
+    def close(self):
+        '''Release the source.
+
+        Stops the background thread of a PrefetchSource and closes a
+        generator source.  No further items are read from the source.
+        '''
+        if self.prefetch_source is not None:
+            self.prefetch_source.close()
+        close = getattr(self.source_gen, 'close', None)
+        if close is not None:
+            close()
+
     def __repr__(self)->str:
         '''Generate a string representation of a BufferedIterator instance.
 
@@ -537,3 +993,153 @@ class BufferedIterator():
             f'{class_name}.status = {self.status}'
             ])
         return repr_str
+
+
+#%% Async Sources
+def _loop_is_current(loop: asyncio.AbstractEventLoop)->bool:
+    '''True if loop is running on the current thread.'''
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+class _PendingItems():
+    '''The source iterator of an AsyncBufferedIterator.
+
+    Returns the items already fetched from the async source.  When none are
+    left, a thread other than the event loop thread waits for the event loop
+    to fetch another batch; on the event loop thread the items must be
+    fetched first with the async methods.
+    '''
+    def __init__(self, owner: AsyncBufferedIterator):
+        self.owner = owner
+
+    def __iter__(self)->_PendingItems:
+        return self
+
+    def __next__(self)->SourceItem:
+        owner = self.owner
+        pending = owner.pending
+        if not pending:
+            if owner.exhausted:
+                raise StopIteration
+            owner.wait_for_fill()
+            if not pending:
+                raise StopIteration
+        return pending.popleft()
+
+
+class AsyncBufferedIterator(BufferedIterator):
+    '''A BufferedIterator reading from an async iterable.
+
+    Items are fetched from the async source into a pending queue and then
+    stored in the ring in the same way as BufferedIterator, so backup(),
+    look_back(), step_back etc. are unchanged.  The methods that read new
+    items have async versions (async for, alook_ahead, aadvance), which
+    fetch the items needed before calling the BufferedIterator method.
+
+    The synchronous methods can also be used on another thread (e.g. by
+    Section.aread), in which case they wait for the event loop to fetch
+    each batch of items.  On the event loop thread they only use items
+    already fetched, raising AsyncSourcePending if more are needed.
+
+    Attributes:
+        batch_size (int): The maximum number of items fetched at one time
+            for a reader on another thread.
+        pending (deque): Items fetched from the async source, but not yet
+            stored in the ring.
+        exhausted (bool): True once the async source is exhausted.
+        closed (bool): True if no further items will be fetched.
+    '''
+    def __init__(self, source: AsyncIterable[SourceItem], buffer_size=5,
+                 batch_size: int = 256):
+        '''Create an AsyncBufferedIterator reading from an async iterable.
+
+        Args:
+            source (AsyncIterable[SourceItem]): The async iterable to read,
+                e.g. an asyncio.StreamReader.
+            buffer_size (int, optional): The size of the forward and reverse
+                buffers. Defaults to 5.
+            batch_size (int, optional): The maximum number of items fetched at
+                one time for a reader on another thread. Defaults to 256.
+        '''
+        self.async_source = source.__aiter__()
+        self.batch_size = batch_size
+        self.pending = deque()
+        self.exhausted = False
+        self.closed = False
+        self.loop = None
+        self._fill_future = None
+        super().__init__(_PendingItems(self), buffer_size=buffer_size)
+
+    async def fill(self, count: int = 1)->int:
+        '''Fetch up to count more items from the async source.
+
+        Args:
+            count (int, optional): The number of items to fetch. Defaults to
+                1.
+        Returns:
+            int: The number of items fetched.  Less than count only at the
+                end of the source.
+        '''
+        self.loop = asyncio.get_running_loop()
+        fetched = 0
+        while fetched < count and not (self.exhausted or self.closed):
+            try:
+                item = await self.async_source.__anext__()
+            except StopAsyncIteration:
+                self.exhausted = True
+                break
+            self.pending.append(item)
+            fetched += 1
+        return fetched
+
+    def wait_for_fill(self):
+        '''Wait for the event loop to fetch the next batch of items.
+
+        Raises:
+            AsyncSourcePending: If called on the event loop thread, or before
+                the event loop is known.
+        '''
+        if self.closed:
+            return
+        loop = self.loop
+        if loop is None or _loop_is_current(loop):
+            raise AsyncSourcePending(
+                'No items have been fetched from the async source. Use the '
+                'async methods, or read on another thread.')
+        self._fill_future = asyncio.run_coroutine_threadsafe(
+            self.fill(self.batch_size), loop)
+        self._fill_future.result()
+
+    def close(self):
+        '''Stop fetching items, ending any read on another thread.'''
+        self.closed = True
+        if self._fill_future is not None:
+            self._fill_future.cancel()
+
+    def _future_count(self)->int:
+        '''The number of items available without fetching.'''
+        return self._high - self._item_count + len(self.pending)
+
+    def __aiter__(self)->AsyncBufferedIterator:
+        return self
+
+    async def __anext__(self)->SourceItem:
+        if self._future_count() < 1:
+            await self.fill(1)
+        try:
+            return self.__next__()
+        except BufferedIteratorEOF as eof:
+            raise StopAsyncIteration from eof
+
+    async def alook_ahead(self, steps: int = 1)->SourceItem:
+        '''Fetch the items needed, then look_ahead(steps).'''
+        await self.fill(steps - self._future_count())
+        return self.look_ahead(steps)
+
+    async def aadvance(self, steps: int = 1, buffer_overrun=False):
+        '''Fetch the items needed, then advance(steps).'''
+        await self.fill(steps - self._future_count())
+        self.advance(steps, buffer_overrun)
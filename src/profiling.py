@@ -0,0 +1,223 @@
+'''Performance counters for section parsing.
+
+A Profiler is a trace hook (see tracing) that accumulates counters for each
+section instead of storing individual events.  For each section it records:
+    'Reads':          The number of times the section was read.
+    'Items Scanned':  The number of source items obtained by the section.
+    'Items Skipped':  The number of items passed over while searching for the
+                      start of the section.
+    'Breaks Fired':   The number of section boundaries detected.
+    'Triggers':       For each SectionBreak and Rule, the number of trigger
+                      'Evaluations' and 'Hits'.  SectionBreaks without a
+                      name of their own are listed by role, position and
+                      sentinel, e.g. "End 0: 'Total'".
+    'Stages':         For the source scan and each processing stage, the
+                      'Items' produced, 'Wall Time' and 'CPU Time' (s).  The
+                      time for a stage excludes the time spent in the stages
+                      before it.  The time for a stage that reads subsections
+                      includes the time spent in those subsections.
+    'Assemble':       The 'Items' assembled, 'Wall Time' and 'CPU Time' (s)
+                      spent in the section's assemble function.
+
+Counters are kept by section name, so sections in one tree should have
+distinct names.  Like all tracing, profiling slows parsing down, and it
+disables the fast paths that CompiledSection uses when tracing is off.  The
+counts are not affected, but the times are longer than without profiling.
+
+Usage:
+    with profile() as profiler:
+        section.read(source)
+    report = profiler.report(section)
+    profiler.save('profile.json', section)
+'''
+#%% Imports
+from __future__ import annotations
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import tracing
+from sections import Section, SectionGroup
+
+
+#%% Profiler
+def new_counters()->Dict[str, Any]:
+    '''Dict[str, Any]: The initial counters for a section.'''
+    return {
+        'Reads': 0,
+        'Items Scanned': 0,
+        'Items Skipped': 0,
+        'Breaks Fired': 0,
+        'Triggers': dict(),
+        'Stages': dict(),
+        'Assemble': {'Items': 0, 'Wall Time': 0.0, 'CPU Time': 0.0}
+        }
+
+
+def subsections(section: Section)->List[Section]:
+    '''The subsections read by a section's processing methods.
+
+    Args:
+        section (Section): The parent section.
+
+    Returns:
+        List[Section]: The subsections, in processing order.
+    '''
+    found = list()
+    for method in section.processor.processing_methods:
+        owner = getattr(getattr(method, '__wrapped__', None), '__self__',
+                        None)
+        if isinstance(owner, Section):
+            found.append(owner)
+        elif isinstance(owner, SectionGroup):
+            found.extend(owner.subsections)
+    return found
+
+
+class Profiler():
+    '''A trace hook that accumulates performance counters for each section.
+
+    Events emitted without a section name (e.g. by a Rule) are assigned to
+    the section of the most recent event that has one.
+
+    Attributes:
+        sections (Dict[str, Dict[str, Any]]): The counters for each section
+            name, in the order the sections were first seen.
+    '''
+    def __init__(self):
+        self.sections: Dict[str, Dict[str, Any]] = dict()
+        self._current_section = None
+
+    def counters(self, section_name: str)->Dict[str, Any]:
+        '''Get the counters for a section, creating them if necessary.
+
+        Args:
+            section_name (str): The name of the section.
+
+        Returns:
+            Dict[str, Any]: The section's counters.
+        '''
+        section_counters = self.sections.get(section_name)
+        if section_counters is None:
+            section_counters = new_counters()
+            self.sections[section_name] = section_counters
+        return section_counters
+
+    def __call__(self, event: tracing.TraceEvent):
+        '''Add a trace event to the counters.
+
+        Args:
+            event (tracing.TraceEvent): The event to count.
+        '''
+        section_name = event.section
+        if section_name is None:
+            section_name = self._current_section
+        else:
+            self._current_section = section_name
+        kind = event.kind
+        if kind == tracing.ITEM_FETCHED:
+            # Items fetched by a BufferedIterator are counted by the section
+            # that requested them.
+            if event.section is not None:
+                self.counters(section_name)['Items Scanned'] += 1
+        elif kind == tracing.TRIGGER_EVALUATED:
+            triggers = self.counters(section_name)['Triggers']
+            trigger = triggers.setdefault(event.name,
+                                          {'Evaluations': 0, 'Hits': 0})
+            trigger['Evaluations'] += 1
+            if event.value is not None:
+                trigger['Hits'] += 1
+        elif kind == tracing.BREAK_FIRED:
+            self.counters(section_name)['Breaks Fired'] += 1
+        elif kind == tracing.ITEMS_SKIPPED:
+            self.counters(section_name)['Items Skipped'] += event.value
+        elif kind == tracing.STAGE_TIMED:
+            timing = event.value
+            stages = self.counters(section_name)['Stages']
+            stage = stages.setdefault(timing.stage, {'Index': timing.index,
+                                                     'Items': 0,
+                                                     'Wall Time': 0.0,
+                                                     'CPU Time': 0.0})
+            stage['Items'] += timing.items
+            stage['Wall Time'] += timing.wall
+            stage['CPU Time'] += timing.cpu
+        elif kind == tracing.ASSEMBLE_TIMED:
+            timing = event.value
+            section_counters = self.counters(section_name)
+            section_counters['Reads'] += 1
+            assemble = section_counters['Assemble']
+            assemble['Items'] += timing.items
+            assemble['Wall Time'] += timing.wall
+            assemble['CPU Time'] += timing.cpu
+
+    def clear(self):
+        '''Remove all counters.'''
+        self.sections.clear()
+        self._current_section = None
+
+    def report(self, section: Optional[Section] = None)->Dict[str, Any]:
+        '''Build a report of the counters.
+
+        Args:
+            section (Section, optional): The top level section of the section
+                tree that was read.  Defaults to None.
+
+        Returns:
+            Dict[str, Any]: If section is given, the counters for section with
+                a 'Name' item and a 'Subsections' item containing the reports
+                for its subsections, mirroring the section tree.  Otherwise
+                the counters for every section, by section name.
+        '''
+        if section is None:
+            return {name: dict(section_counters)
+                    for name, section_counters in self.sections.items()}
+        section_counters = self.sections.get(section.name, new_counters())
+        section_report = {'Name': section.name, **section_counters}
+        section_report['Subsections'] = [self.report(subsection)
+                                         for subsection in subsections(section)]
+        return section_report
+
+    def to_json(self, section: Optional[Section] = None,
+                indent: Optional[int] = 2)->str:
+        '''The report as a JSON string.
+
+        Args:
+            section (Section, optional): The top level section. Defaults to
+                None.  See report.
+            indent (int, optional): The JSON indentation. Defaults to 2.
+
+        Returns:
+            str: The JSON report.
+        '''
+        return json.dumps(self.report(section), indent=indent)
+
+    def save(self, file_path: Path, section: Optional[Section] = None):
+        '''Write the report to a JSON file.
+
+        Args:
+            file_path (Path): The file to write.
+            section (Section, optional): The top level section. Defaults to
+                None.  See report.
+        '''
+        Path(file_path).write_text(self.to_json(section), encoding='utf-8')
+
+
+@contextmanager
+def profile(profiler: Optional[Profiler] = None)->Iterator[Profiler]:
+    '''Collect performance counters for the duration of a with block.
+
+    The profiler is installed as the trace hook; any previously installed
+    hook is restored on exit.
+
+    Args:
+        profiler (Profiler, optional): The profiler to add the counters to.
+            Defaults to None, which creates a new Profiler.
+
+    Yields:
+        Profiler: The installed profiler.
+    '''
+    if profiler is None:
+        profiler = Profiler()
+    with tracing.trace(profiler):
+        yield profiler
@@ -0,0 +1,253 @@
+'''On-disk cache of assembled section results.
+
+The same section definitions are often read from the same unchanged files by
+several jobs.  A ResultCache stores the assembled result of each read on
+local disk, keyed by:
+    A structural fingerprint of the section tree: the section settings, the
+        sentinels, locations and offsets of every SectionBreak, every
+        processing stage (functions, Rules, RuleSets and subsections) and the
+        assemble function.  Functions are identified by their qualified name
+        and a hash of their byte code, so editing a processing function also
+        changes the fingerprint.  See section_index.section_fingerprint.
+    A hash of the source content.
+    The initial context and the file opener.
+A hit returns the stored result, and the stored final context, without
+parsing.  Any change to the definition or the source gives a new key; entries
+that are no longer used are eventually evicted.
+
+The cache directory is bounded by max_bytes.  When a new entry takes the
+directory over the limit, the least recently used entries are deleted.  Use
+is recorded in the modification time of the entry files, so several
+processes can share a cache directory.
+
+Limitations:
+    The fingerprint can not see changes to global variables or to functions
+        called by the processing functions.  Call clear() after such changes.
+    Values captured in the closure of a processing function are part of the
+        fingerprint, so a function that collects items in a captured list
+        gives a new fingerprint, and misses the cache, after each read.
+    Assembled results and the final context must be picklable to be stored;
+        results that are not are returned but not cached.
+    A source that is not a file path or a sequence is read into a list, so
+        that it can be hashed.
+
+Usage:
+    cache = ResultCache(cache_dir, max_bytes=2**30)
+    dvh_info = cache.read(section, file_path)
+or
+    dvh_info = section.read_cached(file_path, cache)
+'''
+#%% Imports
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, List, Tuple, Union
+
+from sections import AssembledItem, ContextType, FileOpener, Section, Source
+from sections import read_file_lines
+from section_index import TRANSIENT_CONTEXT, describe, section_fingerprint
+
+
+#%% Logging
+logger = logging.getLogger('Result Cache')
+logger.setLevel(logging.INFO)
+
+
+#%% Fingerprints
+CACHE_VERSION = 1
+# Size of the blocks read when hashing a file.
+HASH_BLOCK_SIZE = 2**20
+
+
+def file_hash(file_path: Path)->str:
+    '''A hash of the whole content of a file.'''
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as binary_file:
+        for block in iter(lambda: binary_file.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def items_hash(items: List[Any])->str:
+    '''A hash of a sequence of source items.'''
+    digest = hashlib.sha256()
+    for item in items:
+        text = item if isinstance(item, str) else repr(item)
+        data = text.encode('utf-8', 'surrogatepass')
+        # Prefix each item with its length, so that item boundaries count.
+        digest.update(len(data).to_bytes(8, 'little'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+#%% Result Cache
+class ResultCache():
+    '''A size bounded, least recently used, on-disk cache of section results.
+
+    Attributes:
+        cache_dir (Path): The directory holding the cache entries.
+        max_bytes (int): The maximum total size of the cache entries.
+        hits (int): The number of reads answered from the cache.
+        misses (int): The number of reads that parsed the source.
+    '''
+    suffix = '.result'
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 2**30):
+        '''Open a cache directory, creating it if necessary.
+
+        Args:
+            cache_dir (Path): The directory holding the cache entries.
+            max_bytes (int, optional): The maximum total size of the cache
+                entries. Defaults to 1 GiB.
+        '''
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def entry_key(self, section: Section, source_hash: str,
+                  context: ContextType, opener: FileOpener)->str:
+        '''The cache key for reading a source with a section.
+
+        The section fingerprint is calculated for every read, so changes
+        made to a section after an earlier read are seen.
+        '''
+        text = json.dumps([CACHE_VERSION, section_fingerprint(section),
+                           source_hash, describe(opener), describe(context)],
+                          default=repr)
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def entry_path(self, key: str)->Path:
+        '''The file holding a cache entry.'''
+        return self.cache_dir / f'{key}{self.suffix}'
+
+    def get(self, key: str)->Tuple[bool, Any]:
+        '''Look up a cache entry, marking it as recently used.
+
+        Args:
+            key (str): The entry key.
+        Returns:
+            Tuple[bool, Any]: (True, stored value) for a hit, otherwise
+                (False, None).
+        '''
+        entry_path = self.entry_path(key)
+        try:
+            with open(entry_path, 'rb') as entry_file:
+                value = pickle.load(entry_file)
+            os.utime(entry_path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return False, None
+        return True, value
+
+    def put(self, key: str, value: Any)->bool:
+        '''Store a cache entry, then evict entries to stay within max_bytes.
+
+        Args:
+            key (str): The entry key.
+            value (Any): The value to store.
+        Returns:
+            bool: True if the value was stored.
+        '''
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as err:  # pylint: disable=broad-except
+            logger.debug(f'Result not cached: {err}')
+            return False
+        if len(data) > self.max_bytes:
+            return False
+        # Write to a temporary file first, so that readers never see a
+        # partial entry.
+        handle, temp_name = tempfile.mkstemp(dir=self.cache_dir,
+                                             suffix='.tmp')
+        with os.fdopen(handle, 'wb') as temp_file:
+            temp_file.write(data)
+        os.replace(temp_name, self.entry_path(key))
+        self.evict()
+        return True
+
+    def entries(self)->List[os.DirEntry]:
+        '''The cache entry files, least recently used first.'''
+        entries = [entry for entry in os.scandir(self.cache_dir)
+                   if entry.name.endswith(self.suffix)]
+        entries.sort(key=lambda entry: entry.stat().st_mtime_ns)
+        return entries
+
+    def size(self)->int:
+        '''The total size in bytes of the cache entries.'''
+        return sum(entry.stat().st_size for entry in self.entries())
+
+    def evict(self):
+        '''Delete the least recently used entries until the cache is within
+        max_bytes.'''
+        entries = self.entries()
+        total = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                # Removed by another process.
+                pass
+            total -= entry.stat().st_size
+
+    def clear(self):
+        '''Delete all cache entries.'''
+        for entry in self.entries():
+            os.remove(entry.path)
+
+    def read(self, section: Section, source: Union[Path, str, Source],
+             context: ContextType = None,
+             opener: FileOpener = read_file_lines)->AssembledItem:
+        '''Read a section from a source, using the cached result if
+        available.
+
+        Args:
+            section (Section): The section to read.
+            source (Path, str, Source): A file path, or a sequence of source
+                items.
+            context (ContextType, optional): The context supplied to the
+                read.  It is updated with the final context, also on a hit.
+                Defaults to None.
+            opener (FileOpener, optional): A function taking a file path and
+                returning the source items.  Defaults to read_file_lines.
+        Returns:
+            AssembledItem: The assembled section.
+        '''
+        if context is None:
+            context = {}
+        if isinstance(source, (str, Path)):
+            file_path = Path(source)
+            source_hash = file_hash(file_path)
+            items = None
+        else:
+            file_path = None
+            items = source if isinstance(source, (list, tuple)) \
+                else list(source)
+            source_hash = items_hash(items)
+        key = self.entry_key(section, source_hash, context, opener)
+        hit, value = self.get(key)
+        if hit:
+            self.hits += 1
+            result, final_context = value
+            context.update(final_context)
+            return result
+        self.misses += 1
+        if items is None:
+            items = opener(file_path)
+        result = section.read(items, context=context)
+        final_context = {name: value for name, value in context.items()
+                         if name not in TRANSIENT_CONTEXT}
+        self.put(key, (result, final_context))
+        return result
+
+    def __repr__(self)->str:
+        return (f'ResultCache({str(self.cache_dir)!r}, '
+                f'max_bytes={self.max_bytes})')
+
@@ -0,0 +1,658 @@
+'''Persistent section boundary indexes for random access to large files.
+
+Reading one section near the end of a large file normally means scanning
+every line before it.  A SectionIndex records where every instance of a
+section, and of each of its compiled subsections, begins and ends in a file.
+The index is built with one pass of the section's start and end breaks over
+the file and saved in a sidecar file next to it.  Later reads seek directly to
+the requested section instances and parse only their lines.
+
+The index is tied to both the file and the section definition.  It is rebuilt
+when the file's size, modification time or sampled hash changes, or when the
+boundary definitions of the section tree change.
+
+Limitations:
+    Only the start and end breaks are applied when indexing; processing
+        functions, Rules and assemble functions are not called.  A section
+        whose boundaries depend on context set by processing functions may be
+        indexed differently from how Section.read divides it.
+    A section read through the index is parsed in isolation, so context
+        values set by preceding sections are not available to it.
+    Only subsections that CompiledSection compiles (subsections that are the
+        first processing method of their parent) are indexed.
+
+The same boundary scan is used by read_parallel to divide one large source
+into section instances that are read concurrently by worker processes.
+
+The section fingerprints defined here are shared with result_cache and
+tail_reader: definition_fingerprint covers only the boundaries used by the
+index, while section_fingerprint also covers the processing methods and
+assemble functions.
+
+Usage:
+    index = SectionIndex.open(section, file_path)
+    dose_curve = index.read(section, key='DVH/Curve', instance=2)
+or
+    dose_curve = section.read_indexed(file_path, key='Curve', instance=2)
+or
+    structures = section.read_parallel(file_path, workers=4)
+'''
+#%% Imports
+from __future__ import annotations
+import hashlib
+import inspect
+import io
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from types import CodeType, FunctionType
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from typing import Union
+
+from buffered_iterator import BufferedIterator
+from sections import CompiledSection, ContextType, Section, SectionNode
+from sections import AssembledItem, Source, is_empty
+from sections import ProcessingMethods, Rule, RuleSet, SectionBreak
+from sections import SectionGroup
+from text_reader import MappedTextFile
+
+
+#%% Index Entries
+INDEX_VERSION = 1
+# Number of bytes hashed from each end of the file.
+HASH_SAMPLE_SIZE = 2**20
+
+
+class IndexEntry(NamedTuple):
+    '''The location of one section instance in a file.
+
+    Attributes:
+        name (str): The name of the section.
+        path (str): The names of the section and its enclosing sections,
+            outermost first, joined with '/'.
+        depth (int): The nesting level; 0 for the top level section.
+        parent (int, None): The position in the index of the enclosing section
+            instance.  None for top level sections.
+        start_line (int): The line number of the first line in the section.
+        end_line (int): The line number following the last line in the
+            section.
+        start_byte (int): The byte offset of start_line.
+        end_byte (int): The byte offset of end_line.
+    '''
+    name: str
+    path: str
+    depth: int
+    parent: Optional[int]
+    start_line: int
+    end_line: int
+    start_byte: int
+    end_byte: int
+
+
+#%% Fingerprints
+# Context items that only describe the most recent read.
+TRANSIENT_CONTEXT = ('Current Section', 'Skipped Lines', 'Status', 'Break',
+                     'Event')
+
+
+def code_digest(code: CodeType)->str:
+    '''A hash of a function's byte code, constants and names.'''
+    digest = hashlib.sha256(code.co_code)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            digest.update(code_digest(const).encode('utf-8'))
+        else:
+            digest.update(repr(const).encode('utf-8'))
+    digest.update(repr(code.co_names).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def describe(obj: Any)->Any:
+    '''A JSON compatible description of part of a section definition.
+
+    The description is stable between sessions: functions are described by
+    name and byte code rather than by their repr, which includes a memory
+    address.
+
+    Args:
+        obj (Any): A Section, processing stage, sentinel, function or value.
+    Returns:
+        Any: Nested lists of strings and numbers describing obj.
+    '''
+    # pylint: disable=too-many-return-statements
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    if isinstance(obj, Section):
+        return ['Section', obj.name, obj.start_search, obj.end_on_first_item,
+                obj.keep_skipped, obj.track_source_index,
+                describe(obj.start_section), describe(obj.end_section),
+                describe(obj.processor), describe(obj.assemble)]
+    if isinstance(obj, SectionGroup):
+        return ['SectionGroup', describe(list(obj.subsections))]
+    if isinstance(obj, ProcessingMethods):
+        return ['Processor', describe(obj.processing_methods)]
+    if isinstance(obj, SectionBreak):
+        return ['SectionBreak', describe(obj.sentinel), obj.location,
+                obj.offset]
+    if isinstance(obj, Rule):
+        return ['Rule', describe(obj.sentinel), obj.location,
+                describe(obj.pass_method), describe(obj.fail_method)]
+    if isinstance(obj, RuleSet):
+        return ['RuleSet', describe(obj.rule_seq),
+                describe(obj.default_method)]
+    if isinstance(obj, re.Pattern):
+        return ['RE', obj.pattern, obj.flags]
+    if isinstance(obj, partial):
+        return ['Partial', describe(obj.func), describe(list(obj.args)),
+                describe(obj.keywords)]
+    if inspect.ismethod(obj):
+        return ['Method', obj.__func__.__qualname__, describe(obj.__self__)]
+    if isinstance(obj, FunctionType):
+        closure = [cell.cell_contents for cell in obj.__closure__ or ()]
+        return ['Function', obj.__module__, obj.__qualname__,
+                code_digest(obj.__code__), describe(closure),
+                describe(obj.__defaults__)]
+    if isinstance(obj, (list, tuple)):
+        return [describe(item) for item in obj]
+    if isinstance(obj, dict):
+        return [[repr(key), describe(value)]
+                for key, value in sorted(obj.items(), key=repr)]
+    if isinstance(obj, type) or inspect.isbuiltin(obj):
+        return ['Builtin', getattr(obj, '__module__', None),
+                getattr(obj, '__qualname__', repr(obj))]
+    # Other objects, such as callable class instances, are described by
+    # their class and public attributes.
+    attributes = {key: value for key, value in vars(obj).items()
+                  if not key.startswith('_')} if hasattr(obj, '__dict__') \
+        else repr(obj)
+    return ['Object', type(obj).__module__, type(obj).__qualname__,
+            describe(attributes)]
+
+
+def section_fingerprint(section: Section)->str:
+    '''A hash of the structure of a section tree.
+
+    Args:
+        section (Section): The top level section.
+    Returns:
+        str: A hex digest that changes if any part of the section definition
+            changes.
+    '''
+    text = json.dumps(describe(section), default=repr)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def definition_fingerprint(section: Section)->str:
+    '''A hash of the boundary definitions of a compiled section tree.
+
+    Processing methods are not applied when indexing, so they are not
+    included; use section_fingerprint for the whole definition.
+
+    Args:
+        section (Section): The top level section.
+    Returns:
+        str: A hex digest that changes if the names or boundaries of any
+            section in the compiled tree change.
+    '''
+    definition = list()
+    for node in CompiledSection(section).nodes:
+        sub_section = node.section
+        breaks = list()
+        for break_list in (sub_section.start_section,
+                           sub_section.end_section):
+            breaks.append([[describe(brk.sentinel), brk.location, brk.offset]
+                           for brk in break_list])
+        definition.append([node_path(node), node.depth, breaks,
+                           sub_section.start_search,
+                           sub_section.end_on_first_item])
+    text = json.dumps(definition, default=repr)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def file_signature(file_path: Path)->Dict[str, Any]:
+    '''Identify the current version of a file.
+
+    The hash is a sampled hash, taken from the first and last
+    HASH_SAMPLE_SIZE bytes, so that checking the index of a large file does
+    not require reading the whole file.  Changes to the middle of a file that
+    keep its size are detected through the modification time.
+
+    Args:
+        file_path (Path): The indexed file.
+    Returns:
+        Dict[str, Any]: The size, modification time (ns) and sampled hash.
+    '''
+    stat = os.stat(file_path)
+    sample_hash = hashlib.sha256()
+    with open(file_path, 'rb') as binary_file:
+        sample_hash.update(binary_file.read(HASH_SAMPLE_SIZE))
+        if stat.st_size > HASH_SAMPLE_SIZE:
+            binary_file.seek(max(HASH_SAMPLE_SIZE,
+                                 stat.st_size - HASH_SAMPLE_SIZE))
+            sample_hash.update(binary_file.read())
+    return {'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sample_hash': sample_hash.hexdigest()}
+
+
+def node_path(node: SectionNode)->str:
+    '''str: The names of a node's section and enclosing sections, joined with
+    '/'.'''
+    return '/'.join(chain_node.section.name for chain_node in node.chain)
+
+
+def default_index_path(section: Section, file_path: Path)->Path:
+    '''The sidecar file for a section index.
+
+    Args:
+        section (Section): The top level section.
+        file_path (Path): The indexed file.
+    Returns:
+        Path: <file name>.<section name>.sectionindex.json in the same
+            directory as file_path.
+    '''
+    file_path = Path(file_path)
+    section_name = re.sub(r'[^\w\-]+', '_', section.name) or 'section'
+    return file_path.with_name(
+        f'{file_path.name}.{section_name}.sectionindex.json')
+
+
+#%% Indexer
+class SectionIndexer(CompiledSection):
+    '''Find the line range of every section instance in a compiled section
+    tree.
+
+    The SectionIndexer scans the source with the start and end breaks of each
+    node exactly as CompiledSection does, but discards the items instead of
+    processing and assembling them.
+
+    Attributes:
+        entries (List[list]): The [name, path, depth, parent, start_line,
+            end_line] of each section instance found, in the order the
+            sections start (enclosing sections before their subsections).
+    '''
+    def __init__(self, section: Section):
+        super().__init__(section)
+        self.entries: List[list] = list()
+        self.paths = {node: node_path(node) for node in self.nodes}
+        self._open_entries: List[int] = list()
+
+    def read_node(self, node: SectionNode, context: ContextType,
+                  start_search: bool = None, supplied_source=None
+                  )->Optional[int]:
+        '''Scan a node's section, recording its location.
+
+        Arguments:
+            node (SectionNode): The node to read.
+            context (ContextType): The context supplied to the section.
+            start_search (bool, optional): Overrides the section's
+                start_search attribute.  Defaults to None.
+            supplied_source (Source, optional): The source supplied to the top
+                level section.  Defaults to None.
+
+        Returns:
+            int, None: The position of the new entry, or None if the section
+                was empty.
+        '''
+        cursor = self._cursor
+        self.initialize(node, context, start_search, supplied_source)
+        section = node.section
+        source_index = section._source_index  # pylint: disable=protected-access
+        start = cursor.item_count
+        entry_num = len(self.entries)
+        parent = self._open_entries[-1] if self._open_entries else None
+        self.entries.append([section.name, self.paths[node], node.depth,
+                             parent, start, start])
+        self._open_entries.append(entry_num)
+        # source_index is maintained as in process(); its last value is the
+        # end of the entry.
+        if node.children is None:
+            for _ in self.scan(node):
+                source_index.append(cursor.item_count)
+        else:
+            for _ in self.read_subsections(node, context):
+                if node.count is None:
+                    source_index.append(node.hwm)
+                else:
+                    source_index.append(node.count)
+        self._open_entries.pop()
+        end = source_index[-1] if source_index else start
+        if end > start:
+            self.entries[entry_num][5] = end
+        else:
+            entry_num = None
+            del self.entries[len(self.entries) - 1:]
+        self.wrap_up(node, context)
+        return entry_num
+
+    def index(self, source: BufferedIterator)->List[list]:
+        '''Scan the entire source for the top level section.
+
+        Arguments:
+            source (BufferedIterator): The source to index.
+        Returns:
+            List[list]: The entries found.
+        '''
+        context = {}
+        section = self.section
+        while True:
+            position = source.item_count
+            self.read(source, context=context)
+            if section.scan_status in ['Scan Complete', 'End of Source']:
+                break
+            if source.item_count == position:
+                # Guard against a section definition that never advances.
+                break
+        return self.entries
+
+
+#%% Section Index
+class SectionIndex():
+    '''The locations of all instances of a section tree in a file.
+
+    Attributes:
+        file_path (Path): The indexed file.
+        section_name (str): The name of the top level section.
+        definition (str): The fingerprint of the section boundary definitions.
+        signature (Dict[str, Any]): The file_signature of the indexed file.
+        entries (List[IndexEntry]): The section instances found, in the order
+            they start.
+    '''
+    def __init__(self, file_path: Path, section_name: str, definition: str,
+                 signature: Dict[str, Any], entries: List[IndexEntry]):
+        self.file_path = Path(file_path)
+        self.section_name = section_name
+        self.definition = definition
+        self.signature = signature
+        self.entries = entries
+
+    @classmethod
+    def build(cls, section: Section, file_path: Path)->SectionIndex:
+        '''Index a file by scanning it once with the section's breaks.
+
+        Args:
+            section (Section): The top level section.
+            file_path (Path): The file to index.
+        Returns:
+            SectionIndex: The new index.
+        '''
+        file_path = Path(file_path)
+        signature = file_signature(file_path)
+        indexer = SectionIndexer(section)
+        with MappedTextFile(file_path) as mapped:
+            found = indexer.index(BufferedIterator(mapped))
+            entries = [IndexEntry(*entry, mapped.line_offset(entry[4]),
+                                  mapped.line_offset(entry[5]))
+                       for entry in found]
+        return cls(file_path, section.name, definition_fingerprint(section),
+                   signature, entries)
+
+    @classmethod
+    def load(cls, index_path: Path)->SectionIndex:
+        '''Read a saved index.
+
+        Args:
+            index_path (Path): The sidecar file.
+        Raises:
+            ValueError: If the file is not a SectionIndex of the current
+                version.
+        Returns:
+            SectionIndex: The saved index.
+        '''
+        with open(index_path, encoding='utf-8') as index_file:
+            data = json.load(index_file)
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f'{index_path} is not a version {INDEX_VERSION} '
+                             'section index.')
+        entries = [IndexEntry(*entry) for entry in data['entries']]
+        return cls(data['file'], data['section'], data['definition'],
+                   data['signature'], entries)
+
+    def save(self, index_path: Path):
+        '''Write the index to a sidecar file.
+
+        Args:
+            index_path (Path): The sidecar file.
+        '''
+        data = {'version': INDEX_VERSION,
+                'file': str(self.file_path),
+                'section': self.section_name,
+                'definition': self.definition,
+                'signature': self.signature,
+                'entries': [list(entry) for entry in self.entries]}
+        with open(index_path, 'w', encoding='utf-8') as index_file:
+            json.dump(data, index_file)
+
+    def is_current(self, section: Section, file_path: Path = None)->bool:
+        '''Check that the index matches the file and section definition.
+
+        Args:
+            section (Section): The top level section.
+            file_path (Path, optional): The file to check. Defaults to the
+                indexed file.
+        Returns:
+            bool: False if the file or the section boundaries have changed.
+        '''
+        if file_path is None:
+            file_path = self.file_path
+        if section.name != self.section_name:
+            return False
+        if self.definition != definition_fingerprint(section):
+            return False
+        try:
+            signature = file_signature(file_path)
+        except OSError:
+            return False
+        return signature == self.signature
+
+    @classmethod
+    def open(cls, section: Section, file_path: Path, index_path: Path = None,
+             rebuild: bool = False)->SectionIndex:
+        '''Load the saved index for a file, building it if necessary.
+
+        Args:
+            section (Section): The top level section.
+            file_path (Path): The indexed file.
+            index_path (Path, optional): The sidecar file. Defaults to
+                default_index_path(section, file_path).
+            rebuild (bool, optional): If True, build a new index even if the
+                saved index is current. Defaults to False.
+        Returns:
+            SectionIndex: An index matching the current file and section.
+        '''
+        if index_path is None:
+            index_path = default_index_path(section, file_path)
+        index_path = Path(index_path)
+        if index_path.exists() and not rebuild:
+            try:
+                index = cls.load(index_path)
+            except (ValueError, KeyError, TypeError):
+                index = None
+            if index is not None and index.is_current(section, file_path):
+                return index
+        index = cls.build(section, file_path)
+        index.save(index_path)
+        return index
+
+    def find(self, key: str = None)->List[IndexEntry]:
+        '''Select index entries by section name or path.
+
+        Args:
+            key (str, optional): A section name, or a '/' separated path of
+                section names from the top level section.  Defaults to None,
+                which selects the top level section instances.
+        Returns:
+            List[IndexEntry]: The matching entries, in file order.
+        '''
+        if key is None:
+            return [entry for entry in self.entries if entry.depth == 0]
+        if '/' in key:
+            return [entry for entry in self.entries if entry.path == key]
+        return [entry for entry in self.entries if entry.name == key]
+
+    def read(self, section: Section, key: str = None, instance: int = None,
+             context: ContextType = None
+             )->Union[AssembledItem, List[AssembledItem]]:
+        '''Parse selected section instances from the indexed file.
+
+        Only the lines of the selected instances are read.  The start of each
+        instance is already known, so the start search is skipped.
+
+        Args:
+            section (Section): The top level section that the index was built
+                for.
+            key (str, optional): A section name, or a '/' separated path of
+                section names.  Defaults to None, which selects the top level
+                section instances.
+            instance (int, optional): The position of a single instance among
+                the matching entries. Defaults to None, which reads all
+                matching instances.
+            context (ContextType, optional): The context supplied to each
+                section read. Defaults to None.
+        Raises:
+            KeyError: If no section in the index matches key.
+        Returns:
+            AssembledItem, List[AssembledItem]: The assembled section if
+                instance is given, otherwise a list of the assembled sections.
+        '''
+        matches = self.find(key)
+        if not matches:
+            raise KeyError(f'No {key} sections in the index of '
+                           f'{self.file_path}')
+        if instance is not None:
+            selected = [matches[instance]]
+        else:
+            selected = matches
+        sections = {node_path(node): node.section
+                    for node in CompiledSection(section).nodes}
+        if context is None:
+            context = {}
+        results = list()
+        with MappedTextFile(self.file_path) as mapped:
+            for entry in selected:
+                sub_section = sections[entry.path]
+                lines = islice(mapped.iter_from(entry.start_line),
+                               entry.end_line - entry.start_line)
+                results.append(sub_section.read(lines, start_search=False,
+                                                context=context))
+        if instance is not None:
+            return results[0]
+        return results
+
+
+#%% Parallel Reading
+# The section definition and context snapshot used by a read_parallel worker
+# process.
+_worker_section: Section = None
+_worker_context: Dict[str, Any] = None
+
+
+def _init_worker(section: Section, context: Dict[str, Any]):
+    '''Store the section definition for a read_parallel worker process.'''
+    global _worker_section, _worker_context  # pylint: disable=global-statement
+    _worker_section = section
+    _worker_context = context
+
+
+def _read_lines(lines: List[str])->AssembledItem:
+    '''Read one section instance from its lines in a worker process.'''
+    return _worker_section.read(lines, start_search=False,
+                                context=dict(_worker_context))
+
+
+def _read_byte_range(file_range: Tuple[str, int, int, str])->AssembledItem:
+    '''Read one section instance from a byte range of a file in a worker
+    process.
+
+    The lines are split as by MappedTextFile (or a file opened with
+    newline=''), keeping the line endings.
+    '''
+    file_path, start_byte, end_byte, encoding = file_range
+    with open(file_path, 'rb') as binary_file:
+        binary_file.seek(start_byte)
+        data = binary_file.read(end_byte - start_byte)
+    lines = list(io.StringIO(data.decode(encoding), newline=''))
+    return _read_lines(lines)
+
+
+def read_parallel(section: Section, source: Union[Path, str, Source],
+                  workers: int = None, context: ContextType = None,
+                  context_keys: Iterable[str] = None,
+                  encoding: str = 'utf-8', chunk_size: int = 1,
+                  mp_context=None)->List[AssembledItem]:
+    '''Read all instances of a section from one source, in parallel.
+
+    The source is first scanned with the section boundaries only (see
+    SectionIndexer) to find the line range of every instance of the section.
+    The instances are then read by a ProcessPoolExecutor and the results are
+    returned in source order.  The result matches list(section(source)) when
+    each instance can be read independently of the others.
+
+    Each worker process reads with its own copy of the section.  Context set
+    while reading one instance is not passed to the others.  Sections that
+    depend on context gathered by earlier sections (e.g. a plan lookup table)
+    are supported by reading the earlier sections sequentially into a context
+    dictionary and listing the keys they need in context_keys.  A snapshot of
+    those context items is sent once to each worker, and every instance is
+    read with a fresh copy of the snapshot.
+
+    Args:
+        section (Section): The repeating section to read.
+        source (Path, str, Source): A text file, or a sequence of source
+            items.  A file is indexed with a MappedTextFile and each worker
+            reads only the bytes of its section instances.  Other sources are
+            converted to a list, and the items of each instance are sent to
+            the workers.
+        workers (int, optional): The number of worker processes.  Defaults to
+            None, which uses the ProcessPoolExecutor default (the number of
+            processors).  If 0, the instances are read sequentially in the
+            current process.
+        context (ContextType, optional): Context gathered by reading earlier
+            sections.  Defaults to None.
+        context_keys (Iterable[str], optional): The context items that the
+            section depends on.  Defaults to None, which supplies no context
+            items.
+        encoding (str, optional): The text encoding of a source file.  Must
+            be ASCII compatible. Defaults to 'utf-8'.
+        chunk_size (int, optional): The number of section instances sent to a
+            worker at a time. Defaults to 1.
+        mp_context (optional): The multiprocessing context used to start the
+            workers.  Defaults to None, the multiprocessing default.
+    Raises:
+        KeyError: If an item in context_keys is not in context.
+    Returns:
+        List[AssembledItem]: The non-empty assembled section instances, in
+            source order.
+    '''
+    snapshot = dict()
+    if context_keys:
+        context = context if context else {}
+        snapshot = {key: context[key] for key in context_keys}
+    indexer = SectionIndexer(section)
+    if isinstance(source, (str, Path)):
+        with MappedTextFile(source, encoding=encoding) as mapped:
+            indexer.index(BufferedIterator(mapped))
+            tasks = [(str(source), mapped.line_offset(entry[4]),
+                      mapped.line_offset(entry[5]), encoding)
+                     for entry in indexer.entries if entry[3] is None]
+        read_task = _read_byte_range
+    else:
+        lines = list(source)
+        indexer.index(BufferedIterator(lines))
+        tasks = [lines[entry[4]:entry[5]]
+                 for entry in indexer.entries if entry[3] is None]
+        read_task = _read_lines
+    if workers == 0:
+        _init_worker(section, snapshot)
+        results = [read_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                                 initializer=_init_worker,
+                                 initargs=(section, snapshot)) as executor:
+            results = list(executor.map(read_task, tasks,
+                                        chunksize=chunk_size))
+    return [result for result in results if not is_empty(result)]
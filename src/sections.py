@@ -36,19 +36,33 @@ from __future__ import annotations
 # pylint: disable=logging-fstring-interpolation
 #%% Imports
 import re
+import queue
+import asyncio
 import inspect
 import logging
+import threading
+import traceback
+from copy import copy, deepcopy
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from inspect import isgeneratorfunction
 from functools import partial
-from functools import wraps
+from functools import update_wrapper
+from itertools import islice
 from abc import ABC, abstractmethod, abstractproperty
-from collections import Counter
+from array import array
+from collections import Counter, deque
+from pathlib import Path
 
 from typing import Dict, List, NamedTuple, Sequence, TypeVar, Tuple
 from typing import Iterable, Any, Callable, Union, Generator
+from typing import AsyncGenerator, AsyncIterable
 
 from buffered_iterator import BufferedIterator
 from buffered_iterator import BufferedIteratorEOF
+from buffered_iterator import PrefetchSource
+from buffered_iterator import AsyncBufferedIterator
+import tracing
 
 
 #%% Logging
@@ -64,6 +78,7 @@ SourceItem = Any
 Source = Iterable[SourceItem]
 # SourceOptions can be single SourceItem or an iterable of SourceItems.
 SourceOptions = Union[SourceItem, Source]
+AsyncSource = AsyncIterable[SourceItem]
 # 1 or more ProcessMethods applied to SourceItems result in ProcessedItems
 #   1 SourceItem ≠1 ProcessedItem;
 #	  • 1 SourceItem → 1 ProcessedItem
@@ -156,6 +171,10 @@ ProcessMethodsList = Union[ProcessFunc, "Rule", "RuleSet"]
 #%% Relevant Type definitions for Section Classes
 BreakOptions = Union["SectionBreak", List["SectionBreak"], str, None]
 
+# The retention policy for items skipped while searching for a section start:
+# 'All', 'Count', 'None' or the number of items to keep.
+SkipOptions = Union[str, int]
+
 # A sub-iterable of Source that only iterates over the Section content of Source.
 SectionGen = Generator[SourceItem, None, None]
 
@@ -485,18 +504,180 @@ def is_empty(obj: Any)->bool:
             return False
 
 
+class AttributedPartial(partial):
+    '''A partial function that keeps its attributes when pickled.
+
+    The wrappers created by sig_match and gen_func carry attributes such as
+    is_gen.  multiprocessing pickles functools.partial objects without their
+    attributes, but not subclasses of partial.
+    '''
+
+
 def gen_func(f):
     '''Identifies wrapped and partial generator functions
 
     Decorator function that adds the `is_gen` attribute and sets it to `True`.
+    The wrapper is a partial object, rather than a closure, so that it can be
+    pickled along with the wrapped function.
     '''
-    @wraps(f)
-    def wrapper(*args, **kwds):
-        return f(*args, **kwds)
+    wrapper = update_wrapper(AttributedPartial(f), f)
     wrapper.is_gen = True
     return wrapper
 
 
+# The number of items passed in each call to a batch function, unless set by
+# the function or the ProcessingMethods.
+DEFAULT_CHUNK_SIZE = 64
+
+
+def batch_func(f: Callable = None, *, chunk_size: int = None):
+    '''Identifies batch processing functions.
+
+    Decorator function that adds the `is_batch` attribute and sets it to `True`.
+    A batch function receives a list of items and returns an iterable of the
+    processed items, so it is called once per chunk of items rather than once
+    per item.  Chunks never extend past the end of a section.
+
+    Can be used as `@batch_func` or `@batch_func(chunk_size=500)`.
+
+    Arguments:
+        f (Callable): The batch function.
+        chunk_size (int, optional): The maximum number of items in each chunk.
+            Defaults to None, which uses the chunk_size of the
+            ProcessingMethods.
+    '''
+    def set_batch(func):
+        func.is_batch = True
+        func.chunk_size = chunk_size
+        return func
+    if f is None:
+        return set_batch
+    return set_batch(f)
+
+
+# Standard actions, argument adapters and trigger tests are module level
+# functions rather than lambdas so that section definitions can be pickled.
+def _rule_original(test_object, event, context):
+    return test_object
+
+def _rule_event(test_object, event, context):
+    return event
+
+def _rule_name(test_object, event, context):
+    return event.test_name
+
+def _rule_value(test_object, event, context):
+    return event.test_value
+
+def _rule_blank(test_object, event, context):
+    return ''
+
+def _rule_none(test_object, event, context):
+    return None
+
+def _process_original(test_object, context):
+    return test_object
+
+def _process_blank(test_object, context):
+    return ''
+
+def _process_none(test_object, context):
+    return None
+
+def _return_item(item, context):
+    return item
+
+# Set here, rather than only in set_method, so that the attribute is also
+# present in processes that unpickle a section definition.
+for _action in (_rule_original, _rule_event, _rule_name, _rule_value,
+                _rule_blank, _rule_none, _process_original, _process_blank,
+                _process_none, _return_item):
+    _action.is_gen = False
+
+# Standard Rule actions have no side effects, so a RuleSet may skip a failing
+# Rule that uses one of them as its fail_method.
+_RULE_ACTIONS = frozenset((_rule_original, _rule_event, _rule_name,
+                           _rule_value, _rule_blank, _rule_none))
+
+
+def _rule_call_item(func, item, event, context):
+    return func(item)
+
+def _rule_call_item_kw(func, item, event, context):
+    return func(item, **context)
+
+def _rule_call_item_event(func, item, event, context):
+    return func(item, event)
+
+def _rule_call_item_event_kw(func, item, event, context):
+    return func(item, event, **context)
+
+def _rule_call_item_event_context(func, item, event, context):
+    return func(item, event, context)
+
+def _process_call_item(func, item, context):
+    return func(item)
+
+def _process_call_item_context(func, item, context):
+    return func(item, context)
+
+def _process_call_item_kw(func, item, context):
+    return func(item, **context)
+
+
+def _string_in_test(sentinel, line, context):
+    return sentinel in line
+
+def _string_start_test(sentinel, line, context):
+    return line.startswith(sentinel)
+
+def _string_end_test(sentinel, line, context):
+    return line.endswith(sentinel)
+
+def _string_full_test(sentinel, line, context):
+    return sentinel == line
+
+def _re_search_test(sentinel, line, context):
+    return sentinel.search(line)
+
+def _re_match_test(sentinel, line, context):
+    return sentinel.match(line)
+
+def _re_fullmatch_test(sentinel, line, context):
+    return sentinel.fullmatch(line)
+
+def _boolean_test(sentinel, line, context):
+    return sentinel
+
+def _function_test(sentinel, line, context):
+    return sentinel(line, context)
+
+def _no_test(sentinel, line, context):
+    return False
+
+
+def stage_name(func: ProcessCallableOptions)->str:
+    '''A label for a processing stage.
+
+    Arguments:
+        func (ProcessCallableOptions): A processing function, Rule, RuleSet or
+            subsection reader.
+
+    Returns:
+        str: The name of the Rule, RuleSet or (sub)section(s) read, otherwise
+            the function name.
+    '''
+    owner = getattr(getattr(func, '__wrapped__', None), '__self__', None)
+    if isinstance(owner, SectionGroup):
+        return ', '.join(section.name for section in owner.subsections)
+    if owner is not None:
+        return getattr(owner, 'name', type(owner).__name__)
+    name = getattr(func, 'name', None)
+    if name is None:
+        name = getattr(func, '__name__', type(func).__name__)
+    return name
+
+
 def standard_action(action_name: str, method_type='Process')->SectionCallables:
     '''Convert a Method name to a Standard Function.
 
@@ -524,17 +705,17 @@ def standard_action(action_name: str, method_type='Process')->SectionCallables:
             (ProcessFunc, RuleFunc): One of the standard action functions.
     '''
     rule_actions = {
-            'Original': lambda test_object, event, context: test_object,
-            'Event':    lambda test_object, event, context: event,
-            'Name':     lambda test_object, event, context: event.test_name,
-            'Value':    lambda test_object, event, context: event.test_value,
-            'Blank':    lambda test_object, event, context: '',
-            'None':     lambda test_object, event, context: None
+            'Original': _rule_original,
+            'Event':    _rule_event,
+            'Name':     _rule_name,
+            'Value':    _rule_value,
+            'Blank':    _rule_blank,
+            'None':     _rule_none
             }
     process_actions = {
-            'Original': lambda test_object, context: test_object,
-            'Blank':  lambda test_object, context: '',
-            'None':  lambda test_object, context: None
+            'Original': _process_original,
+            'Blank':  _process_blank,
+            'None':  _process_none
             }
     if method_type == 'Process':
         use_function = process_actions.get(action_name)
@@ -596,18 +777,16 @@ def sig_match(given_method: RuleCallableOptions,
          process_method(test_object: SourceItem, context)
     '''
     rule_sig = {
-        (1, False): lambda func, item, event, context: func(item),
-        (1, True): lambda func, item, event, context: func(item, **context),
-        (2, False): lambda func, item, event, context: func(item, event),
-        (2, True):
-            lambda func, item, event, context: func(item, event, **context),
-        (3, False):
-            lambda func, item, event, context: func(item, event, context)
+        (1, False): _rule_call_item,
+        (1, True): _rule_call_item_kw,
+        (2, False): _rule_call_item_event,
+        (2, True): _rule_call_item_event_kw,
+        (3, False): _rule_call_item_event_context
         }
     process_sig = {
-        (1, False): lambda func, item, context: func(item),
-        (2, False): lambda func, item, context: func(item, context),
-        (1, True): lambda func, item, context: func(item, **context)
+        (1, False): _process_call_item,
+        (2, False): _process_call_item_context,
+        (1, True): _process_call_item_kw
         }
 
     arg_spec = inspect.getfullargspec(given_method)
@@ -633,7 +812,7 @@ def sig_match(given_method: RuleCallableOptions,
         sig_function = rule_sig.get((arg_count, has_varkw))
     if not sig_function:
         raise ValueError('Invalid function type.')
-    use_function = partial(sig_function, given_method)
+    use_function = AttributedPartial(sig_function, given_method)
     func_name = getattr(given_method, '__name__', None)
     if not func_name:
         if isinstance(given_method, partial):
@@ -691,6 +870,9 @@ def set_method(given_method: RuleMethodOptions,
                 use_function.is_gen = False
         else:
             use_function.is_gen = False
+        # Batch functions are also hidden by sig_match.
+        use_function.is_batch = getattr(given_method, 'is_batch', False)
+        use_function.chunk_size = getattr(given_method, 'chunk_size', None)
     return use_function
 
 
@@ -743,6 +925,256 @@ class ProtectedDict(dict):
         super().update(updater)
 
 
+class SkippedItems(NamedTuple):
+    '''A summary of the items passed over while searching for the start of
+    a section.
+
+    Used as context['Skipped Lines'] when a section's keep_skipped is 'Count'.
+
+    Attributes:
+        count (int): The number of items skipped.
+        start_item (int): The source index of the first item skipped.
+        end_item (int): The source index following the last item skipped.
+        start_byte (int, None): The file offset of the first item skipped, if
+            the source is a MappedTextFile, otherwise None.
+        end_byte (int, None): The file offset following the last item skipped,
+            if the source is a MappedTextFile, otherwise None.
+    '''
+    count: int
+    start_item: int
+    end_item: int
+    start_byte: int = None
+    end_byte: int = None
+
+
+SkippedLines = Union[List[SourceItem], SkippedItems]
+
+
+class SourceIndex():
+    '''A compact record of the source position following each section item.
+
+    The positions are held in a typed array, using 8 bytes for each section
+    item rather than a list item and an int object.  The append method is the
+    array's own append, so recording a position needs no Python level call.
+
+    If keep is given, only the first value and the last keep values are
+    stored.  This is enough to step back keep items (update_source) and to
+    find the end of the section, while using constant memory.
+
+    Attributes:
+        keep (int, None): The number of recent values stored, or None if all
+            values are stored.
+        complete (bool): True if all values are stored.
+    '''
+    def __init__(self, first: int, keep: int = None):
+        '''Start a source index.
+
+        Arguments:
+            first (int): The source position before the first section item.
+            keep (int, optional): The number of recent values to store.
+                Defaults to None, which stores all values.
+        '''
+        self.keep = keep
+        self.complete = keep is None
+        self._first = first
+        if self.complete:
+            self._values = array('q', [first])
+            self.append = self._values.append
+        else:
+            self._values = deque([first], maxlen=max(keep, 1))
+            self._length = 1
+            self.append = self._append_recent
+
+    def _append_recent(self, value: int):
+        '''Add a value, dropping the oldest stored value if necessary.'''
+        self._values.append(value)
+        self._length += 1
+
+    def __len__(self)->int:
+        if self.complete:
+            return len(self._values)
+        return self._length
+
+    def __getitem__(self, item_num: int)->int:
+        '''Get a source position by section item number.
+
+        Raises:
+            IndexError: If item_num is out of range, or is not stored.
+        '''
+        if self.complete:
+            return self._values[item_num]
+        length = self._length
+        if item_num < 0:
+            item_num += length
+        if not 0 <= item_num < length:
+            raise IndexError('SourceIndex index out of range')
+        if item_num == 0:
+            return self._first
+        offset = item_num - (length - len(self._values))
+        if offset < 0:
+            raise IndexError(f'SourceIndex item {item_num} is not stored')
+        return self._values[offset]
+
+    def tolist(self)->List[int]:
+        '''List[int]: All of the values.
+
+        Raises:
+            ValueError: If only the recent values are stored.
+        '''
+        if not self.complete:
+            raise ValueError('SourceIndex only stores the recent values.')
+        return self._values.tolist()
+
+    def __repr__(self)->str:
+        if self.complete:
+            return f'SourceIndex({self.tolist()})'
+        return (f'SourceIndex(first={self._first}, length={self._length}, '
+                f'recent={list(self._values)})')
+
+
+def skipped_store(keep_skipped: SkipOptions)->Union[List, deque, None]:
+    '''Create the container for skipped items required by keep_skipped.
+
+    Arguments:
+        keep_skipped (SkipOptions): A validated retention policy.
+
+    Returns:
+        Union[List, deque, None]: A list for 'All', a ring of the required
+            length for an integer and None if the items are not kept.
+    '''
+    if keep_skipped == 'All':
+        return list()
+    if isinstance(keep_skipped, int):
+        return deque(maxlen=keep_skipped)
+    return None
+
+
+def skipped_lines(keep_skipped: SkipOptions, store: Union[List, deque, None],
+                  start_item: int, count: int,
+                  source: BufferedIterator)->SkippedLines:
+    '''Convert the items collected while searching for a section start to
+    the 'Skipped Lines' context value.
+
+    Arguments:
+        keep_skipped (SkipOptions): A validated retention policy.
+        store (Union[List, deque, None]): The container created by
+            skipped_store.
+        start_item (int): The source index of the first item skipped.
+        count (int): The number of items skipped.
+        source (BufferedIterator): The source being searched.
+
+    Returns:
+        SkippedLines: The skipped items for 'All', the last items for an
+            integer, a SkippedItems summary for 'Count' and an empty list for
+            'None'.
+    '''
+    if store is None:
+        if keep_skipped != 'Count':
+            return []
+        end_item = start_item + count
+        line_offset = getattr(getattr(source, 'indexed_source', None),
+                              'line_offset', None)
+        if line_offset is None:
+            return SkippedItems(count, start_item, end_item)
+        return SkippedItems(count, start_item, end_item,
+                            line_offset(start_item), line_offset(end_item))
+    if isinstance(store, deque):
+        return list(store)
+    return store
+
+
+class Assembler(ABC):
+    '''Base class for streaming assemble functions.
+
+    The default assemble function, list, holds every processed item of a
+    section in memory before the section result is built.  An Assembler
+    builds its result as the items are produced:
+        start(context)      Prepare a new result.
+        add(item)           Add one processed item.
+        add_batch(items)    Add a list of processed items.  By default each
+                            item is passed to add; subclasses can override
+                            this to convert a whole batch at once.
+        finish()            Complete and return the result.
+
+    An instance can be used directly as a Section assemble function:
+        Section(name='DVH Curve', assemble=ArrayAssembler())
+    When called, the processed items are passed to add_batch in lists of
+    batch_size items, so no more than one batch is held at a time.  Each call
+    works on a shallow copy of the instance, so the same assembler can be
+    used by a section and its subsections, or read more than once.
+
+    Attributes:
+        batch_size (int): The number of processed items passed to each
+            add_batch call.
+    '''
+    batch_size = 1000
+
+    def start(self, context: ContextType = None):
+        '''Prepare a new result.
+
+        Arguments:
+            context (ContextType, optional): The section's context.
+        '''
+        # pylint: disable=unused-argument
+        return
+
+    @abstractmethod
+    def add(self, item: ProcessedItem):
+        '''Add one processed item to the result.'''
+
+    def add_batch(self, items: ProcessedList):
+        '''Add a list of processed items to the result.'''
+        for item in items:
+            self.add(item)
+
+    @abstractmethod
+    def finish(self)->AssembledItem:
+        '''Complete the result and return it.'''
+
+    def abort(self):
+        '''Release any resources if the items can not be assembled.'''
+        return
+
+    def __call__(self, items: ProcessedItems,
+                 context: ContextType = None)->AssembledItem:
+        '''Assemble a sequence of processed items.
+
+        Matches the standard assemble function signature.
+
+        Arguments:
+            items (ProcessedItems): The processed items to assemble.
+            context (ContextType, optional): The section's context.
+
+        Returns:
+            AssembledItem: The result of finish.
+        '''
+        assembler = copy(self)
+        assembler.start(context)
+        item_iter = iter(items)
+        try:
+            batch = list(islice(item_iter, self.batch_size))
+            while batch:
+                assembler.add_batch(batch)
+                batch = list(islice(item_iter, self.batch_size))
+        except BaseException:
+            assembler.abort()
+            raise
+        return assembler.finish()
+
+
+def close_prefetch(source: Source):
+    '''Stop the background thread of a prefetching source.
+
+    Arguments:
+        source (Source): A PrefetchSource, or a BufferedIterator reading from
+            one.  Other sources are ignored.
+    '''
+    if isinstance(source, BufferedIterator):
+        source = source.prefetch_source
+    if isinstance(source, PrefetchSource):
+        source.close()
+
+
 #%% Iteration Tools
 class TriggerEvent(): # pylint: disable=function-redefined
     '''Trigger test result information.
@@ -860,6 +1292,117 @@ class TriggerEvent(): # pylint: disable=function-redefined
                 self.test_name = str(sentinel)
 
 
+class MultiStringMatcher():
+    '''Test a string item against a list of string sentinels in one step.
+
+    A helper class to the Trigger class.  Rather than applying the string test
+    once for each sentinel in the list, the sentinels are compiled into a
+    single matcher for the required location:
+        location    Matcher
+          START     A single alternation regular expression, applied with
+                    re.match.  Alternatives are tried in list order, so the
+                    first sentinel in the list that matches is returned.
+          FULL      A dictionary lookup of the item.
+          END       A dictionary lookup of the item suffix, for each distinct
+                    sentinel length.  The matching sentinel earliest in the
+                    list is returned.
+          IN, None  A single alternation regular expression, applied with
+                    re.search, to reject items that do not contain any of the
+                    sentinels.  If the item contains a sentinel, the sentinels
+                    are tested in list order.
+
+    In every case the returned sentinel is the first sentinel in the list
+    that passes the equivalent individual string test.
+
+    Attributes:
+        sentinels (List[str]): The string sentinels, in precedence order.
+        location (str): One of ['IN', 'START', 'END', 'FULL', None].
+    '''
+    def __init__(self, sentinels: List[str], location: str = None):
+        '''Compile the matcher for the given sentinels and location.
+
+        Args:
+            sentinels (List[str]): The string sentinels, in precedence order.
+            location (str, optional): One of ['IN', 'START', 'END', 'FULL',
+                None]. Defaults to None, which is treated as 'IN'.
+        '''
+        self.sentinels = list(sentinels)
+        self.location = location
+        # The first occurrence of each sentinel string and its list position.
+        self._first_index = dict()
+        for idx, sentinel in enumerate(self.sentinels):
+            self._first_index.setdefault(sentinel, idx)
+        self._pattern = None
+        self._by_length = None
+        if location in ('START', 'IN', None):
+            alternatives = '|'.join(re.escape(sentinel)
+                                    for sentinel in self.sentinels)
+            self._pattern = re.compile(alternatives)
+        elif location == 'END':
+            self._by_length = dict()
+            for sentinel, idx in self._first_index.items():
+                self._by_length.setdefault(len(sentinel), {})[sentinel] = idx
+
+    @staticmethod
+    def can_compile(sentinels: List[str], location: str = None)->bool:
+        '''Test whether a list of sentinels can be compiled.
+
+        Empty string sentinels match every item for all locations except
+        'FULL', so they are left to the individual string tests.
+
+        Args:
+            sentinels (List[str]): The string sentinels.
+            location (str, optional): The sentinel location.
+
+        Returns:
+            bool: True if a MultiStringMatcher can be built.
+        '''
+        if not sentinels:
+            return False
+        if location not in ('IN', 'START', 'END', 'FULL', None):
+            return False
+        if location == 'FULL':
+            return True
+        return all(len(sentinel) > 0 for sentinel in sentinels)
+
+    def match(self, item: str)->Union[str, None]:
+        '''Return the first sentinel in the list that matches item.
+
+        Args:
+            item (str): The string to test.
+
+        Returns:
+            str | None: The matching sentinel, or None if no sentinel matches.
+        '''
+        location = self.location
+        if location == 'START':
+            found = self._pattern.match(item)
+            if found:
+                return self.sentinels[self._first_index[found.group()]]
+            return None
+        if location == 'FULL':
+            idx = self._first_index.get(item)
+            if idx is None:
+                return None
+            return self.sentinels[idx]
+        if location == 'END':
+            best = None
+            for length, suffixes in self._by_length.items():
+                idx = suffixes.get(item[-length:])
+                if idx is not None and (best is None or idx < best):
+                    best = idx
+            if best is None:
+                return None
+            return self.sentinels[best]
+        # 'IN' or None
+        if not self._pattern.search(item):
+            return None
+        for sentinel in self.sentinels:
+            if sentinel in item:
+                return sentinel
+        return None
+
+
 #%% Section Classes
 class Trigger():
     '''Test definition for evaluating a source item.
@@ -927,7 +1470,9 @@ class Trigger():
     If the supplied sentinel is a list of strings, compiled regular expressions
     or functions, the trigger will step through each sentinel element in the
     list, evaluating them against the supplied item to test.  When a test
-    passes, no additional items in the list will be tested.
+    passes, no additional items in the list will be tested.  A list of strings
+    is compiled into a single MultiStringMatcher, which returns the same
+    (first in the list) passing string without a test for each string.
 
     Attributes:
             sentinel (None, bool, int, str, re.Pattern, Callable, or
@@ -971,6 +1516,7 @@ class Trigger():
         self._sentinel = sentinel
         self._location = location
         self._is_multi_test = False
+        self._matcher = None
         self._sentinel_type = self.set_sentinel_type()
         self._test_func = self.set_test_func(location)
         self._event = TriggerEvent()
@@ -1058,6 +1604,8 @@ class Trigger():
             sentinel(line, context)
         if sentinel is None:
             False
+        If the sentinel is a list of strings, the list is also compiled into
+        a MultiStringMatcher, which evaluate() uses for string items.
         Args:
             location (str): Indicates how string and regular expression
                 sentinels will be applied as a test. One of:
@@ -1070,36 +1618,31 @@ class Trigger():
         '''
         test_options = {
             ('String', None):  # The default if location is not specified
-                lambda sentinel, line, context: sentinel in line,
-            ('String', 'IN'):
-                lambda sentinel, line, context: sentinel in line,
-            ('String', 'START'):
-                lambda sentinel, line, context: line.startswith(sentinel),
-            ('String', 'END'):
-                lambda sentinel, line, context: line.endswith(sentinel),
-            ('String', 'FULL'):
-                lambda sentinel, line, context: sentinel == line,
+                _string_in_test,
+            ('String', 'IN'): _string_in_test,
+            ('String', 'START'): _string_start_test,
+            ('String', 'END'): _string_end_test,
+            ('String', 'FULL'): _string_full_test,
             ('RE', None):  # The default if location is not specified
-                lambda sentinel, line, context: sentinel.search(line),
-            ('RE', 'IN'):
-                lambda sentinel, line, context: sentinel.search(line),
-            ('RE', 'START'):
-                lambda sentinel, line, context: sentinel.match(line),
-            ('RE', 'FULL'):
-                lambda sentinel, line, context: sentinel.fullmatch(line),
+                _re_search_test,
+            ('RE', 'IN'): _re_search_test,
+            ('RE', 'START'): _re_match_test,
+            ('RE', 'FULL'): _re_fullmatch_test,
             ('RE', 'END'):
                 NotImplementedError('The location "END" is not compatible with '
                                     'a regular expression test.'),
-            ('Boolean', None):
-                lambda sentinel, line, context: sentinel,
-            ('Function', None):
-                lambda sentinel, line, context: sentinel(line, context),
-            (None, None):
-                lambda sentinel, line, context: False
+            ('Boolean', None): _boolean_test,
+            ('Function', None): _function_test,
+            (None, None): _no_test
             }
         t_method = test_options[(self._sentinel_type, location)]
         if isinstance(t_method, Exception):
             raise t_method
+        # Compile a list of string sentinels into a single matcher.
+        self._matcher = None
+        if self._is_multi_test and self._sentinel_type == 'String':
+            if MultiStringMatcher.can_compile(self.sentinel, location):
+                self._matcher = MultiStringMatcher(self.sentinel, location)
         return t_method
 
     @property
@@ -1133,7 +1676,13 @@ class Trigger():
         '''
         test_passed = False
         self._event.reset()
-        if self._is_multi_test:
+        if self._matcher is not None and isinstance(item, str):
+            sentinel_item = self._matcher.match(item)
+            if sentinel_item is not None:
+                test_passed = True
+                self._event.record_event(True, sentinel_item,
+                                         self.name, self._sentinel_type)
+        elif self._is_multi_test:
             for sentinel_item in self.sentinel:
                 test_result = self._test_func(sentinel_item, item, context)
                 if test_result:
@@ -1266,7 +1815,7 @@ class SectionBreak(Trigger):  # pylint: disable=function-redefined
         return repr_str
 
     def check(self, item: SourceItem, source: BufferedIterator,
-              context: ContextType = None)->bool:
+              context: ContextType = None, trace_name: str = None)->bool:
         '''Check for a Break condition.
 
         If an Active count down situation exists, continue the count down.
@@ -1282,27 +1831,29 @@ class SectionBreak(Trigger):  # pylint: disable=function-redefined
                 offsets.
             context (Dict[str, Any], optional): Additional information to be
                 passed to the trigger object.  Defaults to an empty dictionary.
+            trace_name (str, optional): The name reported in trace events.
+                Defaults to None, which uses self.name.
         Returns (bool): True if the trigger test indicates a break point.
             False otherwise
         '''
-        logger.debug('in section_break.check')
         # Check for a Break condition
         if self._count_down is None:  # No Active Count Down
             # apply the trigger test.
             is_event = self.evaluate(item, context)
+            if tracing.trace_hook is not None:
+                section_name = context.get('Current Section') if context else None
+                tracing.emit(tracing.TRIGGER_EVALUATED, section_name,
+                             trace_name or self.name, source.item_count,
+                             self.event.test_value)
             if is_event:
-                logger.debug(f'Break triggered by {self.event.test_name}')
                 is_break = self.set_line_location(source)
             else:
                 is_break = False
         elif self._count_down == 0:  # End of Count Down Reached
-            logger.debug(f'Line count down in {self.name} completed.')
             self._count_down = None  # Remove Active Count Down
             is_break = True
             source.step_back = 1  # Save current line for next section
         elif self._count_down > 0:  #  Active Count Down Exists
-            logger.debug(f'Line count down in {self.name} Continuing;\t'
-                         f'Count down now at {self._count_down}')
             self._count_down -= 1   #  Continue Count Down
             is_break = False
         return is_break
@@ -1334,6 +1885,344 @@ class SectionBreak(Trigger):  # pylint: disable=function-redefined
         Set _count_down = None to remove any active Count Downs.'''
         self._count_down = None
 
+
+class BoundaryEvaluator():
+    '''Apply a list of SectionBreaks to a source item, stopping at the first
+    break that fires.
+
+    A helper class to the Section class.  Breaks are checked in list order,
+    so when more than one break could fire for an item, the break earliest in
+    the list takes precedence.  Checking stops as soon as a break fires, or
+    when a break's trigger begins an offset count down.
+
+    Breaks with an active offset count down are continued first, once for
+    each item, so that their count down is not interrupted by an earlier
+    break in the list.  When a count down ends, that break fires.
+
+    The sentinels of all String breaks, and of Regular Expression breaks
+    without groups or special flags, are merged into a single combined
+    pattern.  The combined pattern is searched once for each string item; if
+    it does not match, none of the merged breaks can fire and their triggers
+    are not evaluated.  The combined pattern is not used while tracing, so
+    that every trigger evaluation is reported.
+
+    The same sentinels can also be combined into a block_pattern, used to
+    search a block of many lines at once for the lines that may trigger one
+    of the breaks (see StartSearch).
+
+    Attributes:
+        breaks (List[SectionBreak]): The breaks, in precedence order.
+        role (str): 'Start' or 'End', used to name breaks in trace events.
+        never_fires (bool): True if every break has a sentinel of False, as
+            for the default end break.  Only trace events are lost by not
+            checking the breaks at all.
+    '''
+    # Regular expression flags that can be applied to part of a pattern.
+    scoped_flags = {re.IGNORECASE: 'i', re.MULTILINE: 'm', re.DOTALL: 's',
+                    re.VERBOSE: 'x'}
+    # Regular expression syntax that depends on the text around an item.
+    context_syntax = re.compile(r'\\[AZ]|[$^]|\(\?<?[=!]')
+
+    def __init__(self, breaks: List[SectionBreak], role: str = 'Break'):
+        '''Combine the sentinels of the breaks where possible.
+
+        Arguments:
+            breaks (List[SectionBreak]): The breaks, in precedence order.
+            role (str, optional): 'Start' or 'End'.  Defaults to 'Break'.
+        '''
+        self.breaks = list(breaks)
+        self.role = role
+        # pylint: disable=protected-access
+        self.never_fires = all(brk._sentinel_type == 'Boolean'
+                               and not brk.sentinel for brk in self.breaks)
+        # Breaks with a negative offset never begin a count down.
+        self._counting = tuple(brk for brk in self.breaks if brk.offset >= 0)
+        pieces = [self.break_pattern(brk) for brk in self.breaks]
+        self._pattern = None
+        if any(piece is not None for piece in pieces):
+            try:
+                self._pattern = re.compile('|'.join(
+                    piece for piece in pieces if piece is not None))
+            except re.error:
+                pieces = [None] * len(pieces)
+        self._steps = tuple((brk, piece is not None,
+                             self.trace_name(brk, role, index))
+                            for index, (brk, piece)
+                            in enumerate(zip(self.breaks, pieces)))
+        self._block_pattern = False
+
+    @staticmethod
+    def trace_name(brk: SectionBreak, role: str, index: int)->str:
+        '''The name used for a break in trace events.
+
+        Breaks keep the default name 'SectionBreak' unless one is given, so
+        a break with the default name is identified by its role, its
+        position and its sentinel, e.g. "End 1: 'Total'".
+
+        Arguments:
+            brk (SectionBreak): The break.
+            role (str): 'Start' or 'End'.
+            index (int): The position of the break in its list.
+
+        Returns:
+            str: The break's own name, or the generated name.
+        '''
+        if brk.name != 'SectionBreak':
+            return brk.name
+        sentinel = brk.sentinel
+        if isinstance(sentinel, re.Pattern):
+            sentinel_text = repr(sentinel.pattern)
+        elif callable(sentinel):
+            sentinel_text = getattr(sentinel, '__qualname__',
+                                    type(sentinel).__name__)
+        else:
+            sentinel_text = repr(sentinel)
+        return f'{role} {index}: {sentinel_text}'
+
+    @property
+    def block_pattern(self)->Union[re.Pattern, None]:
+        '''re.Pattern | None: A pattern that finds every line in a block of
+        lines that can trigger one of the breaks.
+
+        The pattern may also match lines that do not trigger a break, so the
+        lines found must still be checked.  None if any of the breaks cannot
+        be searched for in a block: Function sentinels, a sentinel of True,
+        and regular expressions that cannot be merged or that contain
+        anchors or look-around assertions.
+        '''
+        # pylint: disable=protected-access
+        if self._block_pattern is not False:
+            return self._block_pattern
+        pieces = list()
+        for brk in self.breaks:
+            if brk._sentinel_type == 'Boolean' and not brk.sentinel:
+                # Never fires.
+                continue
+            piece = self.break_pattern(brk, block=True)
+            if piece is None:
+                pieces = None
+                break
+            pieces.append(piece)
+        block_pattern = None
+        if pieces is not None:
+            try:
+                # '(?!)' never matches.
+                block_pattern = re.compile('|'.join(pieces) or '(?!)')
+            except re.error:
+                block_pattern = None
+        self._block_pattern = block_pattern
+        return block_pattern
+
+    @classmethod
+    def break_pattern(cls, brk: SectionBreak,
+                      block: bool = False)->Union[str, None]:
+        '''A regular expression matching the items that can trigger a break.
+
+        Arguments:
+            brk (SectionBreak): The break to convert.
+            block (bool, optional): If True, the pattern is searched for in
+                a block of lines rather than applied to a single item.  The
+                sentinels are not anchored to the start or end of the line,
+                so that the search can use a fast literal scan.  Defaults to
+                False.
+
+        Returns:
+            str | None: A pattern to search for, or None if the break's
+                sentinel cannot be merged.
+        '''
+        # pylint: disable=protected-access
+        location = brk.location
+        if brk._sentinel_type == 'Boolean' and not brk.sentinel:
+            # Never fires.
+            return '(?!)'
+        if brk._sentinel_type == 'String':
+            if isinstance(brk.sentinel, str):
+                sentinels = [brk.sentinel]
+            else:
+                sentinels = list(brk.sentinel)
+            patterns = [re.escape(sentinel) for sentinel in sentinels]
+        elif brk._sentinel_type == 'RE':
+            if isinstance(brk.sentinel, re.Pattern):
+                sentinels = [brk.sentinel]
+            else:
+                sentinels = list(brk.sentinel)
+            patterns = list()
+            for sentinel in sentinels:
+                # Group numbers and names would change in a combined pattern.
+                if not isinstance(sentinel.pattern, str) or sentinel.groups:
+                    return None
+                if block and cls.context_syntax.search(sentinel.pattern):
+                    return None
+                flags = sentinel.flags & ~re.UNICODE
+                scoped = ''
+                for flag, letter in cls.scoped_flags.items():
+                    if flags & flag:
+                        scoped += letter
+                        flags &= ~flag
+                if flags:
+                    return None
+                if scoped:
+                    patterns.append(f'(?{scoped}:{sentinel.pattern})')
+                else:
+                    patterns.append(f'(?:{sentinel.pattern})')
+        else:
+            return None
+        alternatives = '|'.join(patterns)
+        if block:
+            return f'(?:{alternatives})'
+        if location == 'START':
+            return rf'\A(?:{alternatives})'
+        if location == 'END':
+            return rf'(?:{alternatives})\Z'
+        if location == 'FULL':
+            return rf'\A(?:{alternatives})\Z'
+        return f'(?:{alternatives})'
+
+    def check(self, item: SourceItem, source: BufferedIterator,
+              context: ContextType = None)->Union[SectionBreak, None]:
+        '''Check the breaks for an item until one fires.
+
+        Arguments:
+            item (SourceItem): The current Source item.
+            source (BufferedIterator): The primary source from which item is
+                obtained.
+            context (Dict[str, Any], optional): Additional information to be
+                passed to the triggers.  Defaults to None.
+
+        Returns:
+            SectionBreak | None: The break that fired, or None if no break
+                fired.
+        '''
+        # pylint: disable=protected-access
+        for brk in self._counting:
+            if brk._count_down is not None:
+                if brk.check(item, source, context):
+                    return self.fired(brk)
+        screen = self._pattern is not None and isinstance(item, str) \
+            and tracing.trace_hook is None
+        possible = None
+        for brk, merged, trace_name in self._steps:
+            if brk._count_down is not None:
+                # Already continued above.
+                continue
+            if merged and screen:
+                if possible is None:
+                    possible = self._pattern.search(item) is not None
+                if not possible:
+                    continue
+            if brk.check(item, source, context, trace_name):
+                return self.fired(brk)
+            if brk._count_down is not None:
+                # The trigger began a count down.
+                return None
+        return None
+
+    def fired(self, brk: SectionBreak)->SectionBreak:
+        '''Cancel the count downs of the other breaks once a break fires.
+
+        Count downs that end on the same item as the break that fired would
+        set step_back again when next checked, so the boundary item would be
+        read twice.
+
+        Arguments:
+            brk (SectionBreak): The break that fired.
+
+        Returns:
+            SectionBreak: brk
+        '''
+        for other in self._counting:
+            if other is not brk:
+                other.reset()
+        return brk
+
+
+class StartSearch():
+    '''Move a source directly to the items that may start a section.
+
+    A helper class for the search for the start of a section.  When the
+    source is a BufferedIterator reading an IndexedSource, such as a
+    MappedTextFile, and all of the start breaks can be combined into a
+    BoundaryEvaluator.block_pattern, the IndexedSource searches large blocks
+    of text for the candidate lines.  The source is then moved directly to
+    each candidate line in turn, which is checked with the start breaks as
+    usual.  The lines in between are not read one at a time.
+
+    Fast forwarding is paused while any start break has an active offset
+    count down, so that the count down sees every item.
+
+    Attributes:
+        source (BufferedIterator): The source being searched.
+        breaks (List[SectionBreak]): The start breaks.
+    '''
+    def __init__(self, source: BufferedIterator, breaks: List[SectionBreak],
+                 pattern: re.Pattern):
+        '''Begin the block search at the current source position.
+
+        Arguments:
+            source (BufferedIterator): The source, reading an IndexedSource.
+            breaks (List[SectionBreak]): The start breaks.
+            pattern (re.Pattern): The block_pattern of the start breaks.
+        '''
+        self.source = source
+        self.breaks = breaks
+        self._indexed = source.indexed_source
+        self._candidates = self._indexed.search(pattern, source.item_count)
+        self._next = -1
+
+    @classmethod
+    def for_source(cls, source: BufferedIterator,
+                   evaluator: BoundaryEvaluator)->Union['StartSearch', None]:
+        '''Create a StartSearch if the source and breaks allow it.
+
+        Arguments:
+            source (BufferedIterator): The source to search.
+            evaluator (BoundaryEvaluator): The evaluator for the start breaks.
+
+        Returns:
+            StartSearch | None: None if the source is not an IndexedSource,
+                the breaks cannot be searched for in blocks, or tracing is
+                active.
+        '''
+        if tracing.trace_hook is not None:
+            return None
+        if getattr(source, 'indexed_source', None) is None:
+            return None
+        pattern = evaluator.block_pattern
+        if pattern is None:
+            return None
+        return cls(source, evaluator.breaks, pattern)
+
+    def fast_forward(self, store: Union[List, deque, None])->int:
+        '''Move the source to the next candidate line.
+
+        Arguments:
+            store (Union[List, deque, None]): The container for the skipped
+                items, from skipped_store.  The items passed over are added
+                to it.
+
+        Returns:
+            int: The number of items passed over.
+        '''
+        # pylint: disable=protected-access
+        for brk in self.breaks:
+            if brk._count_down is not None:
+                return 0
+        source = self.source
+        position = source.item_count
+        while self._next < position:
+            self._next = next(self._candidates, len(self._indexed))
+        steps = self._next - position
+        if steps <= 0:
+            return 0
+        if store is not None:
+            first = position
+            if getattr(store, 'maxlen', None) is not None:
+                first = max(position, self._next - store.maxlen)
+            store.extend(islice(self._indexed.iter_from(first),
+                                self._next - first))
+        source.goto_item(self._next, buffer_overrun=True)
+        return steps
+
 # Rule Class
 class Rule(Trigger):
     '''Defines action to take on an item depending on the result of a test.
@@ -1517,8 +2406,9 @@ class Rule(Trigger):
         if context is None:
             context = dict()
         result = self.apply(test_object, context)
-        logger.debug(f'Passed?  {self.event.test_passed}')
-        logger.debug(f'Result  {self.event.test_value}')
+        if tracing.trace_hook is not None:
+            tracing.emit(tracing.TRIGGER_EVALUATED, None, self.name, None,
+                         self.event.test_value)
         if self.use_gen:
             try:
                 for p_item in result:
@@ -1564,6 +2454,20 @@ class RuleSet():
         default_method (ProcessFunc): The method to apply if none of the Rules
             pass.
         name (str): A text label for the rule set.
+
+    Rules with location='START', string (or list of string) sentinels and a
+    standard action (e.g. 'Original') as their fail_method are indexed by the
+    leading characters of their sentinels when rule_seq is set.  For a string
+    item, only the indexed Rules whose sentinels begin with the same leading
+    characters as the item are applied, together with all of the Rules that
+    cannot be indexed (e.g. regular expression or function sentinels, or a
+    fail_method function), in their original order.  The other Rules cannot
+    match the item, and their fail methods have no side effects, so they are
+    not applied; their event is reset as if their test had failed.  The
+    result, and the state of every Rule, is the same as applying every Rule
+    in order.  The index is not used while tracing, so that every trigger
+    evaluation is reported.  If Rules in rule_seq are modified after the
+    RuleSet is created, re-assign rule_seq to rebuild the index.
     '''
 
 
@@ -1605,33 +2509,165 @@ class RuleSet():
             self.default_method = set_method('None', 'Process')
         else:
             self.default_method =  set_method(default, 'Process')
-        if all(isinstance(rule, Rule) for rule in rule_list):
-            self.rule_seq = rule_list
-        else:
-            raise ValueError('All items in rule_list must be of type Rule.')
+        self.rule_seq = rule_list
         self.use_gen = False
 
-    def apply(self, test_object: SourceItem,
-              context: ContextType = None)->ProcessedItems:
-        '''Apply the RuleSet to the supplied test item and return the output of
-        the first Rule to pass.
-
-        Argument:
-            test_object (SourceItem): The object to be tested.
-            context (Dict[str, Any], Optional): Any additional information to
-                be passed as keyword arguments to a sentinel function.  Ignored
-                for other sentinel types.
+    @property
+    def rule_seq(self)->List[Rule]:
+        '''List[Rule]: The Rules to apply, in order of precedence.
+        '''
+        return self._rule_seq
 
-        Returns:
-            ProcessedItems: The result of applying the relevant rule_method to
-                the supplied test_object.
+    @rule_seq.setter
+    def rule_seq(self, rule_list: List[Rule]):
+        '''Set the Rules to apply and build the prefix index.
 
+        Arguments:
+            rule_list (List[Rule]): A list of rules to apply in the order
+                they are to be applied.
+        Raises:
+            ValueError: If any item in rule_list is not a Rule.
         '''
-        if context is None:
-            context = dict()
-        for rule in self.rule_seq:
-            result = rule.apply(test_object, context)
-            if rule.event.test_passed:
+        if not all(isinstance(rule, Rule) for rule in rule_list):
+            raise ValueError('All items in rule_list must be of type Rule.')
+        self._rule_seq = rule_list
+        self._build_prefix_index()
+
+    @staticmethod
+    def start_sentinels(rule: Rule)->Union[List[str], None]:
+        '''Return the sentinel strings of a Rule that can be prefix indexed.
+
+        A Rule can be indexed if its location is 'START', its sentinel is a
+        non-empty string or a list of non-empty strings and its fail_method
+        is a standard action, which has no side effects.
+
+        Arguments:
+            rule (Rule): The Rule to check.
+
+        Returns:
+            List[str] | None: The Rule's sentinel strings, or None if the Rule
+                cannot be indexed.
+        '''
+        if rule.location != 'START':
+            return None
+        if rule._sentinel_type != 'String':  # pylint: disable=protected-access
+            return None
+        if getattr(rule.fail_method, 'func', rule.fail_method) \
+                not in _RULE_ACTIONS:
+            return None
+        if isinstance(rule.sentinel, str):
+            sentinels = [rule.sentinel]
+        else:
+            sentinels = list(rule.sentinel)
+        if not sentinels or not all(sentinels):
+            return None
+        return sentinels
+
+    def _build_prefix_index(self):
+        '''Index the START string Rules by the leading characters of their
+        sentinels.
+
+        Sets:
+            _prefix_length (int): The number of leading characters used as
+                the index key; the length of the shortest indexed sentinel.
+            _prefix_index (Dict[str, Tuple[Tuple[Rule, bool]]]): For each
+                key, every Rule in rule_seq order, paired with True if the
+                Rule must be applied: the indexed Rules with a sentinel
+                starting with the key and the Rules that cannot be indexed.
+                None if no Rules can be indexed.
+            _unindexed_rules (Tuple[Tuple[Rule, bool]]): The entries for an
+                item with no key in _prefix_index, where only the Rules that
+                cannot be indexed are applied.
+            _all_rules (Tuple[Tuple[Rule, bool]]): The entries applying every
+                Rule.
+        '''
+        rule_sentinels = [self.start_sentinels(rule) for rule in self._rule_seq]
+        indexed = [sentinels for sentinels in rule_sentinels if sentinels]
+        self._prefix_index = None
+        self._prefix_length = 0
+        self._all_rules = tuple((rule, True) for rule in self._rule_seq)
+        self._unindexed_rules = tuple(
+            (rule, not sentinels)
+            for rule, sentinels in zip(self._rule_seq, rule_sentinels))
+        if not indexed:
+            return
+        prefix_length = min(len(sentinel) for sentinels in indexed
+                            for sentinel in sentinels)
+        prefix_positions = dict()
+        for position, sentinels in enumerate(rule_sentinels):
+            if not sentinels:
+                continue
+            for sentinel in sentinels:
+                key = sentinel[:prefix_length]
+                prefix_positions.setdefault(key, set()).add(position)
+        unindexed_positions = {
+            position for position, sentinels in enumerate(rule_sentinels)
+            if not sentinels}
+        self._prefix_index = {
+            key: tuple((rule, position in positions
+                        or position in unindexed_positions)
+                       for position, rule in enumerate(self._rule_seq))
+            for key, positions in prefix_positions.items()
+            }
+        self._prefix_length = prefix_length
+
+    def candidate_rules(self, test_object: SourceItem)->Sequence[Rule]:
+        '''Select the Rules that could pass for the supplied test item.
+
+        Argument:
+            test_object (SourceItem): The object to be tested.
+
+        Returns:
+            Sequence[Rule]: The candidate Rules, in rule_seq order.
+        '''
+        return [rule for rule, applied in self.rule_entries(test_object)
+                if applied]
+
+    def rule_entries(self, test_object: SourceItem
+                     )->Sequence[Tuple[Rule, bool]]:
+        '''Pair every Rule with whether it must be applied to the item.
+
+        Argument:
+            test_object (SourceItem): The object to be tested.
+
+        Returns:
+            Sequence[Tuple[Rule, bool]]: The Rules in rule_seq order, each
+                with True if it could pass for test_object.
+        '''
+        if self._prefix_index is None or not isinstance(test_object, str) \
+                or tracing.trace_hook is not None:
+            return self._all_rules
+        key = test_object[:self._prefix_length]
+        return self._prefix_index.get(key, self._unindexed_rules)
+
+    def apply(self, test_object: SourceItem,
+              context: ContextType = None)->ProcessedItems:
+        '''Apply the RuleSet to the supplied test item and return the output of
+        the first Rule to pass.
+
+        Argument:
+            test_object (SourceItem): The object to be tested.
+            context (Dict[str, Any], Optional): Any additional information to
+                be passed as keyword arguments to a sentinel function.  Ignored
+                for other sentinel types.
+
+        Returns:
+            ProcessedItems: The result of applying the relevant rule_method to
+                the supplied test_object.
+
+        '''
+        if context is None:
+            context = dict()
+        for rule, applied in self.rule_entries(test_object):
+            if not applied:
+                # The Rule cannot pass and its fail method has no side
+                # effects; leave it as a failed test would.
+                if rule.event.test_passed:
+                    rule.event.reset()
+                    rule.use_gen = False
+                continue
+            result = rule.apply(test_object, context)
+            if rule.event.test_passed:
                 self.use_gen = rule.use_gen
                 break
         else:
@@ -1715,12 +2751,19 @@ class ProcessingMethods():
         func(item, context)
         func(item, [other(s),] ** context)
 
+    Functions marked with the batch_func decorator accept the same argument
+    sets, but receive a list of items and return an iterable of processed
+    items.  The items are passed in chunks of up to chunk_size items and the
+    results are yielded as each chunk is processed.
+
     Attributes:
         processing_methods (ProcessGroup): The sequence of Processes (functions,
             generator functions, Rules, and/or RuleSets) to be applied to a
             source.
         name (str): Reference label for the processing method.
             Defaults to 'Processor'
+        chunk_size (int): The maximum number of items passed in each call to a
+            batch function that does not set its own chunk_size.
         calling_section (SectionBase, optional): The Section object
                 that uses this ProcessingMethods object.  This reference is
                 required for subsection read methods. Defaults to None.
@@ -1734,7 +2777,8 @@ class ProcessingMethods():
     '''
     def __init__(self, processing_methods: List[ProcessMethodOptions] = None,
                  name: str = 'Processor',
-                 calling_section: SectionBase = None):
+                 calling_section: SectionBase = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
         '''Applies a series of functions to a supplied sequence of items.
 
         Processing functions should accept one the following argument sets:
@@ -1752,13 +2796,15 @@ class ProcessingMethods():
             calling_section (SectionBase, optional): The Section object
                 that uses this ProcessingMethods object.  This reference is
                 required for subsection read methods. Defaults to None.
+            chunk_size (int, optional): The maximum number of items passed in
+                each call to a batch function.  Defaults to
+                DEFAULT_CHUNK_SIZE.
         '''
         self.name = name
         self.calling_section = calling_section
+        self.chunk_size = chunk_size
         if not processing_methods:
-            return_item = lambda item, context: item
-            return_item.is_gen = False
-            self.processing_methods = [return_item]
+            self.processing_methods = [_return_item]
         else:
             self.processing_methods = self.clean_methods(processing_methods)
 
@@ -1797,13 +2843,16 @@ class ProcessingMethods():
 
     @staticmethod
     def func_to_iter(source: Source, func: ProcessFunc,
-                    context: ContextType = None)->ProcessedItemGen:
+                    context: ContextType = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE)->ProcessedItemGen:
         '''Create a iterator that applies func to each item in source.
 
-        If func is a generator function, return the iterator created by calling
-        func with source.  Otherwise use a generator expression to return an
-        iterator that returns the result of calling func on each item in source.
-        No type checking is performed.
+        If func is a batch function, return an iterator that calls func with
+        successive chunks of items from source, yielding the results of each
+        call.  If func is a generator function, return the iterator created by
+        calling func with source.  Otherwise use a generator expression to
+        return an iterator that returns the result of calling func on each item
+        in source.  No type checking is performed.
 
         context is not explicitly returned, but if supplied, items in context
         may be modified by func.
@@ -1815,6 +2864,9 @@ class ProcessingMethods():
                 can be applied to a Source.
             context (ContextType, optional): Contextual information to be used
                 and / or set by func. Defaults to None.
+            chunk_size (int, optional): The maximum number of items passed in
+                each call to a batch function that does not set its own
+                chunk_size.  Defaults to DEFAULT_CHUNK_SIZE.
         Returns:
             ProcessedItemGen: An iterator that returns the result of calling func
                 on each item in source.
@@ -1823,10 +2875,21 @@ class ProcessingMethods():
             for item in source:
                 yield from func(item, context)
 
+        def batch_gen(source, context,
+                      size) -> Generator[ProcessedItem, None, None]:
+            source = iter(source)
+            while True:
+                chunk = list(islice(source, size))
+                if not chunk:
+                    break
+                yield from func(chunk, context)
+
         if context is None:
             context = dict()
         if isinstance(func, (Rule, RuleSet)):
             return func_gen(source, context)
+        if getattr(func, 'is_batch', False):
+            return batch_gen(source, context, func.chunk_size or chunk_size)
         # Test whether the function is a generator function as identified
         # earlier by the set_method function.
         if func.is_gen:
@@ -1894,12 +2957,46 @@ class ProcessingMethods():
             self.calling_section = calling_section
         if context is None:
             context = dict()
+        if tracing.trace_hook is not None:
+            return self.timed_reader(source, context)
         next_source = source
         for func in self.processing_methods:
-            next_source = self.func_to_iter(next_source, func, context)
+            next_source = self.func_to_iter(next_source, func, context,
+                                            self.chunk_size)
         final_generator = iter(next_source)
         return final_generator
 
+    def timed_reader(self, source: Source, context: ContextType
+                     )->ProcessedItemGen:
+        '''The reader generator chain, with a tracing.StageTimer on the source
+        and on each processing stage.
+
+        Used in place of the normal generator chain while tracing.  A
+        STAGE_TIMED event is emitted for the source ('Scan') and for each
+        stage when it is exhausted.  A stage's time excludes the time spent in
+        the earlier stages, but includes the time spent in any subsections it
+        reads.
+
+        Arguments:
+            source (Source): The section items.
+            context (ContextType): Additional information that can be
+                accessed and / or set by the Process functions.
+        Returns:
+            ProcessedItemGen: The timed processing iterator.
+        '''
+        if self.calling_section is not None:
+            section_name = self.calling_section.name
+        else:
+            section_name = self.name
+        timer = tracing.StageTimer('Scan')
+        next_source = timer.time_iter(source, section_name)
+        for index, func in enumerate(self.processing_methods):
+            next_source = self.func_to_iter(next_source, func, context,
+                                            self.chunk_size)
+            timer = tracing.StageTimer(stage_name(func), index, timer)
+            next_source = timer.time_iter(next_source, section_name)
+        return next_source
+
 
     def read(self, source: Source, context: ContextType = None,
              calling_section: SectionBase = None)->ProcessedList:
@@ -1958,7 +3055,8 @@ class ProcessingMethods():
             context = {}
         result = [item]
         for func in self.processing_methods:
-            result = self.func_to_iter(iter(result), func, context)
+            result = self.func_to_iter(iter(result), func, context,
+                                       self.chunk_size)
         output = [item for item in result]
         if len(output) == 1:
             output = output[0]
@@ -2024,6 +3122,11 @@ class Section(SectionBase):
                 In that case, start_section and end_section would trigger on the
                 same line, resulting in an empty section.
                 Setting end_on_first_item to False prevents this.
+            keep_skipped (SkipOptions): The items passed over while searching
+                for the start of the section that are kept in
+                context['Skipped Lines'].  See __init__.
+            track_source_index (bool): Whether the source position following
+                every section item is kept (see source_index).
 
         Status Indicators.  scan_status and context provide information about
             the state of the section while and after being applied to a
@@ -2091,7 +3194,9 @@ class Section(SectionBase):
                 length of source_index is one more than the number of section
                 items that have been generated. If each source item results in
                 more than one processed item, then the same source index value
-                will be repeated.
+                will be repeated.  The index is held internally as a compact
+                SourceIndex.  If track_source_index is False, only the recent
+                values are held and source_index is None.
 
     Methods:
         read(source, start_search, do_reset, initialize, context): Step through
@@ -2132,7 +3237,9 @@ class Section(SectionBase):
                  name: str = 'Section',
                  #keep_partial: bool = False,
                  end_on_first_item: bool = False,
-                 start_search: bool = None):
+                 start_search: bool = None,
+                 keep_skipped: SkipOptions = 'All',
+                 track_source_index: bool = True):
         '''Creates an Section instance that defines a continuous portion of a
         text stream to be processed in a specific way.
 
@@ -2184,6 +3291,22 @@ class Section(SectionBase):
                 advance until the start boundary is found. Defaults to True, if
                 start_section is given and to False if start_section is not
                 given.
+            keep_skipped (SkipOptions, optional): Which of the items passed
+                over while searching for the start of the section are kept in
+                context['Skipped Lines']. One of:
+                    'All': A list of all skipped items.
+                    An integer n: A list of the last n skipped items.
+                    'Count': A SkippedItems summary giving the number of items
+                        skipped and their source (and file byte) range.
+                    'None': An empty list.
+                Only 'All' stores a number of items that grows with the
+                distance to the section start.  Defaults to 'All'.
+            track_source_index (bool, optional): If True, the source position
+                following every section item is kept, and is available from
+                source_index.  If False, only the positions needed to step
+                back buffer_size items are kept, so reading the section uses
+                constant memory for indexing; item_count and
+                source_item_count are not affected.  Defaults to True.
         Returns:
             New Section.
         '''
@@ -2191,6 +3314,8 @@ class Section(SectionBase):
         self.name = name
         #self.keep_partial = keep_partial
         self.end_on_first_item = end_on_first_item
+        self.keep_skipped = keep_skipped
+        self.track_source_index = track_source_index
         # If start_search is None, This will be modified based on whether .
         # start_section is given
         self.start_search = start_search
@@ -2244,6 +3369,26 @@ class Section(SectionBase):
         for break_itm in self.end_section:
             break_itm.reset()
 
+    # Pickling
+    def __getstate__(self)->Dict[str, Any]:
+        '''Return the section definition without the state of the current
+        read.
+
+        The source (often a generator) and the context belong to the current
+        read, so they are not pickled.  An unpickled section is in the same
+        state as a newly created section.
+        '''
+        state = self.__dict__.copy()
+        for attr in ('context', '_original_source', '_source',
+                     '_source_index', 'is_first_item'):
+            state[attr] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        '''Restore a pickled section definition.'''
+        self.__dict__.update(state)
+        self.reset()
+
     # Source indexing properties
     @property
     def source_index(self) -> list[int] | None:
@@ -2265,11 +3410,29 @@ class Section(SectionBase):
         list may be greater than 0.  If source reading has not started the index
         will not have been initialized and this call returns None
 
+        If track_source_index is False only the recent pointers are kept, and
+        this call also returns None.
+
         Returns:
             list[int] | None: A list of pointers to the source, or None if the
                 source reading has not started.
         '''
-        return self._source_index
+        if self._source_index is None or not self._source_index.complete:
+            return None
+        return self._source_index.tolist()
+
+    def new_source_index(self, first: int)->SourceIndex:
+        '''Start a new source index for the section.
+
+        Arguments:
+            first (int): The source position before the first section item.
+        Returns:
+            SourceIndex: An index storing all values if track_source_index is
+                True, otherwise only the last buffer_size values.
+        '''
+        if self.track_source_index:
+            return SourceIndex(first)
+        return SourceIndex(first, keep=self.buffer_size)
 
     @property
     def source_item_count(self) -> int:
@@ -2315,6 +3478,20 @@ class Section(SectionBase):
     def source(self, source: Source):
         '''Wrap the source in a BufferedIterator if it is not one already.
 
+        A supplied BufferedIterator (e.g. the source of a parent section or
+        section group) is used directly, so that the section shares its
+        cursor rather than reading through a second buffer.  Its buffer_size
+        then limits how far the section's breaks can step back.
+
+        A subsection read by Section.__call__ is supplied with its parent's
+        processed items, not with the parent's cursor.  The parent's
+        processing methods may transform or drop items, so those items are
+        buffered again, for step back, at every level.  The cost of each item
+        in Section.read therefore still grows with the nesting depth.  For a
+        per-item cost that does not grow with depth, read the tree through
+        compile(), which reads subsections that are the first processing
+        method of their parent directly from one shared cursor.
+
         Arguments:step_source
             source (Source): A sequence of items with a type matching that
                 expected by the first of the series of processing methods.
@@ -2322,16 +3499,18 @@ class Section(SectionBase):
         if source:
             # Keep the original supplied source protected
             self._original_source = source
-            # Wrap the supplied source in a BufferedIterator.
-            buffered_source = BufferedIterator(source,
-                                               buffer_size=self.buffer_size)
-            # If the supplied source is a BufferedIterator set the buffers.
             if isinstance(source, BufferedIterator):
-                buffered_source.link(source)
+                # Share the supplied cursor.
+                buffered_source = source
+            else:
+                # Wrap the supplied source in a BufferedIterator.
+                buffered_source = BufferedIterator(
+                    source, buffer_size=self.buffer_size)
             # Set the section source used for direct iteration
             self._source = buffered_source
             # initialize the indexing
-            self._source_index = [buffered_source.item_count]
+            self._source_index = self.new_source_index(
+                buffered_source.item_count)
             self.is_first_item = None
         else:
             # Reset the source
@@ -2342,22 +3521,11 @@ class Section(SectionBase):
     def update_supplied_source(self):
         '''Update the supplied source pointer.
 
-        When the section is supplied with BufferedIterator as a source, and the
-        generator has not closed at the end of the section iteration (reached
-        the end or raised an exception), then adjust the buffers in the supplied
-        source to match the internal one used in the iteration.  In this way
-        when a section_end offset is 'before', the buffered items are not lost
-        when the section ends.
-        '''
-        # If the generator has not closed
-        if self.scan_status not in ['Scan Complete', 'End of Source']:
-            # Update the original source
-            if isinstance(self._original_source, BufferedIterator):
-                if len(self.source.future_items) > 0:
-                    source_pointer = self.source_index[-1]
-                    logger.debug(f'Moving original source to item #{source_pointer}')
-                    self._original_source.goto_item(source_pointer,
-                                                    buffer_overrun=True)
+        A BufferedIterator supplied as the source is read directly (see the
+        source property), so items stepped back at the end of the section are
+        already available to the next reader and no update is needed.  Kept
+        for compatibility; it does nothing.
+        '''
 
     def update_source(self, source: BufferedIterator):
         '''Update the source pointer to match that of the supplied source.
@@ -2375,7 +3543,7 @@ class Section(SectionBase):
         if steps_back > 0:
             # Convert the number of steps back in the given source to the
             # number of steps back in this source.
-            offset = self.source_index[-steps_back]
+            offset = self._source_index[-steps_back]
             self.source.goto_item(offset)
 
     # Initialize and manage section_breaks
@@ -2416,6 +3584,8 @@ class Section(SectionBase):
             if self.start_search is None:
                 self.start_search = False
             self._start_section = [self.default_start]
+        self._start_evaluator = BoundaryEvaluator(self._start_section,
+                                                  'Start')
 
     @property
     def end_section(self)->List[SectionBreak]:
@@ -2448,6 +3618,7 @@ class Section(SectionBase):
             self._end_section = brk
         else:
             self._end_section = [self.default_end]
+        self._end_evaluator = BoundaryEvaluator(self._end_section, 'End')
 
     def set_break(self, section_break: BreakOptions) -> List[SectionBreak]:
         '''Convert the supplied BreakOption to a list of SectionBreaks.
@@ -2543,10 +3714,44 @@ class Section(SectionBase):
                             'ProcessingMethods'])
             raise ValueError(msg) from err
 
+    @property
+    def keep_skipped(self)->SkipOptions:
+        '''SkipOptions: The retention policy for items passed over while
+        searching for the start of the section.
+        '''
+        return self._keep_skipped
+
+    @keep_skipped.setter
+    def keep_skipped(self, keep_skipped: SkipOptions):
+        '''Validate the skipped item retention policy.
+
+        Arguments:
+            keep_skipped (SkipOptions): One of 'All', 'Count', 'None'
+                (case insensitive) or a non-negative integer.
+        Raises:
+            ValueError if keep_skipped is not a valid policy.
+        '''
+        if isinstance(keep_skipped, str):
+            policy = keep_skipped.title()
+            if policy in ('All', 'Count', 'None'):
+                self._keep_skipped = policy
+                return
+        elif isinstance(keep_skipped, int) and not isinstance(keep_skipped,
+                                                              bool):
+            if keep_skipped >= 0:
+                self._keep_skipped = keep_skipped
+                return
+        msg = ' '.join(['keep_skipped must be one of "All", "Count", "None"',
+                        f'or a non-negative integer. Got {keep_skipped}'])
+        raise ValueError(msg)
+
     def is_boundary(self, line: str, break_triggers: List[SectionBreak])->bool:
         '''Test the current item from the source iterable to see if it triggers
         a boundary condition.
 
+        The breaks are checked in list order and checking stops at the first
+        break that fires (see BoundaryEvaluator).
+
         If a boundary condition is triggered, the scan_status attribute
         becomes: 'Break Triggered' and two items in the section context
         attribute are updated:
@@ -2572,17 +3777,24 @@ class Section(SectionBase):
         Returns:
             bool: Returns True if a boundary event was triggered.
         '''
-        for break_trigger in break_triggers:
-            logger.debug(f'Checking Trigger: {break_trigger.name}')
-            # break_trigger needs to access the base BufferedIterator Source
-            # not the top level one, otherwise it will not step back properly.
-            is_break = break_trigger.check(line, self.source, self.context)
-            if is_break:
-                logger.debug('Section Break Detected')
-                self.scan_status = 'Break Triggered'
-                self.context['Event'] = break_trigger.event.test_value
-                self.context['Break'] = break_trigger.name
-        return is_break
+        if break_triggers is self._end_section:
+            evaluator = self._end_evaluator
+        elif break_triggers is self._start_section:
+            evaluator = self._start_evaluator
+        else:
+            evaluator = BoundaryEvaluator(break_triggers)
+        # The breaks need to access the base BufferedIterator Source not the
+        # top level one, otherwise they will not step back properly.
+        break_trigger = evaluator.check(line, self.source, self.context)
+        if break_trigger is None:
+            return False
+        if tracing.trace_hook is not None:
+            tracing.emit(tracing.BREAK_FIRED, self.name, self.name,
+                         self.source.item_count, break_trigger.name)
+        self.scan_status = 'Break Triggered'
+        self.context['Event'] = break_trigger.event.test_value
+        self.context['Break'] = break_trigger.name
+        return True
 
     def step_source(self)->SourceItem:
         '''Advance the source, catching any form of generator exit.
@@ -2621,29 +3833,42 @@ class Section(SectionBase):
                 self.is_first_item = True
             else:
                 self.is_first_item = False
-            logger.debug(f'In:\t{self.name}\tGot item:\t{next_item}')
-        finally:
-            logger.debug(f'Break Status:\t{self.scan_status}')
+            if tracing.trace_hook is not None:
+                tracing.emit(tracing.ITEM_FETCHED, self.name, self.name,
+                             self.source.item_count, next_item)
         return next_item
 
-    def advance_to_start(self)->List[SourceItem]:
+    def advance_to_start(self)->SkippedLines:
         '''Step through the source until the start of the section is reached.
 
         Returns:
-            list[SourceItem]: The items preceding the beginning of the section.
+            SkippedLines: The items preceding the beginning of the section,
+                retained according to keep_skipped.
         '''
-        skipped_lines = list()
+        store = skipped_store(self.keep_skipped)
+        start_item = self.source.item_count
+        count = 0
         self.scan_status = 'Not Started'
         logger.debug(f'Advancing to start of {self.name}.')
+        start_search = StartSearch.for_source(self.source,
+                                              self._start_evaluator)
         while True:
+            if start_search is not None:
+                count += start_search.fast_forward(store)
             next_item = self.step_source()
             if self.scan_status in ['Scan Complete', 'End of Source']:
                 break
             if self.is_boundary(next_item, self.start_section):
                 break
-            skipped_lines.append(next_item)
-        logger.debug(f'Skipped {len(skipped_lines)} lines.')
-        return skipped_lines
+            count += 1
+            if store is not None:
+                store.append(next_item)
+        logger.debug(f'Skipped {count} lines.')
+        if tracing.trace_hook is not None:
+            tracing.emit(tracing.ITEMS_SKIPPED, self.name, self.name,
+                         self.source.item_count, count)
+        return skipped_lines(self.keep_skipped, store, start_item, count,
+                             self.source)
 
     def initialize(self, supplied_source: Source, start_search: bool = None,
                    context: ContextType = None):
@@ -2673,8 +3898,7 @@ class Section(SectionBase):
             start_search = self.start_search
         # If requested, advance through the source to the section start.
         if start_search:
-            skipped_lines = self.advance_to_start()
-            self.context['Skipped Lines'] = skipped_lines
+            self.context['Skipped Lines'] = self.advance_to_start()
         else:
             self.context['Skipped Lines'] = []
         # Update Section Status
@@ -2712,9 +3936,8 @@ class Section(SectionBase):
     def wrap_up(self, context: ContextType = None):
         '''Perform update tasks at the end of a section.
 
-        Two tasks are required:
-            1. Synchronize context and self.context
-            2. Synchronize source indexing and buffers
+        Synchronize context and self.context.  The source does not need to
+        be synchronized, because a supplied BufferedIterator is read directly.
 
         Args:
             context (ContextType): External context dictionary passed to scan,
@@ -2728,12 +3951,6 @@ class Section(SectionBase):
         if context is not None:
             context.update(self.context)
 
-        # Update the source index so that stepping back uses the
-        # correct step size
-        #self._source_index.append(self.source.item_count)
-        # re-align any buffers in the supplied source
-        self.update_supplied_source()
-
     def scan(self, source: Source, start_search: bool = None,
              context: ContextType = None, *, _direct_call=True,
              **context_items)->SectionGen:
@@ -2775,10 +3992,7 @@ class Section(SectionBase):
             next_item = self.step_source()
             if self.scan_status in ['Scan Complete', 'End of Source']:
                 break  # Break if end of source reached
-            logger.debug(f'This is {self.name} item number: '
-                         f'{self.item_count}')
             if self.end_on_first_item | (not self.is_first_item):
-                logger.debug('Checking for boundary')
                 if self.is_boundary(next_item, self.end_section):
                     break  # Break if section boundary reached
             yield next_item
@@ -2840,8 +4054,10 @@ class Section(SectionBase):
             else:
                 # Update the source index so that stepping back uses the
                 # correct step size
-                logger.debug(f'Adding {self.source.item_count} to source_index')
                 self._source_index.append(self.source.item_count)
+                if tracing.trace_hook is not None:
+                    tracing.emit(tracing.STAGE_OUTPUT, self.name, self.name,
+                                 self.source.item_count, item_read)
                 yield item_read
 
         # If process was not called by section.read, clean up source and context
@@ -2863,6 +4079,11 @@ class Section(SectionBase):
         self.subsections, yield a list of the assemble results for
         all of the sub-sections as a single item from the generator.
 
+        If source is a PrefetchSource, its background thread is stopped when
+        the read is complete.  If it is a BufferedIterator reading from a
+        PrefetchSource, the thread is only stopped if the read raises an
+        error, so that other sections can continue reading the source.
+
         Arguments:
             source (Source): An iterable where some of the content meets the
                 section boundary conditions.
@@ -2887,11 +4108,24 @@ class Section(SectionBase):
         if context_items:
             context.update(context_items)
 
-        # Get the processing generator
-        section_processor = self.process(source, start_search=start_search,
-                                         context=context, _direct_call=False)
-        # Send the processing generator to the assemble function.
-        section_assembled = self.assemble(section_processor, context)
+        try:
+            # Get the processing generator
+            section_processor = self.process(source, start_search=start_search,
+                                             context=context,
+                                             _direct_call=False)
+            # Send the processing generator to the assemble function.
+            if tracing.trace_hook is not None:
+                section_assembled = tracing.time_assemble(
+                    self.name, self.assemble, section_processor, context)
+            else:
+                section_assembled = self.assemble(section_processor, context)
+        except BaseException:
+            close_prefetch(source)
+            raise
+        if isinstance(source, PrefetchSource):
+            # The remaining items are held by this section's own
+            # BufferedIterator, so no other reader can continue the source.
+            source.close()
 
         self.wrap_up(context)
         return section_assembled
@@ -2940,4 +4174,1254 @@ class Section(SectionBase):
 
         self.wrap_up(context)
 
-# %%
+    async def aread(self, source: AsyncSource, start_search: bool = None,
+                    context: ContextType = None,
+                    **context_items)->AssembledItem:
+        '''Read the section from an async iterable.
+
+        The same read() method is called on a worker thread, with the source
+        wrapped in an AsyncBufferedIterator.  The event loop fetches the
+        source items as they are needed, so other tasks (including other
+        section reads) run while this one waits for its source.  A supplied
+        AsyncBufferedIterator is shared, as for a BufferedIterator in read().
+
+        Each call reads with its own copy of the section tree, so one section
+        instance can read several streams concurrently.  The section's own
+        context is not updated; pass a context dictionary to obtain the final
+        context.
+
+        Arguments:
+            source (AsyncSource): An async iterable, such as an
+                asyncio.StreamReader, where some of the content meets the
+                section boundary conditions.
+            start_search (bool, optional): See read().
+            context (ContextType, optional): See read().
+            **context_items: See read().
+        Returns:
+            AssembledItem: The same result as read().
+        '''
+        reader = deepcopy(self)
+        return await read_async(reader.read, source, self.buffer_size,
+                                start_search=start_search, context=context,
+                                **context_items)
+
+    def aiter(self, source: AsyncSource, context: ContextType = None,
+              **context_items)->AsyncGenerator[AssembledItem, None]:
+        '''Iterate through an async iterable, returning assembled results.
+
+        The async equivalent of calling the section:
+            async for item in section.aiter(source):
+
+        A copy of the section is called on a worker thread, as in aread().
+
+        Args:
+            source (AsyncSource): An async iterable where some of the content
+                meets the section boundary conditions.
+            context (ContextType, optional): See __call__().
+            **context_items: See __call__().
+        Returns:
+            AsyncGenerator[AssembledItem, None]: The assembled results.
+        '''
+        reader = deepcopy(self)
+        return iterate_async(reader.__call__, source, self.buffer_size,
+                             context=context, **context_items)
+
+    def compile(self)->'CompiledSection':
+        '''Flatten this section and all of its subsections into a single
+        reader.
+
+        The compiled reader produces the same assembled output as read(), but
+        reads every level of the section tree from one shared BufferedIterator
+        instead of wrapping a new BufferedIterator and generator chain at each
+        level.  See CompiledSection for details.
+
+        The compiled reader holds references to the current section
+        definitions.  Changes to the section tree after compiling (e.g.
+        assigning a new processor) require compiling again.
+
+        Returns:
+            CompiledSection: A reader for the section tree.
+        '''
+        return CompiledSection(self)
+
+    def read_indexed(self, file_path: Path, key: str = None,
+                     instance: int = None, context: ContextType = None,
+                     index_path: Path = None
+                     )->Union[AssembledItem, List[AssembledItem]]:
+        '''Read selected instances of this section, or of its subsections,
+        from a file using a persistent section boundary index.
+
+        The first call scans the file once with the section boundaries and
+        saves the locations of all section instances in a sidecar file.  Later
+        calls parse only the lines of the requested instances.  The index is
+        rebuilt when the file or the section boundaries change.  See
+        section_index.SectionIndex for details and limitations.
+
+        Arguments:
+            file_path (Path): The text file to read.
+            key (str, optional): A section name, or a '/' separated path of
+                section names starting with this section's name.  Defaults to
+                None, which selects the instances of this section.
+            instance (int, optional): The position of a single instance among
+                the matching sections.  Defaults to None, which reads all
+                matching instances.
+            context (ContextType, optional): The context supplied to each
+                section read.  Defaults to None.
+            index_path (Path, optional): The sidecar file for the index.
+                Defaults to None, which stores the index next to file_path.
+
+        Returns:
+            AssembledItem, List[AssembledItem]: The assembled section if
+                instance is given, otherwise a list of the assembled sections.
+        '''
+        # section_index imports this module.
+        from section_index import SectionIndex  # pylint: disable=import-outside-toplevel
+        index = SectionIndex.open(self, file_path, index_path)
+        return index.read(self, key, instance, context)
+
+    def read_parallel(self, source: Union[Path, Source], workers: int = None,
+                      context: ContextType = None,
+                      context_keys: List[str] = None,
+                      **options)->List[AssembledItem]:
+        '''Read every instance of this section in a source using a pool of
+        worker processes.
+
+        The source is first scanned with the section boundaries to find each
+        instance of the section.  The instances are then read concurrently
+        and the results are returned in source order, matching
+        list(self(source)) when each instance can be read on its own.  See
+        section_index.read_parallel for details.
+
+        Arguments:
+            source (Path, Source): A text file, or a sequence of source items.
+            workers (int, optional): The number of worker processes.  Defaults
+                to None, the number of processors.  If 0, the instances are
+                read sequentially in the current process.
+            context (ContextType, optional): Context gathered by reading
+                earlier sections.  Defaults to None.
+            context_keys (List[str], optional): The context items that this
+                section depends on.  A snapshot of these items is supplied to
+                each section instance.  Defaults to None (no context items).
+            **options: encoding, chunk_size and mp_context, passed to
+                section_index.read_parallel.
+
+        Returns:
+            List[AssembledItem]: The non-empty assembled section instances.
+        '''
+        # section_index imports this module.
+        from section_index import read_parallel  # pylint: disable=import-outside-toplevel
+        return read_parallel(self, source, workers, context, context_keys,
+                             **options)
+
+    def read_tail(self, file_path: Path, checkpoint: 'ParseCheckpoint' = None,
+                  final: bool = False, encoding: str = 'utf-8'
+                  )->Tuple[List[AssembledItem], 'ParseCheckpoint']:
+        '''Read the instances of this section added to a growing file since
+        a checkpoint.
+
+        Only the lines after the checkpoint are parsed.  A section instance
+        ended by the end of the file is left for the next read, unless final
+        is True.  See tail_reader.TailReader for details.
+
+        Arguments:
+            file_path (Path): The text file to read.
+            checkpoint (ParseCheckpoint, optional): The checkpoint returned by
+                the previous read.  Defaults to None, which reads from the
+                start of the file.
+            final (bool, optional): If True, the file is treated as complete.
+                Defaults to False.
+            encoding (str, optional): The text encoding of the file. Defaults
+                to 'utf-8'.
+
+        Returns:
+            Tuple[List[AssembledItem], ParseCheckpoint]: The new non-empty
+                assembled section instances and the checkpoint for the next
+                read.
+        '''
+        # tail_reader imports this module.
+        from tail_reader import read_tail  # pylint: disable=import-outside-toplevel
+        return read_tail(self, file_path, checkpoint, final, encoding)
+
+    def read_cached(self, source: Union[Path, str, Source],
+                    cache: 'ResultCache', context: ContextType = None,
+                    opener: FileOpener = None)->AssembledItem:
+        '''Read this section, using the result stored in an on-disk cache
+        when the section definition and the source are unchanged.
+
+        See result_cache.ResultCache for details.
+
+        Arguments:
+            source (Path, str, Source): A file path, or a sequence of source
+                items.
+            cache (ResultCache): The cache to use.
+            context (ContextType, optional): The context supplied to the
+                read.  Defaults to None.
+            opener (FileOpener, optional): A function taking a file path and
+                returning the source items.  Defaults to read_file_lines.
+
+        Returns:
+            AssembledItem: The assembled section.
+        '''
+        if opener is None:
+            opener = read_file_lines
+        return cache.read(self, source, context, opener)
+
+
+#%% Compiled Section
+class SectionNode():
+    '''One Section in a compiled section tree.
+
+    The static attributes are set when the tree is compiled.  The scan state
+    attributes are reset every time the node's section is read.
+
+    Attributes:
+        section (Section): The section definition.
+        ancestors (Tuple[SectionNode]): The enclosing nodes, outermost first.
+        chain (Tuple[SectionNode]): ancestors followed by this node.
+        depth (int): The number of enclosing nodes.
+        children (Tuple[SectionNode], None): The nodes for the subsection(s)
+            reading the scanned items, or None if the scanned items are passed
+            to the section's processing methods (a leaf node).
+        group (SectionGroup, None): The SectionGroup that the child nodes
+            belong to, or None if there is a single child.
+        post_methods (List[ProcessFunc]): The processing methods applied to
+            the assembled subsection items.
+        context (ProtectedDict): The section's context for the current read.
+        hwm (int): The cursor position following the last item the node's
+            scan has checked.  Items before hwm are passed on to the node's
+            children without being checked again.
+        count (int, None): The position of the node's own source after an
+            end break moved the cursor back.  None otherwise, in which case
+            the position is hwm.
+        exhausted (bool): True once the node's scan has ended.
+        search_ended (bool): True if the source ended during the start search.
+            The next read through the node ends its source again.
+    '''
+    def __init__(self, section: 'Section',
+                 ancestors: Tuple['SectionNode'] = ()):
+        '''Create the node for a section.
+
+        Arguments:
+            section (Section): The section definition.
+            ancestors (Tuple[SectionNode], optional): The enclosing nodes,
+                outermost first.  Defaults to ().
+        '''
+        self.section = section
+        self.ancestors = ancestors
+        self.chain = ancestors + (self,)
+        self.depth = len(ancestors)
+        self.children = None
+        self.group = None
+        self.post_methods = list()
+        self.context = None
+        self.hwm = 0
+        self.count = None
+        self.exhausted = False
+        self.search_ended = False
+
+    def reset(self, position: int):
+        '''Clear the scan state at the start of a section read.
+
+        Arguments:
+            position (int): The current cursor position.
+        '''
+        self.context = self.section.context
+        self.hwm = position
+        self.count = None
+        self.exhausted = False
+        self.search_ended = False
+
+
+# Returned by CompiledSection.next_item when a node's source has ended.
+_SCAN_END = object()
+
+
+class CompiledSection():
+    '''A Section tree flattened into a single reader.
+
+    Section.read passes each source item through a BufferedIterator, a scan
+    generator and a chain of processing generators for every level of
+    subsections.  A CompiledSection walks the section tree once, building a
+    SectionNode for every Section, including the members of SectionGroups.
+    When reading, all nodes share a single BufferedIterator (the cursor).  The
+    end boundaries of the enclosing sections are checked directly on the
+    cursor, in order from the outermost section inward.  Each node records the
+    cursor position following the last item it has checked (hwm), so that
+    items stepped back by a subsection are passed to the next subsection
+    without being checked a second time, exactly as with nested
+    BufferedIterators.  Passing an item from one level to the next costs no
+    buffering, so apart from the end boundary checks of the enclosing
+    sections, the cost of each item does not grow with the nesting depth.
+    Enclosing sections whose end breaks can never fire (the default) are
+    not checked at all while tracing is off.
+
+    A subsection is compiled when it (or a tuple of subsections) is the first
+    processing method of its parent section; it then reads the parent's
+    source items directly.  Subsections that follow other processing methods
+    read processed items, not source items, and are applied using their
+    normal read method.
+
+    Processing functions, Rules, RuleSets and assemble functions are called
+    with the same arguments, in the same order, as Section.read, and the
+    context, scan_status and source_index of every section are updated in the
+    same way.  The source_index values of compiled subsections count items
+    from the beginning of the top level source, rather than from the
+    beginning of the enclosing section.
+
+    Attributes:
+        section (Section): The top level section.
+        root (SectionNode): The node for the top level section.
+        nodes (List[SectionNode]): All nodes in the section tree, in depth
+            first order.
+        buffer_size (int): The buffer size of the shared cursor; the largest
+            buffer_size of the sections in the tree.
+    '''
+    def __init__(self, section: 'Section'):
+        '''Compile a section tree.
+
+        Arguments:
+            section (Section): The top level section.
+        '''
+        self.section = section
+        self.nodes: List[SectionNode] = list()
+        self.root = self.build_node(section)
+        self.buffer_size = max(node.section.buffer_size
+                               for node in self.nodes)
+        self._cursor = None
+
+    def build_node(self, section: 'Section',
+                   ancestors: Tuple[SectionNode] = ())->SectionNode:
+        '''Create the node for a section and, recursively, its subsections.
+
+        Arguments:
+            section (Section): The section definition.
+            ancestors (Tuple[SectionNode], optional): The enclosing nodes,
+                outermost first.  Defaults to ().
+
+        Returns:
+            SectionNode: The node for section.
+        '''
+        node = SectionNode(section, ancestors)
+        self.nodes.append(node)
+        methods = section.processor.processing_methods
+        reader = getattr(methods[0], '__wrapped__', None)
+        owner = getattr(reader, '__self__', None)
+        if isinstance(owner, Section):
+            subsections = (owner,)
+        elif isinstance(owner, SectionGroup):
+            subsections = owner.subsections
+            if not all(isinstance(sub, Section) for sub in subsections):
+                return node
+            node.group = owner
+        else:
+            return node
+        node.children = tuple(self.build_node(sub, node.chain)
+                              for sub in subsections)
+        node.post_methods = methods[1:]
+        return node
+
+    # Source access
+    def next_item(self, node: SectionNode)->SourceItem:
+        '''Get the next source item for node.
+
+        Read the next item from the cursor.  Apply the scan steps of every
+        enclosing node that has not yet checked the item, outermost first.
+        If one of these nodes reaches its end boundary, or the source is
+        exhausted, node and all the nodes between them reach the end of their
+        sources.
+
+        The scan status of node itself is updated, but its boundaries are not
+        checked.
+
+        Arguments:
+            node (SectionNode): The node reading the item.
+
+        Returns:
+            SourceItem: The next item, or _SCAN_END if node's source has
+                ended.
+        '''
+        # pylint: disable=protected-access
+        cursor = self._cursor
+        position = cursor._item_count
+        chain = node.chain
+        first = node.depth
+        while first and chain[first - 1].hwm <= position:
+            first -= 1
+        pending = chain[first:] if first else chain
+        for level in pending:
+            if level.exhausted:
+                return self.exhausted_source(node, pending)
+        try:
+            item = next(cursor)
+        except BufferedIteratorEOF:
+            self.end_of_source(pending)
+            return _SCAN_END
+        position += 1
+        tracing_off = tracing.trace_hook is None
+        for level in pending:
+            level.hwm = position
+            section = level.section
+            level.context['Status'] = 'Scan In Progress'
+            is_first_item = section.is_first_item is None
+            section.is_first_item = is_first_item
+            if not tracing_off:
+                tracing.emit(tracing.ITEM_FETCHED, section.name,
+                             section.name, position, item)
+            if level is node:
+                break
+            if is_first_item and not section.end_on_first_item:
+                continue
+            if tracing_off and section._end_evaluator.never_fires:
+                continue
+            if self.is_end(level, item):
+                self.end_of_source(pending[pending.index(level) + 1:])
+                return _SCAN_END
+        return item
+
+    def exhausted_source(self, node: SectionNode,
+                         pending: Tuple[SectionNode])->object:
+        '''Handle a read by node when one of the nodes it reads through has
+        already reached the end of its source.
+
+        The nodes below the innermost exhausted node reach the end of their
+        sources.  A node reading again after its own source ended (e.g. the
+        start search reached the end of the source) gets the end of source
+        again.  Exhausted nodes whose source ended during their start search
+        have not yet seen the end of source from their scan, so they get it
+        as well.
+
+        Arguments:
+            node (SectionNode): The node reading the item.
+            pending (Tuple[SectionNode]): The nodes that have not yet checked
+                the next item, outermost first.
+
+        Returns:
+            object: _SCAN_END
+        '''
+        for idx in range(len(pending) - 1, -1, -1):
+            if pending[idx].exhausted:
+                first = idx if pending[idx] is node else idx + 1
+                while first and pending[first - 1].search_ended:
+                    first -= 1
+                    pending[first].search_ended = False
+                self.end_of_source(pending[first:])
+                break
+        return _SCAN_END
+
+    def is_end(self, node: SectionNode, item: SourceItem)->bool:
+        '''Test an item against the end boundary of a node.
+
+        Arguments:
+            node (SectionNode): The node to test.
+            item (SourceItem): The item from the cursor.
+
+        Returns:
+            bool: True if the end boundary was triggered.
+        '''
+        section = node.section
+        # The section's end BoundaryEvaluator screens out the items that
+        # cannot trigger a break.
+        if section.is_boundary(item, section.end_section):
+            node.exhausted = True
+            node.count = self._cursor.item_count
+            return True
+        return False
+
+    @staticmethod
+    def end_of_source(nodes: Sequence[SectionNode]):
+        '''Mark the source of each node as exhausted.
+
+        Arguments:
+            nodes (Sequence[SectionNode]): The nodes whose source has ended.
+        '''
+        for node in nodes:
+            node.exhausted = True
+            node.section.scan_status = 'End of Source'
+
+    # Section steps
+    def advance_to_start(self, node: SectionNode)->SkippedLines:
+        '''Step through the source until the start of node's section is
+        reached.
+
+        Arguments:
+            node (SectionNode): The node to advance.
+
+        Returns:
+            SkippedLines: The items preceding the beginning of the section,
+                retained according to the section's keep_skipped.
+        '''
+        section = node.section
+        cursor = self._cursor
+        store = skipped_store(section.keep_skipped)
+        start_item = cursor.item_count
+        count = 0
+        section.scan_status = 'Not Started'
+        # Enclosing sections must check every item for their end boundary.
+        start_search = None
+        if not node.ancestors:
+            start_search = StartSearch.for_source(
+                cursor, section._start_evaluator)  # pylint: disable=protected-access
+        while True:
+            if start_search is not None:
+                count += start_search.fast_forward(store)
+            next_item = self.next_item(node)
+            if next_item is _SCAN_END:
+                break
+            if section.is_boundary(next_item, section.start_section):
+                break
+            count += 1
+            if store is not None:
+                store.append(next_item)
+        if tracing.trace_hook is not None:
+            tracing.emit(tracing.ITEMS_SKIPPED, section.name, section.name,
+                         cursor.item_count, count)
+        return skipped_lines(section.keep_skipped, store, start_item, count,
+                             cursor)
+
+    def initialize(self, node: SectionNode, context: ContextType,
+                   start_search: bool = None, supplied_source: Source = None):
+        '''Prepare a node's section and locate the beginning of the section.
+
+        Arguments:
+            node (SectionNode): The node to initialize.
+            context (ContextType): The context supplied to the section.
+            start_search (bool, optional): Overrides the section's
+                start_search attribute.  Defaults to None.
+            supplied_source (Source, optional): The source supplied to the top
+                level section.  Defaults to None.
+        '''
+        # pylint: disable=protected-access
+        section = node.section
+        cursor = self._cursor
+        section.reset()
+        section._original_source = supplied_source
+        section._source = cursor
+        section._source_index = section.new_source_index(cursor.item_count)
+        section.is_first_item = None
+        if context is not None:
+            section.context.update(context)
+        if start_search is None:
+            start_search = section.start_search
+        node.reset(cursor.item_count)
+        if start_search:
+            section.context['Skipped Lines'] = self.advance_to_start(node)
+            node.search_ended = node.exhausted
+        else:
+            section.context['Skipped Lines'] = []
+        section.context['Current Section'] = section.name
+        section.scan_status = 'At section start'
+        section.is_first_item = None
+        # Items stepped back at the start of the section are checked again.
+        node.hwm = cursor.item_count
+
+    def scan(self, node: SectionNode)->SectionGen:
+        '''Yield the source items of a leaf node's section.
+
+        Arguments:
+            node (SectionNode): The leaf node to scan.
+
+        Yields:
+            SourceItem: The items in the section.
+        '''
+        section = node.section
+        evaluator = section._end_evaluator  # pylint: disable=protected-access
+        while True:
+            next_item = self.next_item(node)
+            if next_item is _SCAN_END:
+                break
+            if section.end_on_first_item | (not section.is_first_item):
+                if not evaluator.never_fires or \
+                        tracing.trace_hook is not None:
+                    if self.is_end(node, next_item):
+                        break
+            yield next_item
+
+    def read_subsections(self, node: SectionNode, context: ContextType
+                         )->Generator[AssembledItem, None, None]:
+        '''Repeatedly read a node's subsection(s), yielding the assembled
+        results.
+
+        Matches Section.__call__ for a single subsection and
+        SectionGroup.__call__ for a group of subsections.
+
+        Arguments:
+            node (SectionNode): The parent node.
+            context (ContextType): The context supplied to the subsections.
+
+        Yields:
+            AssembledItem: The subsection, or subsection group, results.
+        '''
+        end_status = ['Scan Complete', 'End of Source']
+        if node.group is None:
+            child = node.children[0]
+            subsection = child.section
+            while True:
+                assembled_item = self.read_node(child, context)
+                if not is_empty(assembled_item):
+                    yield assembled_item
+                if subsection.scan_status in end_status:
+                    break
+            self.wrap_up(child, context)
+            return
+        group = node.group
+        while True:
+            group.scan_status = 'Scan In Progress'
+            section_group = {}
+            for child in node.children:
+                subsection = child.section
+                subsection_item = self.read_node(child, context)
+                if subsection.scan_status in end_status:
+                    group.scan_status = subsection.scan_status
+                    if is_empty(subsection_item):
+                        if is_empty(section_group):
+                            section_group = None
+                            break
+                    section_group[subsection.name] = subsection_item
+                    break
+                section_group[subsection.name] = subsection_item
+            if not is_empty(section_group):
+                yield section_group
+            if group.scan_status in end_status:
+                break
+
+    def process(self, node: SectionNode, context: ContextType,
+                start_search: bool = None, supplied_source: Source = None
+                )->ProcessedItemGen:
+        '''Yield the processed items of a node's section.
+
+        Matches Section.process.
+
+        Arguments:
+            node (SectionNode): The node to process.
+            context (ContextType): The context supplied to the section.
+            start_search (bool, optional): Overrides the section's
+                start_search attribute.  Defaults to None.
+            supplied_source (Source, optional): The source supplied to the top
+                level section.  Defaults to None.
+
+        Yields:
+            ProcessedItem: The processed items in the section.
+        '''
+        self.initialize(node, context, start_search, supplied_source)
+        section = node.section
+        processor = section.processor
+        if node.children is None:
+            process_iter = processor.reader(self.scan(node), context,
+                                            calling_section=section)
+        else:
+            processor.calling_section = section
+            process_iter = self.read_subsections(node, context)
+            for func in node.post_methods:
+                process_iter = processor.func_to_iter(process_iter, func,
+                                                      context,
+                                                      processor.chunk_size)
+            process_iter = iter(process_iter)
+        cursor = self._cursor
+        source_index = section._source_index  # pylint: disable=protected-access
+        is_leaf = node.children is None
+        while True:
+            try:
+                item_read = next(process_iter)
+            except (StopIteration, RuntimeError):
+                break
+            if is_leaf:
+                source_index.append(cursor.item_count)
+            elif node.count is None:
+                source_index.append(node.hwm)
+            else:
+                source_index.append(node.count)
+            if tracing.trace_hook is not None:
+                tracing.emit(tracing.STAGE_OUTPUT, section.name, section.name,
+                             source_index[-1], item_read)
+            yield item_read
+
+    def wrap_up(self, node: SectionNode, context: ContextType = None):
+        '''Synchronize the context and reposition the source at the end of a
+        node's section.
+
+        Matches Section.wrap_up.  Every node reads the shared cursor, so
+        items stepped back at the end of the section are already available
+        to the next reader.
+
+        Arguments:
+            node (SectionNode): The node to wrap up.
+            context (ContextType): The context supplied to the section.
+        '''
+        section = node.section
+        if context:
+            section.context.update(context)
+        if context is not None:
+            context.update(section.context)
+
+    def read_node(self, node: SectionNode, context: ContextType,
+                  start_search: bool = None, supplied_source: Source = None
+                  )->AssembledItem:
+        '''Read and assemble a node's section.
+
+        Matches Section.read.
+
+        Arguments:
+            node (SectionNode): The node to read.
+            context (ContextType): The context supplied to the section.
+            start_search (bool, optional): Overrides the section's
+                start_search attribute.  Defaults to None.
+            supplied_source (Source, optional): The source supplied to the top
+                level section.  Defaults to None.
+
+        Returns:
+            AssembledItem: The assembled section.
+        '''
+        section = node.section
+        section_processor = self.process(node, context, start_search,
+                                         supplied_source)
+        if tracing.trace_hook is not None:
+            section_assembled = tracing.time_assemble(
+                section.name, section.assemble, section_processor, context)
+        else:
+            section_assembled = section.assemble(section_processor, context)
+        self.wrap_up(node, context)
+        return section_assembled
+
+    # Public interface
+    def read(self, source: Source, start_search: bool = None,
+             context: ContextType = None, **context_items)->AssembledItem:
+        '''Read the compiled section from source.
+
+        Arguments:
+            source (Source): An iterable where some of the content meets the
+                section boundary conditions.
+            start_search (bool, optional): Indicates whether to advance through
+                the source until the beginning of the top level section is
+                found.  Defaults to None, which defers the the section's
+                start_search attribute.
+            context (ContextType, optional): Break point information and any
+                additional information to be passed to and from the
+                Section instances.
+            **context_items: Any additional keyword arguments will be added to
+                the context dictionary.
+        Returns:
+            AssembledItem: The same result as section.read(source).
+        '''
+        if context is None:
+            context = {}
+        if context_items:
+            context.update(context_items)
+        # A supplied BufferedIterator is shared, as in Section.source.
+        if isinstance(source, BufferedIterator):
+            cursor = source
+        else:
+            cursor = BufferedIterator(source, buffer_size=self.buffer_size)
+        self._cursor = cursor
+        try:
+            section_assembled = self.read_node(self.root, context,
+                                               start_search, source)
+        except BaseException:
+            close_prefetch(source)
+            raise
+        if isinstance(source, PrefetchSource):
+            # As in Section.read, the source can not be continued.
+            source.close()
+        return section_assembled
+
+    def __call__(self, source: Source, context: ContextType = None,
+                 **context_items)->AssembledItem:
+        '''Iterate through the supplied source returning assembled results.
+
+        Matches Section.__call__.
+
+        Args:
+            source (Source): An iterable where some of the content meets the
+                section boundary conditions.
+            context (ContextType, optional): Break point information and any
+                additional information to be passed to and from the
+                Section instances.
+            **context_items: Any additional keyword arguments will be added to
+                the context dictionary.
+        Yields:
+            Generator[AssembledItem, None, None]: The result of applying the
+                read method repeatedly to the supplied source.
+        '''
+        if context is None:
+            context = {}
+        if context_items:
+            context.update(context_items)
+        buffered_source = BufferedIterator(source,
+                                           buffer_size=self.buffer_size)
+        section = self.section
+        done = False
+        while not done:
+            assembled_item = self.read(buffered_source, context=context)
+            if not is_empty(assembled_item):
+                yield assembled_item
+            if section.scan_status in ['Scan Complete', 'End of Source']:
+                done = True
+        section.wrap_up(context)
+
+    async def aread(self, source: AsyncSource, start_search: bool = None,
+                    context: ContextType = None,
+                    **context_items)->AssembledItem:
+        '''Read the compiled section from an async iterable.
+
+        Matches Section.aread, including reading with a copy of the compiled
+        section.
+        '''
+        reader = deepcopy(self)
+        return await read_async(reader.read, source, self.buffer_size,
+                                start_search=start_search, context=context,
+                                **context_items)
+
+    def aiter(self, source: AsyncSource, context: ContextType = None,
+              **context_items)->AsyncGenerator[AssembledItem, None]:
+        '''Iterate through an async iterable, returning assembled results.
+
+        Matches Section.aiter.
+        '''
+        reader = deepcopy(self)
+        return iterate_async(reader.__call__, source, self.buffer_size,
+                             context=context, **context_items)
+
+
+#%% Async Reading
+# The section readers are synchronous.  For an async source they run on a
+# worker thread, reading from an AsyncBufferedIterator that waits for the
+# event loop to fetch each batch of source items.
+def async_buffered(source: AsyncSource,
+                   buffer_size: int)->AsyncBufferedIterator:
+    '''Wrap an async iterable in an AsyncBufferedIterator bound to the
+    running event loop.
+    '''
+    if not isinstance(source, AsyncBufferedIterator):
+        source = AsyncBufferedIterator(source, buffer_size=buffer_size)
+    source.loop = asyncio.get_running_loop()
+    return source
+
+
+_reader_executor: Union[ThreadPoolExecutor, None] = None
+_reader_executor_lock = threading.Lock()
+
+
+def reader_executor()->ThreadPoolExecutor:
+    '''The thread pool shared by all async section reads.
+
+    The pool is bounded (by the ThreadPoolExecutor default of
+    min(32, CPU count + 4) workers).  Streams beyond that number wait for a
+    free worker.  Each aiter() stream holds its worker until the stream is
+    finished or closed.
+
+    Returns:
+        ThreadPoolExecutor: The executor, created on first use.
+    '''
+    global _reader_executor  # pylint: disable=global-statement
+    with _reader_executor_lock:
+        if _reader_executor is None:
+            _reader_executor = ThreadPoolExecutor(
+                thread_name_prefix='SectionReader')
+    return _reader_executor
+
+
+async def read_async(read: Callable, source: AsyncSource, buffer_size: int,
+                     **kwargs)->AssembledItem:
+    '''Call a section read method on a reader_executor worker thread.
+
+    If the call is cancelled, the source is closed so that the worker thread
+    finishes.
+
+    Args:
+        read (Callable): The read method.
+        source (AsyncSource): The async iterable to read.
+        buffer_size (int): The buffer size used if source must be wrapped.
+        **kwargs: Additional arguments passed to read.
+    Returns:
+        AssembledItem: The result of read.
+    '''
+    source = async_buffered(source, buffer_size)
+    try:
+        return await source.loop.run_in_executor(
+            reader_executor(), partial(read, source, **kwargs))
+    except asyncio.CancelledError:
+        source.close()
+        raise
+
+
+async def iterate_async(iterate: Callable, source: AsyncSource,
+                        buffer_size: int, **kwargs
+                        )->AsyncGenerator[AssembledItem, None]:
+    '''Run a section generator (e.g. Section.__call__) on a reader_executor
+    worker thread, yielding its items.
+
+    The worker waits for each item to be taken before producing the next.
+    Closing the async generator early, or an error, closes the source, which
+    ends the worker.
+
+    Args:
+        iterate (Callable): The generator function.
+        source (AsyncSource): The async iterable to read.
+        buffer_size (int): The buffer size used if source must be wrapped.
+        **kwargs: Additional arguments passed to iterate.
+    Yields:
+        AssembledItem: The items generated by iterate.
+    '''
+    source = async_buffered(source, buffer_size)
+    loop = source.loop
+    results = asyncio.Queue()
+    taken = threading.Semaphore(1)
+
+    def deliver(message: Tuple[str, Any]):
+        try:
+            loop.call_soon_threadsafe(results.put_nowait, message)
+        except RuntimeError:
+            # The event loop has been closed.
+            pass
+
+    def run():
+        try:
+            for item in iterate(source, **kwargs):
+                # Wait until the previous item has been taken.
+                while not taken.acquire(timeout=0.05):
+                    if source.closed:
+                        return
+                if source.closed:
+                    return
+                deliver(('Item', item))
+        except BaseException as err:  # pylint: disable=broad-except
+            deliver(('Error', err))
+            return
+        deliver(('End', None))
+
+    loop.run_in_executor(reader_executor(), run)
+    finished = False
+    try:
+        while True:
+            kind, value = await results.get()
+            if kind == 'End':
+                finished = True
+                return
+            if kind == 'Error':
+                raise value
+            taken.release()
+            yield value
+    finally:
+        if not finished:
+            source.close()
+
+
+#%% Multi-File Reading
+class FileResult(NamedTuple):
+    '''The outcome of reading one file with read_many.
+
+    Attributes:
+        path (Path): The file read.
+        result (AssembledItem): The assembled section, or None if reading
+            the file failed.
+        context (ContextType): The context following the read.
+        error (Exception, None): The exception raised while reading the file,
+            or None if the read succeeded.
+        traceback (str, None): The formatted traceback of the error.
+    '''
+    path: Path
+    result: AssembledItem = None
+    context: ContextType = None
+    error: Exception = None
+    traceback: str = None
+
+    @property
+    def ok(self)->bool:
+        '''bool: True if the file was read without error.'''
+        return self.error is None
+
+
+SectionFactory = Callable[[], Section]
+FileOpener = Callable[[Path], Source]
+
+
+def read_file_lines(file_path: Path, encoding: str = 'utf_8_sig'
+                    )->List[str]:
+    '''Read a text file as a list of lines without line endings.
+
+    Args:
+        file_path (Path): The file to read.
+        encoding (str, optional): The text encoding of the file. Defaults to
+            'utf_8_sig', which also handles files without a byte order mark.
+
+    Returns:
+        List[str]: The lines in the file.
+    '''
+    return Path(file_path).read_text(encoding=encoding).splitlines()
+
+
+# The section definition and file opener used by a read_many worker process.
+_worker_section: Section = None
+_worker_opener: FileOpener = None
+
+
+def _init_worker(section: Union[Section, SectionFactory], opener: FileOpener):
+    '''Store the section definition for a read_many worker process.'''
+    global _worker_section, _worker_opener  # pylint: disable=global-statement
+    if not isinstance(section, Section):
+        section = section()
+    _worker_section = section
+    _worker_opener = opener
+
+
+def _read_file(section: Section, opener: FileOpener, file_path: Path,
+               context: ContextType = None)->FileResult:
+    '''Read one file, capturing any error.'''
+    context = dict(context) if context else {}
+    try:
+        source = opener(file_path)
+        result = section.read(source, context=context)
+    except Exception as err:  # pylint: disable=broad-except
+        return FileResult(file_path, None, context, err,
+                          traceback.format_exc())
+    # Stop reading ahead if the section ended before the end of the file.
+    close_prefetch(source)
+    return FileResult(file_path, result, context)
+
+
+def _worker_read(file_path: Path, context: ContextType = None)->FileResult:
+    '''Read one file in a read_many worker process.'''
+    return _read_file(_worker_section, _worker_opener, file_path, context)
+
+
+def _future_result(future: Future, file_path: Path)->FileResult:
+    '''Get the FileResult of a worker, capturing errors in transfer.'''
+    try:
+        return future.result()
+    except Exception as err:  # pylint: disable=broad-except
+        # e.g. the result could not be pickled, or the worker died.
+        return FileResult(file_path, None, None, err,
+                          traceback.format_exc())
+
+
+def read_many(section: Union[Section, SectionFactory],
+              paths: Iterable[Path], workers: int = None,
+              ordered: bool = True, context: ContextType = None,
+              opener: FileOpener = read_file_lines,
+              mp_context=None)->Generator[FileResult, None, None]:
+    '''Read many files with the same section definition, in parallel.
+
+    The files are spread over a ProcessPoolExecutor.  Section objects hold the
+    state of the current read (context, source, source_index), so every
+    worker process reads with its own copy of the section tree.  The copy is
+    made when the worker starts: it is inherited when worker processes are
+    forked, otherwise the section (or section factory) must be picklable.
+
+    A section factory (a function without arguments returning the Section)
+    can be supplied instead of a Section.  The factory is called once in each
+    worker.  Defining the section tree in a module level factory function
+    avoids pickling the section tree.
+
+    Errors raised while reading a file are captured in its FileResult and do
+    not stop the other files being read.
+
+    Args:
+        section (Section, SectionFactory): The section definition used to
+            read each file, or a function that returns it.
+        paths (Iterable[Path]): The files to read.
+        workers (int, optional): The number of worker processes.  Defaults to
+            None, which uses the ProcessPoolExecutor default (the number of
+            processors).  If 0, the files are read sequentially in the
+            current process.
+        ordered (bool, optional): If True, results are returned in the order
+            of paths.  Otherwise results are returned as each file is
+            completed. Defaults to True.
+        context (ContextType, optional): The initial context for each file.
+            Each read receives its own copy. Defaults to None.
+        opener (FileOpener, optional): A function taking a file path and
+            returning the source to read.  Must be picklable when worker
+            processes are not forked.  Defaults to read_file_lines.
+        mp_context (optional): The multiprocessing context used to start the
+            workers.  Defaults to None, the multiprocessing default.
+
+    Yields:
+        FileResult: The result, final context and any error for each file.
+    '''
+    paths = list(paths)
+    if workers == 0:
+        if not isinstance(section, Section):
+            section = section()
+        for file_path in paths:
+            yield _read_file(section, opener, file_path, context)
+        return
+    executor = ProcessPoolExecutor(max_workers=workers,
+                                   mp_context=mp_context,
+                                   initializer=_init_worker,
+                                   initargs=(section, opener))
+    try:
+        futures = {executor.submit(_worker_read, file_path, context): file_path
+                   for file_path in paths}
+        if ordered:
+            completed = iter(futures)
+        else:
+            completed = as_completed(futures)
+        for future in completed:
+            yield _future_result(future, futures[future])
+    finally:
+        # Stop pending reads if the results are abandoned.
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+#%% Output Pipeline
+SinkFunc = Callable[[AssembledItem], Any]
+
+
+class _PipelineEnd(NamedTuple):
+    '''Pipeline message: parsing has finished.'''
+    item_count: int
+    error: BaseException = None
+
+
+class _SinkDone(NamedTuple):
+    '''Pipeline message: a sink call has finished.'''
+    index: int
+    result: Any = None
+    error: BaseException = None
+
+
+def _parse_items(section: SectionBase, source: Source, context: ContextType,
+                 work_queue: queue.Queue, done_queue: queue.Queue,
+                 slots: threading.Semaphore, stop: threading.Event,
+                 workers: int):
+    '''Read the assembled items and pass them to the sink workers.
+
+    Runs on the pipeline parsing thread.
+    '''
+    item_count = 0
+    error = None
+    try:
+        for item in section(source, context=context):
+            # Wait for a free slot (backpressure from the sinks and caller).
+            while not slots.acquire(timeout=0.05):
+                if stop.is_set():
+                    break
+            if stop.is_set():
+                break
+            work_queue.put((item_count, item))
+            item_count += 1
+    except BaseException as err:  # pylint: disable=broad-except
+        error = err
+    finally:
+        if stop.is_set():
+            close_prefetch(source)
+        for _ in range(workers):
+            work_queue.put(None)
+    done_queue.put(_PipelineEnd(item_count, error))
+
+
+def _sink_items(sink: SinkFunc, work_queue: queue.Queue,
+                done_queue: queue.Queue, stop: threading.Event):
+    '''Pass assembled items to the sink until the parsing is finished.
+
+    Runs on each pipeline sink thread.
+    '''
+    while True:
+        work = work_queue.get()
+        if work is None:
+            return
+        index, item = work
+        if stop.is_set():
+            # Discard the remaining items.
+            done_queue.put(_SinkDone(index))
+            continue
+        try:
+            done_queue.put(_SinkDone(index, sink(item)))
+        except BaseException as err:  # pylint: disable=broad-except
+            done_queue.put(_SinkDone(index, error=err))
+
+
+def pipeline_read(section: SectionBase, source: Source, sink: SinkFunc,
+                  workers: int = 1, max_pending: int = 8,
+                  ordered: bool = True, context: ContextType = None
+                  )->Generator[Any, None, None]:
+    '''Read a section repeatedly, passing each assembled item to sink
+    worker threads, so that parsing and output overlap.
+
+    The section is called on source (section(source)) on a parsing thread.
+    Each assembled item is passed to sink on one of the worker threads, and
+    the values returned by sink are yielded.  No more than max_pending
+    items are held between the parser and the caller; once that many items
+    are waiting for a sink or for the caller, parsing pauses.
+
+    An error raised by a sink stops the pipeline and is raised again here.
+    An error raised by the parser is raised again once the results for the
+    items read before it have been yielded.  Closing the generator early
+    also stops the pipeline.  The section must not be used elsewhere while
+    the pipeline is running.
+
+    Args:
+        section (SectionBase): The Section (or CompiledSection) to read.
+        source (Source): An iterable where some of the content meets the
+            section boundary conditions.
+        sink (SinkFunc): A function called with each assembled item, e.g.
+            to write it to a file or database.
+        workers (int, optional): The number of sink threads. Defaults to 1,
+            which calls sink on the items in order.
+        max_pending (int, optional): The maximum number of items parsed but
+            not yet yielded. Defaults to 8.
+        ordered (bool, optional): If True, the sink results are yielded in
+            the order the items were read.  Otherwise they are yielded as
+            each sink call finishes. Defaults to True.
+        context (ContextType, optional): Break point information and any
+            additional information to be passed to and from the section.
+            Defaults to None.
+
+    Raises:
+        ValueError: If workers or max_pending is less than 1.
+
+    Yields:
+        Any: The value returned by sink for each assembled item.
+    '''
+    if workers < 1:
+        raise ValueError('workers must be 1 or greater.')
+    if max_pending < 1:
+        raise ValueError('max_pending must be 1 or greater.')
+    if context is None:
+        context = {}
+    work_queue = queue.Queue()
+    done_queue = queue.Queue()
+    slots = threading.Semaphore(max_pending)
+    stop = threading.Event()
+    threads = [threading.Thread(target=_parse_items, name='PipelineParser',
+                                daemon=True,
+                                args=(section, source, context, work_queue,
+                                      done_queue, slots, stop, workers))]
+    threads.extend(threading.Thread(target=_sink_items, name='PipelineSink',
+                                    daemon=True,
+                                    args=(sink, work_queue, done_queue, stop))
+                   for _ in range(workers))
+    for thread in threads:
+        thread.start()
+    try:
+        waiting = dict()
+        next_index = 0
+        parse_end = None
+        while parse_end is None or next_index < parse_end.item_count:
+            message = done_queue.get()
+            if isinstance(message, _PipelineEnd):
+                parse_end = message
+                continue
+            if message.error is not None:
+                raise message.error
+            if ordered:
+                waiting[message.index] = message.result
+                while next_index in waiting:
+                    result = waiting.pop(next_index)
+                    next_index += 1
+                    slots.release()
+                    yield result
+            else:
+                next_index += 1
+                slots.release()
+                yield message.result
+        # A parsing error is raised after the items read before it.
+        if parse_end.error is not None:
+            raise parse_end.error
+    finally:
+        stop.set()
+        # Free any slots, so that the parser is not left waiting.
+        for _ in range(max_pending):
+            slots.release()
+        for thread in threads:
+            thread.join()
+
+#%%
@@ -0,0 +1,297 @@
+'''Incremental parsing of files that keep growing.
+
+Log-like exports have lines appended to them between reads.  Re-reading such
+a file from the start repeats the work done by every earlier read.  A
+TailReader reads the top level section repeatedly, as Section.__call__ does,
+and records a ParseCheckpoint after each complete section instance.  A later
+read seeks to the checkpoint and parses only the lines after it, so its cost
+depends on the size of the appended data rather than the whole file.
+
+A checkpoint records:
+    offset, line_number: The position of the first line not yet part of a
+        complete section instance.
+    previous_items: The lines before offset held in the BufferedIterator
+        buffer, so that they can still be stepped back to after resuming.
+    context: The context after the last complete section instance.
+    head_hash, definition: Used to detect a replaced or truncated file, or a
+        changed section definition, in which case the file is read again
+        from the start.
+
+Checkpoints are only taken at top level section boundaries.  At those points
+every section in the tree has finished, and the next read resets their
+breaks, so no open section or SectionBreak count down state needs to be
+kept.
+
+Because more lines may still be appended, a section instance that is ended
+by the end of the file, rather than by its end break, may be incomplete.
+Unless final=True, it is not returned and is read again, with the new lines,
+by the next read.  A last line without a line ending is also left for the
+next read.
+
+Limitations:
+    Lines are split on '\\n' only; the line endings are kept.
+    Context values must be picklable for the checkpoint to be saved.
+
+Usage:
+    reader = TailReader(section, file_path)
+    items = reader.read_new()
+    reader.checkpoint.save(checkpoint_path)
+    ...
+    reader = TailReader(section, file_path,
+                        ParseCheckpoint.load(checkpoint_path))
+    new_items = reader.read_new()
+or
+    items, checkpoint = section.read_tail(file_path, checkpoint)
+'''
+#%% Imports
+from __future__ import annotations
+import hashlib
+import logging
+import pickle
+from array import array
+from itertools import chain
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, NamedTuple, Optional
+from typing import Tuple
+
+from buffered_iterator import BufferedIterator
+from sections import AssembledItem, ContextType, Section, is_empty
+from section_index import TRANSIENT_CONTEXT, section_fingerprint
+
+
+#%% Logging
+logger = logging.getLogger('Tail Reader')
+logger.setLevel(logging.INFO)
+
+
+#%% Checkpoints
+# Number of bytes at the start of the file used to recognize it.
+HEAD_SAMPLE_SIZE = 4096
+
+
+class ParseCheckpoint(NamedTuple):
+    '''The state of an incremental parse after a complete section instance.
+
+    Attributes:
+        offset (int): The byte offset of the first line not yet read.
+        line_number (int): The number of lines before offset.
+        head_hash (str): The hash of the first HEAD_SAMPLE_SIZE bytes of the
+            file (or all of the bytes before offset, if fewer).
+        definition (str): The section_fingerprint of the section.
+        context (Dict[str, Any]): The context following the last complete
+            section instance.
+        previous_items (List[str]): The lines before offset retained in the
+            BufferedIterator buffer, oldest first.
+    '''
+    offset: int = 0
+    line_number: int = 0
+    head_hash: str = ''
+    definition: str = ''
+    context: Dict[str, Any] = {}
+    previous_items: List[str] = []
+
+    def save(self, checkpoint_path: Path):
+        '''Save the checkpoint to a file.
+
+        Args:
+            checkpoint_path (Path): The file to write.
+        '''
+        with open(checkpoint_path, 'wb') as checkpoint_file:
+            pickle.dump(self._asdict(), checkpoint_file)
+
+    @classmethod
+    def load(cls, checkpoint_path: Path)->ParseCheckpoint:
+        '''Load a checkpoint saved with save().
+
+        Args:
+            checkpoint_path (Path): The file to read.
+        Returns:
+            ParseCheckpoint: The saved checkpoint.
+        '''
+        with open(checkpoint_path, 'rb') as checkpoint_file:
+            return cls(**pickle.load(checkpoint_file))
+
+
+def head_hash(binary_file: BinaryIO, offset: int)->str:
+    '''Hash the start of a file.
+
+    Args:
+        binary_file (BinaryIO): The file, opened in binary mode.
+        offset (int): The checkpoint offset; bytes after it are not hashed.
+    Returns:
+        str: A hex digest of the first min(offset, HEAD_SAMPLE_SIZE) bytes.
+    '''
+    binary_file.seek(0)
+    sample = binary_file.read(min(offset, HEAD_SAMPLE_SIZE))
+    return hashlib.sha256(sample).hexdigest()
+
+
+#%% Tail Reader
+class TailReader():
+    '''Read the new section instances in a growing file.
+
+    Attributes:
+        section (Section): The top level section, read repeatedly.
+        file_path (Path): The file being read.
+        encoding (str): The text encoding of the file.
+        checkpoint (ParseCheckpoint): The position following the last
+            complete section instance.
+    '''
+    def __init__(self, section: Section, file_path: Path,
+                 checkpoint: ParseCheckpoint = None, encoding: str = 'utf-8',
+                 context: ContextType = None):
+        '''Prepare to read a file, optionally resuming from a checkpoint.
+
+        Args:
+            section (Section): The top level section.
+            file_path (Path): The file to read.
+            checkpoint (ParseCheckpoint, optional): The checkpoint to resume
+                from.  Defaults to None, which reads from the start.
+            encoding (str, optional): The text encoding of the file. Defaults
+                to 'utf-8'.
+            context (ContextType, optional): The initial context, used when
+                reading from the start. Defaults to None.
+        '''
+        self.section = section
+        self.file_path = Path(file_path)
+        self.encoding = encoding
+        self._definition = section_fingerprint(section)
+        self._initial_context = dict(context) if context else {}
+        if checkpoint is None:
+            checkpoint = self.start_checkpoint()
+        self.checkpoint = checkpoint
+
+    def start_checkpoint(self)->ParseCheckpoint:
+        '''A checkpoint at the start of the file.'''
+        return ParseCheckpoint(head_hash=hashlib.sha256(b'').hexdigest(),
+                               definition=self._definition,
+                               context=dict(self._initial_context))
+
+    def valid_checkpoint(self, binary_file: BinaryIO, file_size: int)->bool:
+        '''Check that the checkpoint applies to the current file and section.
+        '''
+        checkpoint = self.checkpoint
+        if checkpoint.definition != self._definition:
+            logger.info('Section definition changed; reading '
+                        f'{self.file_path} from the start.')
+            return False
+        if file_size < checkpoint.offset:
+            logger.info(f'{self.file_path} is shorter than the checkpoint; '
+                        'reading from the start.')
+            return False
+        if head_hash(binary_file, checkpoint.offset) != checkpoint.head_hash:
+            logger.info(f'{self.file_path} has been replaced; reading from '
+                        'the start.')
+            return False
+        return True
+
+    def new_lines(self, binary_file: BinaryIO, offsets: array,
+                  final: bool)->Iterator[str]:
+        '''Read the lines following the checkpoint.
+
+        The byte offset following each line is appended to offsets.
+
+        Args:
+            binary_file (BinaryIO): The file, positioned at the checkpoint.
+            offsets (array): Byte offsets, starting with the checkpoint
+                offset.
+            final (bool): If False, a last line without a line ending is not
+                returned.
+        Yields:
+            str: The next line, including its line ending.
+        '''
+        position = offsets[0]
+        for raw_line in binary_file:
+            if not (final or raw_line.endswith(b'\n')):
+                return
+            position += len(raw_line)
+            offsets.append(position)
+            yield raw_line.decode(self.encoding)
+
+    def read_new(self, final: bool = False)->List[AssembledItem]:
+        '''Read the complete section instances added since the checkpoint.
+
+        Args:
+            final (bool, optional): If True, the file is treated as complete;
+                a section instance ended by the end of the file is returned.
+                Defaults to False.
+        Returns:
+            List[AssembledItem]: The non-empty assembled section instances.
+        '''
+        section = self.section
+        items = list()
+        with open(self.file_path, 'rb') as binary_file:
+            file_size = binary_file.seek(0, 2)
+            if not self.valid_checkpoint(binary_file, file_size):
+                self.checkpoint = self.start_checkpoint()
+            checkpoint = self.checkpoint
+            binary_file.seek(checkpoint.offset)
+            offsets = array('q', [checkpoint.offset])
+            # Restore the buffered lines, so that they can be stepped back to.
+            previous = checkpoint.previous_items
+            lines = self.new_lines(binary_file, offsets, final)
+            source = BufferedIterator(chain(previous, lines),
+                                      buffer_size=section.buffer_size)
+            if previous:
+                source.advance(len(previous))
+            context = dict(checkpoint.context)
+            while True:
+                item = section.read(source, context=context)
+                status = section.scan_status
+                if status == 'End of Source' and not final:
+                    # The section instance may continue in lines not yet
+                    # written.
+                    break
+                if not is_empty(item):
+                    items.append(item)
+                self.checkpoint = self.new_checkpoint(binary_file, source,
+                                                      offsets, len(previous),
+                                                      context)
+                if status in ['Scan Complete', 'End of Source']:
+                    break
+            section.wrap_up(context)
+        return items
+
+    def new_checkpoint(self, binary_file: BinaryIO, source: BufferedIterator,
+                       offsets: array, num_previous: int,
+                       context: Dict[str, Any])->ParseCheckpoint:
+        '''Record the position following a complete section instance.'''
+        new_count = source.item_count - num_previous
+        offset = offsets[new_count]
+        current = binary_file.tell()
+        file_hash = head_hash(binary_file, offset)
+        binary_file.seek(current)
+        saved_context = {key: value for key, value in context.items()
+                         if key not in TRANSIENT_CONTEXT}
+        return ParseCheckpoint(
+            offset=offset,
+            line_number=self.checkpoint.line_number + new_count,
+            head_hash=file_hash,
+            definition=self._definition,
+            context=saved_context,
+            previous_items=list(source.previous_items))
+
+
+def read_tail(section: Section, file_path: Path,
+              checkpoint: Optional[ParseCheckpoint] = None,
+              final: bool = False, encoding: str = 'utf-8'
+              )->Tuple[List[AssembledItem], ParseCheckpoint]:
+    '''Read the complete section instances added to a file since a
+    checkpoint.
+
+    Args:
+        section (Section): The top level section.
+        file_path (Path): The file to read.
+        checkpoint (ParseCheckpoint, optional): The checkpoint returned by a
+            previous read. Defaults to None, which reads from the start.
+        final (bool, optional): If True, a section instance ended by the end
+            of the file is returned. Defaults to False.
+        encoding (str, optional): The text encoding of the file. Defaults to
+            'utf-8'.
+    Returns:
+        Tuple[List[AssembledItem], ParseCheckpoint]: The new section
+            instances and the checkpoint for the next read.
+    '''
+    reader = TailReader(section, file_path, checkpoint, encoding)
+    items = reader.read_new(final)
+    return items, reader.checkpoint
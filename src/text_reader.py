@@ -8,17 +8,23 @@ from __future__ import annotations
 #%% Imports
 import re
 import csv
+import mmap
+import codecs
 import logging
+from array import array
+from bisect import bisect_left
 from pathlib import Path
 from functools import partial
 from itertools import chain
 from typing import Dict, List, Sequence, TypeVar, Iterator
 from typing import Iterable, Any, Callable, Union, Generator
 
+import numpy as np
 import pandas as pd
-from sections import true_iterable
+from sections import true_iterable, batch_func, Assembler
 #from sections import Section, SectionBreak, Rule, ProcessingMethods
-from buffered_iterator import BufferedIterator
+from buffered_iterator import BufferedIterator, IndexedSource, PrefetchSource
+from buffered_iterator import block_matches
 from buffered_iterator import BufferOverflowWarning
 
 
@@ -218,6 +224,14 @@ def convert_numbers(parsed_line: List[str]) -> List[str]:
     return converted_line
 
 
+@batch_func
+def convert_numbers_block(parsed_lines: List[List[str]]) -> List[List[str]]:
+    '''Batch version of convert_numbers, applied to a chunk of parsed lines.
+    '''
+    return [[str2float(item) for item in parsed_line]
+            for parsed_line in parsed_lines]
+
+
 def drop_units(text: str) -> float:
     '''Remove unit text and return a number.
 
@@ -289,7 +303,27 @@ def csv_parser(line: SourceOptions, dialect_name='excel') -> ProcessedItemGen:
         yield line
 
 
-def define_csv_parser(name='default_csv',
+@batch_func
+def csv_parser_block(lines: Source,
+                     dialect_name='excel') -> List[List[str]]:
+    '''Batch version of csv_parser, applied to a chunk of text lines.
+
+    All of the lines are passed to a single csv reader.  The result matches
+    applying csv_parser to each line, provided that no quoted field contains a
+    line break.
+
+    Args:
+        lines: The text strings for parsing.
+        dialect_name: the name of the pre-defined csv Dialect to be used for
+            parsing.
+
+    Returns:
+        A list of lists of strings obtained by parsing the lines.
+    '''
+    return list(csv.reader(lines, dialect_name))
+
+
+def define_csv_parser(name='default_csv', block=False,
                       **parameters) -> Callable[[str,],List[str]]:
     '''Create a function that applies the defined csv parsing rules.
 
@@ -299,6 +333,8 @@ def define_csv_parser(name='default_csv',
 
     Args:
         name: Optional, The name for the new Dialect. Default is 'csv'.
+        block: Optional, If True, return a batch parser that parses a chunk
+            of lines in each call (see csv_parser_block). Default is False.
         **parameters: Any valid csv reader parameter.
             default values are:
                 delimiter=',',
@@ -330,7 +366,10 @@ def define_csv_parser(name='default_csv',
         )
     default_parameters.update(parameters)
     csv.register_dialect(name, **default_parameters)
-    parse_csv = partial(csv_parser, dialect_name=name)
+    if block:
+        parse_csv = batch_func(partial(csv_parser_block, dialect_name=name))
+    else:
+        parse_csv = partial(csv_parser, dialect_name=name)
     parse_csv.__name__ = f'csv({name})'
     return parse_csv
 
@@ -547,22 +586,28 @@ def to_dict(processed_lines: ProcessedList,
     dict_output = dict_type()
     for dict_line in processed_lines:
         logger.debug(f'dict_line: {dict_line}.')
-        if len(dict_line) == 0:
-            continue
-        elif len(dict_line) == 1:
-            if default_value is None:
-                continue
-            else:
-                dict_item = {dict_line[0]: default_value}
-        elif len(dict_line) == 2:
-            dict_item = {dict_line[0]: dict_line[1]}
-        elif multi_value:
-            dict_item = multi_value(dict_line)
-        else:
-            continue
-        dict_output.update(dict_item)
+        dict_item = line_to_dict(dict_line, default_value, multi_value)
+        if dict_item is not None:
+            dict_output.update(dict_item)
     return dict_output
 
+def line_to_dict(dict_line: ProcessedItem, default_value: Any = '',
+                 multi_value: Callable = None) -> Union[Dict[str, Any], None]:
+    '''Convert one list to a dictionary item, following the to_dict rules.
+        Returns None if the line is dropped.
+    '''
+    if len(dict_line) == 0:
+        return None
+    if len(dict_line) == 1:
+        if default_value is None:
+            return None
+        return {dict_line[0]: default_value}
+    if len(dict_line) == 2:
+        return {dict_line[0]: dict_line[1]}
+    if multi_value:
+        return multi_value(dict_line)
+    return None
+
 def to_dataframe(processed_lines: ProcessedList,
                  header=True) -> pd.DataFrame:
     '''Build a Pandas DataFrame from a sequence of lists.
@@ -580,6 +625,308 @@ def to_dataframe(processed_lines: ProcessedList,
     return dataframe
 
 
+class NumericBlockParser():
+    '''Converts a block of numeric text lines into a 2-D NumPy array.
+
+    All of the lines are parsed in a single call to np.loadtxt, rather than
+    converting each line to a list of Python floats.  Blank lines are skipped.
+    An instance can be used directly as a Section assemble function:
+        Section(name='DVH Curve', assemble=NumericBlockParser())
+
+    Attributes:
+        columns (int, None): The number of columns to read.
+        dtype (np.dtype): The data type of the array.
+        delimiter (str, None): The string separating values.
+        missing_values (frozenset[str]): Values to replace with fill_value.
+        fill_value (Any): The value used for missing values.
+    '''
+    def __init__(self, columns: int = None, dtype: Any = np.float64,
+                 delimiter: str = None, missing_values: Sequence[str] = None,
+                 fill_value: Any = np.nan):
+        '''Define a parser for a block of numeric text lines.
+
+        Args:
+            columns: Optional, The number of columns to read.  Additional
+                values on a line are ignored.  Default is None, which reads all
+                values; every line must then have the same number of values.
+            dtype: Optional, The data type of the array. Default is
+                np.float64.
+            delimiter: Optional, The string separating values.  Default is
+                None, which splits on whitespace.
+            missing_values: Optional, Strings that mark a missing value, for
+                example ['N/A', '-'].  Default is None; every value must be a
+                number.
+            fill_value: Optional, The value used in place of missing values.
+                Default is np.nan.
+        '''
+        self.columns = columns
+        self.dtype = np.dtype(dtype)
+        self.delimiter = delimiter
+        self.missing_values = frozenset(missing_values or ())
+        self.fill_value = fill_value
+
+    def convert_missing(self, text: str) -> Any:
+        '''Convert a single value, replacing a missing value marker.
+        '''
+        text = text.strip()
+        if text in self.missing_values:
+            return self.fill_value
+        return self.dtype.type(text)
+
+    def parse(self, lines: SourceOptions) -> np.ndarray:
+        '''Convert a sequence of numeric text lines into a 2-D array.
+
+        Args:
+            lines: A sequence of strings, each containing one row of values.
+        Returns:
+            A 2-D array with one row for each non-blank line.
+        Raises:
+            ValueError: If a value is not a number or a missing value marker,
+                or if a line has too few values.
+        '''
+        if isinstance(lines, str):
+            lines = [lines]
+        else:
+            lines = list(lines)
+        if not any(line.strip() for line in lines):
+            return np.empty((0, self.columns or 0), dtype=self.dtype)
+        if self.columns:
+            use_columns = range(self.columns)
+        else:
+            use_columns = None
+        try:
+            data = np.loadtxt(lines, dtype=self.dtype, comments=None,
+                              delimiter=self.delimiter, usecols=use_columns,
+                              ndmin=2)
+        except ValueError:
+            if not self.missing_values:
+                raise
+            # Parse again, checking each value for a missing value marker.
+            data = np.loadtxt(lines, dtype=self.dtype, comments=None,
+                              delimiter=self.delimiter, usecols=use_columns,
+                              converters=self.convert_missing, ndmin=2)
+        return data
+
+    def __call__(self, lines: SourceOptions,
+                 context: Dict[str, Any] = None) -> np.ndarray:
+        '''Convert a sequence of numeric text lines into a 2-D array.
+
+        Matches the standard process function signature, so that the parser
+        can be used as an assemble function.  context is not used.  See parse.
+        '''
+        return self.parse(lines)
+
+
+#%% Streaming output converters
+# These Assemblers build the same outputs as the converters above, without
+#    holding all of the processed lines in memory.  Use an instance as a
+#    Section assemble function.
+class DictAssembler(Assembler):
+    '''Builds a dictionary from length 2 lists as they are processed.
+
+    The streaming equivalent of to_dict.
+
+    Attributes:
+        default_value (Any): Value to use if len(List) = 1.  If None, that
+            List item is dropped.
+        multi_value (Callable, None): Method to apply if len(List) > 2.  If
+            None, that List item is dropped.
+        dict_type (type): The type of dictionary to build e.g. OrderedDict.
+    '''
+    def __init__(self, default_value: Any = '', multi_value: Callable = None,
+                 dict_type: type = dict):
+        self.default_value = default_value
+        self.multi_value = multi_value
+        self.dict_type = dict_type
+        self.dict_output = None
+
+    def start(self, context: Dict[str, Any] = None):
+        self.dict_output = self.dict_type()
+
+    def add(self, item: ProcessedItem):
+        dict_item = line_to_dict(item, self.default_value, self.multi_value)
+        if dict_item is not None:
+            self.dict_output.update(dict_item)
+
+    def finish(self) -> Dict[str, Any]:
+        return self.dict_output
+
+
+class DataFrameAssembler(Assembler):
+    '''Builds a Pandas DataFrame from lists, one chunk of rows at a time.
+
+    The streaming equivalent of to_dataframe.  Rows are collected into
+    DataFrames of chunk_size rows, which are concatenated by finish, so only
+    one chunk of rows is held as Python lists.  Column types are inferred for
+    each chunk; if they differ between chunks, the concatenated column has
+    the common type (often object).
+
+    Attributes:
+        header (bool, int): If True or a positive int, n, the first line is
+            used as the column names and the first 1 or n lines are not
+            included as data.
+        chunk_size (int): The number of rows in each DataFrame chunk.
+    '''
+    def __init__(self, header: Union[bool, int] = True,
+                 chunk_size: int = 10000):
+        self.header = header
+        self.chunk_size = chunk_size
+        self.columns = None
+        self.header_remaining = 0
+        self.rows = None
+        self.chunks = None
+
+    def start(self, context: Dict[str, Any] = None):
+        self.columns = None
+        self.header_remaining = int(self.header)  # int(True) = 1
+        self.rows = list()
+        self.chunks = list()
+
+    def add(self, item: ProcessedItem):
+        if len(item) == 0:
+            return
+        if self.header_remaining:
+            if self.columns is None:
+                self.columns = item
+            self.header_remaining -= 1
+            return
+        self.rows.append(item)
+        if len(self.rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        '''Convert the collected rows to a DataFrame chunk.'''
+        if self.rows:
+            self.chunks.append(pd.DataFrame(self.rows, columns=self.columns))
+            self.rows = list()
+
+    def finish(self) -> pd.DataFrame:
+        self.flush()
+        if not self.chunks:
+            return pd.DataFrame(columns=self.columns)
+        if len(self.chunks) == 1:
+            return self.chunks[0]
+        return pd.concat(self.chunks, ignore_index=True)
+
+
+class ArrayAssembler(Assembler):
+    '''Builds a 2-D NumPy array from rows of numeric values.
+
+    Each processed item is one row: a sequence of values, or a string of
+    whitespace separated values.  Empty rows are skipped.  Rows are converted
+    a batch at a time and copied into an array that doubles in size when it
+    is full, so the values are never held as Python objects for the whole
+    section.
+
+    Attributes:
+        columns (int, None): The number of columns to keep.  Additional values
+            in a row are ignored.  If None, every row must have the same
+            number of values as the first.
+        dtype (np.dtype): The data type of the array.
+        initial_rows (int): The starting capacity of the array.
+    '''
+    def __init__(self, columns: int = None, dtype: Any = np.float64,
+                 initial_rows: int = 1024):
+        self.columns = columns
+        self.dtype = np.dtype(dtype)
+        self.initial_rows = initial_rows
+        self.data = None
+        self.row_count = 0
+
+    def start(self, context: Dict[str, Any] = None):
+        self.data = None
+        self.row_count = 0
+
+    def add(self, item: ProcessedItem):
+        self.add_batch([item])
+
+    def add_batch(self, items: ProcessedList):
+        rows = [item.split() if isinstance(item, str) else item
+                for item in items]
+        rows = [row[:self.columns] for row in rows if len(row) > 0]
+        if not rows:
+            return
+        block = np.asarray(rows, dtype=self.dtype)
+        # A block of a different width would be broadcast into self.data.
+        if block.ndim != 2 or (self.data is not None
+                               and block.shape[1] != self.data.shape[1]):
+            raise ValueError('ArrayAssembler rows must all have the same '
+                             'number of values.')
+        if self.data is None:
+            capacity = max(self.initial_rows, len(block))
+            self.data = np.empty((capacity, block.shape[1]), dtype=self.dtype)
+        end = self.row_count + len(block)
+        if end > len(self.data):
+            capacity = max(2 * len(self.data), end)
+            self.data.resize((capacity, self.data.shape[1]), refcheck=False)
+        self.data[self.row_count:end] = block
+        self.row_count = end
+
+    def finish(self) -> np.ndarray:
+        if self.data is None:
+            return np.empty((0, self.columns or 0), dtype=self.dtype)
+        self.data.resize((self.row_count, self.data.shape[1]),
+                         refcheck=False)
+        return self.data
+
+
+class FileWriterAssembler(Assembler):
+    '''Writes processed items to a text file as they are produced.
+
+    Strings are written as they are; other items are treated as sequences of
+    values, joined with delimiter.  Each item is followed by newline.  The
+    assembled result is the path to the file.
+
+    Attributes:
+        file_path (Path): The file to write.
+        delimiter (str): The string placed between the values of an item.
+        newline (str): The string written after each item.
+        mode (str): The file open mode, 'w' to replace the file or 'a' to
+            append to it.
+        encoding (str): The text encoding of the file.
+        format_item (Callable, None): A function converting an item to the
+            string to write, used in place of the delimiter join.
+    '''
+    def __init__(self, file_path: Union[str, Path], delimiter: str = '\t',
+                 newline: str = '\n', mode: str = 'w',
+                 encoding: str = 'utf-8', format_item: Callable = None):
+        self.file_path = Path(file_path)
+        self.delimiter = delimiter
+        self.newline = newline
+        self.mode = mode
+        self.encoding = encoding
+        self.format_item = format_item
+        self.file = None
+
+    def start(self, context: Dict[str, Any] = None):
+        self.file = self.file_path.open(self.mode, encoding=self.encoding,
+                                        newline='')
+
+    def item_text(self, item: ProcessedItem) -> str:
+        '''The text written for one item.'''
+        if self.format_item:
+            text = self.format_item(item)
+        elif isinstance(item, str):
+            text = item
+        else:
+            text = self.delimiter.join(str(value) for value in item)
+        return text + self.newline
+
+    def add(self, item: ProcessedItem):
+        self.file.write(self.item_text(item))
+
+    def add_batch(self, items: ProcessedList):
+        self.file.write(''.join(self.item_text(item) for item in items))
+
+    def abort(self):
+        if self.file:
+            self.file.close()
+
+    def finish(self) -> Path:
+        self.file.close()
+        return self.file_path
+
+
 #%% Parsed Line processors
 # These functions take a list of strings and return a processed list of strings.
 def trim_items(parsed_line: Source) -> Source:
@@ -592,6 +939,13 @@ def trim_items(parsed_line: Source) -> Source:
     return trimed_line
 
 
+@batch_func
+def trim_items_block(parsed_lines: List[Source]) -> List[Source]:
+    '''Batch version of trim_items, applied to a chunk of parsed lines.
+    '''
+    return [trim_items(parsed_line) for parsed_line in parsed_lines]
+
+
 def merge_extra_items(parsed_line: Source) -> Source:
     '''If a parsed line has more than 2 items, join items 2 to n. with " ".
     '''
@@ -601,14 +955,356 @@ def merge_extra_items(parsed_line: Source) -> Source:
     return parsed_line
 
 
-def file_reader(file_path: Path)->BufferedIterator:
+# ASCII characters, other than '\n' and '\r', that str.splitlines treats as
+# line breaks.
+_OTHER_LINE_BREAKS = (b'\x0b', b'\x0c', b'\x1c', b'\x1d', b'\x1e')
+# The line endings recognized by MappedTextFile.
+_LINE_END = re.compile('\r\n|\r|\n')
+
+
+class MappedTextFile(IndexedSource):
+    '''A memory mapped text file, read as a sequence of lines.
+
+    The file is mapped into memory rather than read through a file object, so
+    the operating system pages in the parts of the file that are used.  The
+    offsets of the line breaks are found when the file is opened; lines are
+    only decoded when they are requested.  Lines are split and returned the
+    same way as iterating over a file opened with newline='': '\n', '\r' and
+    '\r\n' all end a line and the line endings are kept.
+
+    As an IndexedSource, a BufferedIterator reading a MappedTextFile can move
+    to any line, regardless of its buffer_size.
+
+    The line break search works on the raw bytes, so the encoding must be
+    ASCII compatible (e.g. 'utf-8', 'latin-1' or 'cp1252').  With
+    'utf_8_sig' a leading byte order mark is skipped and the lines are
+    decoded as 'utf-8'; as with open(), 'utf-8' keeps the mark in the first
+    line.
+
+    Attributes:
+        file_path (Path): The file being read.
+        encoding (str): The text encoding of the file.
+        errors (str): The decoding error handling scheme.
+        block_lines (int): The number of lines decoded together when reading
+            sequentially.
+        search_bytes (int): The approximate size of the blocks decoded
+            together by search.
+    '''
+    block_lines = 1024
+    search_bytes = 2**20
+
+    def __init__(self, file_path: Path, encoding: str = 'utf-8',
+                 errors: str = 'strict'):
+        '''Map the file and build the line index.
+
+        Args:
+            file_path (Path): The file to read.
+            encoding (str, optional): The text encoding of the file.  Must be
+                ASCII compatible or 'utf_8_sig'. Defaults to 'utf-8'.
+            errors (str, optional): The decoding error handling scheme, as
+                used by bytes.decode. Defaults to 'strict'.
+        Raises:
+            ValueError: If the encoding is not ASCII compatible.
+        '''
+        skip_bom = codecs.lookup(encoding).name == 'utf-8-sig'
+        if skip_bom:
+            encoding = 'utf-8'
+        if '\r\n'.encode(encoding) != b'\r\n':
+            raise ValueError('MappedTextFile requires an ASCII compatible '
+                             f'encoding. Got {encoding}')
+        self.file_path = Path(file_path)
+        self.encoding = encoding
+        self.errors = errors
+        with open(self.file_path, 'rb') as binary_file:
+            if self.file_path.stat().st_size > 0:
+                self._map = mmap.mmap(binary_file.fileno(), 0,
+                                      access=mmap.ACCESS_READ)
+            else:
+                # Empty files cannot be mapped.
+                self._map = b''
+        start = 0
+        if skip_bom and self._map[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8:
+            start = len(codecs.BOM_UTF8)
+        self._offsets = self.index_lines(self._map, start)
+
+    @staticmethod
+    def index_lines(data: Union[mmap.mmap, bytes], start: int = 0) -> array:
+        '''Find the offsets of the start of each line in data.
+
+        Args:
+            data: The file contents.
+            start: The offset of the first line.  Defaults to 0.
+        Returns:
+            An array of the offset of the start of each line, followed by the
+            length of data.
+        '''
+        size = len(data)
+        if size == start:
+            return array('q', [start])
+        byte_values = np.frombuffer(data, dtype=np.uint8)
+        line_ends = np.flatnonzero(byte_values == ord('\n')) + 1
+        if data.find(b'\r') != -1:
+            # A '\r' not followed by '\n' also ends a line.
+            returns = np.flatnonzero(byte_values == ord('\r'))
+            following = byte_values[np.minimum(returns + 1, size - 1)]
+            lone_returns = returns[following != ord('\n')]
+            line_ends = np.union1d(line_ends, lone_returns + 1)
+        # Release the view of data, so that the map can be closed.
+        del byte_values
+        offsets = array('q', [start])
+        offsets.frombytes(line_ends.astype(np.int64).tobytes())
+        if offsets[-1] != size:
+            # The last line has no line ending.
+            offsets.append(size)
+        return offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, item_num: int) -> str:
+        '''Decode a single line.
+
+        Args:
+            item_num: The line number (zero-based, negative values count from
+                the end of the file).
+        Returns:
+            The line, including its line ending.
+        Raises:
+            IndexError: If item_num is outside the file.
+        '''
+        num_lines = len(self._offsets) - 1
+        if item_num < 0:
+            item_num += num_lines
+        if not 0 <= item_num < num_lines:
+            raise IndexError(f'Line {item_num} is outside {self.file_path}')
+        start = self._offsets[item_num]
+        end = self._offsets[item_num + 1]
+        return self._map[start:end].decode(self.encoding, self.errors)
+
+    def line_offset(self, item_num: int) -> int:
+        '''The byte offset of the start of a line.
+
+        Args:
+            item_num: The line number (zero-based).  len(self) gives the size
+                of the file.
+        Returns:
+            The offset of the first byte of the line.
+        '''
+        return self._offsets[item_num]
+
+    def iter_from(self, item_num: int = 0) -> Iterator[str]:
+        '''Iterate through the lines, starting at line number item_num.
+
+        Lines are decoded in blocks.  In a block that is pure ASCII the byte
+        offsets are also character offsets, so the lines are sliced from a
+        single decoded string.  If the block also contains none of the other
+        characters that str.splitlines treats as line breaks, splitlines gives
+        the same lines.
+        '''
+        data = self._map
+        offsets = self._offsets
+        encoding = self.encoding
+        errors = self.errors
+        num_lines = len(offsets) - 1
+        for first in range(item_num, num_lines, self.block_lines):
+            last = min(first + self.block_lines, num_lines)
+            base = offsets[first]
+            raw_block = data[base:offsets[last]]
+            if raw_block.isascii():
+                text = raw_block.decode('ascii')
+                if not any(char in raw_block for char in _OTHER_LINE_BREAKS):
+                    yield from text.splitlines(keepends=True)
+                    continue
+                for idx in range(first, last):
+                    yield text[offsets[idx] - base:offsets[idx + 1] - base]
+            else:
+                for idx in range(first, last):
+                    yield data[offsets[idx]:offsets[idx + 1]].decode(encoding,
+                                                                     errors)
+
+    def search(self, pattern: re.Pattern,
+               item_num: int = 0) -> Iterator[int]:
+        '''Find the lines that may contain a match for a regular expression.
+
+        The file is decoded in blocks of about search_bytes, ending on a line
+        boundary, and each block is searched with a single pattern.search
+        call, without splitting it into lines.  In a block that is pure ASCII
+        the line offsets are also character offsets; otherwise the line of a
+        match is found by counting the line endings before it.
+
+        Args:
+            pattern (re.Pattern): The regular expression to search for.
+            item_num (int, optional): The number of the first line to search.
+                Defaults to 0.
+
+        Yields:
+            int: The numbers of the lines containing the start of a match, in
+                increasing order.
+        '''
+        data = self._map
+        offsets = self._offsets
+        num_lines = len(offsets) - 1
+        all_starts = np.frombuffer(offsets, dtype=np.int64)
+        while item_num < num_lines:
+            base = offsets[item_num]
+            last = bisect_left(offsets, base + self.search_bytes,
+                               item_num + 1, num_lines)
+            raw_block = data[base:offsets[last]]
+            if raw_block.isascii():
+                text = raw_block.decode('ascii')
+                starts = all_starts[item_num:last + 1] - base
+                yield from block_matches(pattern, text, starts, item_num)
+            else:
+                try:
+                    text = raw_block.decode(self.encoding, self.errors)
+                except UnicodeDecodeError:
+                    # Leave the error to be raised when the lines are read.
+                    yield from range(item_num, last)
+                else:
+                    yield from self.text_matches(pattern, text, item_num)
+            item_num = last
+
+    @staticmethod
+    def text_matches(pattern: re.Pattern, text: str,
+                     item_num: int) -> Iterator[int]:
+        '''Find the lines of a decoded block that contain the start of a
+        match.
+
+        Args:
+            pattern (re.Pattern): The regular expression to search for.
+            text (str): The decoded block, starting at the start of a line.
+            item_num (int): The line number of the first line in text.
+
+        Yields:
+            int: The numbers of the lines containing the start of a match, in
+                increasing order.
+        '''
+        position = 0
+        line = item_num
+        while True:
+            found = pattern.search(text, position)
+            if found is None:
+                return
+            start = found.start()
+            # Count the line endings ('\n', '\r\n' or a lone '\r') between
+            # position, which is always the start of a line, and the match.
+            line += (text.count('\n', position, start)
+                     + text.count('\r', position, start)
+                     - text.count('\r\n', position, start + 1))
+            yield line
+            line_end = _LINE_END.search(text, start)
+            if line_end is None:
+                return
+            position = line_end.end()
+            line += 1
+
+    def close(self):
+        '''Release the memory map.'''
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+    def __enter__(self) -> MappedTextFile:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def text_blocks(file_path: Path, block_size: int = 2**20,
+                encoding: str = None, errors: str = None) -> Iterator[List[str]]:
+    '''Read a text file as blocks of lines.
+
+    Each block holds whole lines totalling about block_size characters.  Lines
+    are split and returned the same way as iterating over the file opened
+    with newline=''; the line endings are kept.
+
+    Args:
+        file_path (Path): The file to read.
+        block_size (int, optional): The approximate number of characters in
+            each block. Defaults to 1 MiB.
+        encoding (str, optional): The text encoding of the file. Defaults to
+            None, the platform default used by open.
+        errors (str, optional): The decoding error handling scheme, as used
+            by open. Defaults to None ('strict').
+    Yields:
+        List[str]: The next block of lines.
+    '''
+    with open(file_path, encoding=encoding, errors=errors,
+              newline='') as textfile:
+        while True:
+            lines = textfile.readlines(block_size)
+            if not lines:
+                return
+            yield lines
+
+
+class PrefetchTextFile(PrefetchSource):
+    '''A text file read and decoded in blocks on a background thread.
+
+    The lines are the same as those from iterating over the file opened with
+    newline=''.  Reading ahead keeps the processing thread from waiting on
+    slow (e.g. network mounted) storage.  Use close(), or a with block, to
+    stop reading early.
+
+    Attributes:
+        file_path (Path): The file being read.
+        block_size (int): The approximate number of characters read in each
+            block.
+        queue_depth (int): The maximum number of blocks read ahead.
+    '''
+    def __init__(self, file_path: Path, block_size: int = 2**20,
+                 queue_depth: int = 8, encoding: str = None,
+                 errors: str = None):
+        '''Start reading the file on a background thread.
+
+        Args:
+            file_path (Path): The file to read.
+            block_size (int, optional): The approximate number of characters
+                in each block. Defaults to 1 MiB.
+            queue_depth (int, optional): The maximum number of blocks read
+                ahead. Defaults to 8.
+            encoding (str, optional): The text encoding of the file. Defaults
+                to None, the platform default used by open.
+            errors (str, optional): The decoding error handling scheme, as
+                used by open. Defaults to None ('strict').
+        '''
+        self.file_path = Path(file_path)
+        self.block_size = block_size
+        super().__init__(text_blocks(self.file_path, block_size, encoding,
+                                     errors), queue_depth=queue_depth)
+
+
+def file_reader(file_path: Path, memory_map: bool = False,
+                prefetch: bool = False, block_size: int = 2**20,
+                queue_depth: int = 8)->BufferedIterator:
     '''Iterate through the lines in a text file.
     Args:
         file_path (Path): The file to read.
+        memory_map (bool, optional): If True, read the file through a
+            MappedTextFile, allowing the iterator to move to any line.
+            Defaults to False.
+        prefetch (bool, optional): If True, read the file through a
+            PrefetchTextFile, reading and decoding blocks of lines on a
+            background thread.  Call close() on the returned iterator to stop
+            reading early. Defaults to False.
+        block_size (int, optional): The approximate number of characters in
+            each prefetched block. Defaults to 1 MiB.
+        queue_depth (int, optional): The maximum number of blocks prefetched.
+            Defaults to 8.
 
     Returns:
         BufferedIterator: Iterator yielding each line of a text file as an item.
+    Raises:
+        ValueError: If both memory_map and prefetch are True.
     '''
+    if memory_map and prefetch:
+        raise ValueError('memory_map and prefetch can not both be used.')
+    if memory_map:
+        return BufferedIterator(MappedTextFile(file_path))
+    if prefetch:
+        return BufferedIterator(PrefetchTextFile(file_path, block_size,
+                                                 queue_depth))
+
     def file_line_gen(file_path):
         with open(file_path, newline='') as textfile:
             for line in textfile:
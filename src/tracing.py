@@ -0,0 +1,356 @@
+'''Optional tracing of section parsing events.
+
+Tracing replaces per-item debug logging in the parsing hot paths.  When no
+trace hook is installed, each hot path only tests `trace_hook is not None`;
+no strings are formatted and no objects are created.  When a hook is
+installed, the hot paths call it with a TraceEvent describing what happened.
+
+Event kinds:
+    ITEM_FETCHED:       An item was obtained from a source.
+    TRIGGER_EVALUATED:  A SectionBreak or Rule applied its Trigger test.
+    BREAK_FIRED:        A section boundary was detected.
+    STAGE_OUTPUT:       A section generated a processed item.
+    ITEMS_SKIPPED:      A section's start search finished.
+    STAGE_TIMED:        A processing stage of a section finished.
+    ASSEMBLE_TIMED:     A section's assemble function finished.
+
+Usage:
+    collector = TraceCollector()
+    with trace(collector):
+        section.read(source)
+    timeline = collector.timeline()
+'''
+# pylint: disable=global-statement
+#%% Imports
+from __future__ import annotations
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple
+from typing import Optional
+
+
+#%% Event Types
+ITEM_FETCHED = 'item fetched'
+TRIGGER_EVALUATED = 'trigger evaluated'
+BREAK_FIRED = 'break fired'
+STAGE_OUTPUT = 'stage output'
+ITEMS_SKIPPED = 'items skipped'
+STAGE_TIMED = 'stage timed'
+ASSEMBLE_TIMED = 'assemble timed'
+
+
+class TraceEvent(NamedTuple):
+    '''Information on a single parsing event.
+
+    Attributes:
+        kind (str): One of ITEM_FETCHED, TRIGGER_EVALUATED, BREAK_FIRED or
+            STAGE_OUTPUT.
+        section (str, None): The name of the Section the event belongs to, if
+            known by the emitter.
+        name (str): The name of the object emitting the event (Section,
+            SectionBreak, Rule or BufferedIterator).  A SectionBreak with the
+            default name is named by its role, position and sentinel (see
+            BoundaryEvaluator.trace_name).
+        item_count (int, None): The position of the source when the event
+            occurred.
+        value (Any): Event specific information:
+            ITEM_FETCHED:       The item.
+            TRIGGER_EVALUATED:  The trigger test result (test_value).
+            BREAK_FIRED:        The name of the SectionBreak that fired.
+            STAGE_OUTPUT:       The processed item.
+            ITEMS_SKIPPED:      The number of items skipped.
+            STAGE_TIMED:        A StageTiming.
+            ASSEMBLE_TIMED:     A StageTiming.
+        timestamp (float): time.perf_counter() when the event was emitted.
+    '''
+    kind: str
+    section: Optional[str]
+    name: str
+    item_count: Optional[int]
+    value: Any
+    timestamp: float
+
+
+TraceHook = Callable[[TraceEvent], None]
+
+
+class StageTiming(NamedTuple):
+    '''The time spent in one processing stage during one section read.
+
+    Attributes:
+        stage (str): The stage label.
+        index (int): The position of the stage in the section's processing
+            methods.  -1 for reading the section source (the scan) and for
+            assembling.
+        items (int): The number of items produced by the stage.
+        wall (float): The wall clock time (s) spent in the stage, excluding
+            the time spent in earlier stages.
+        cpu (float): The process CPU time (s) spent in the stage, excluding
+            the time spent in earlier stages.
+    '''
+    stage: str
+    index: int
+    items: int
+    wall: float
+    cpu: float
+
+#%% Hook Management
+# The active trace hook.  Hot paths test this directly:
+#     if tracing.trace_hook is not None:
+#         tracing.emit(...)
+trace_hook: Optional[TraceHook] = None
+
+
+def set_trace_hook(hook: Optional[TraceHook])->Optional[TraceHook]:
+    '''Install a trace hook, replacing any existing hook.
+
+    Args:
+        hook (TraceHook, None): A callable accepting a TraceEvent, or None to
+            turn tracing off.
+
+    Returns:
+        TraceHook, None: The previously installed hook.
+    '''
+    global trace_hook
+    previous = trace_hook
+    trace_hook = hook
+    return previous
+
+
+def tracing_enabled()->bool:
+    '''bool: True if a trace hook is installed.'''
+    return trace_hook is not None
+
+
+@contextmanager
+def trace(hook: TraceHook)->Iterator[TraceHook]:
+    '''Install a trace hook for the duration of a with block.
+
+    The previously installed hook (if any) is restored on exit.
+
+    Args:
+        hook (TraceHook): A callable accepting a TraceEvent.
+
+    Yields:
+        TraceHook: The installed hook.
+    '''
+    previous = set_trace_hook(hook)
+    try:
+        yield hook
+    finally:
+        set_trace_hook(previous)
+
+
+def emit(kind: str, section: Optional[str], name: str,
+         item_count: Optional[int], value: Any = None):
+    '''Build a TraceEvent and pass it to the installed hook.
+
+    Only call this after checking that `trace_hook is not None`.
+
+    Args:
+        kind (str): The event type.
+        section (str, None): The name of the Section the event belongs to.
+        name (str): The name of the object emitting the event.
+        item_count (int, None): The position of the source.
+        value (Any, optional): Event specific information.
+    '''
+    hook = trace_hook
+    if hook is not None:
+        hook(TraceEvent(kind, section, name, item_count, value,
+                        time.perf_counter()))
+
+
+#%% Stage Timing
+class StageTimer():
+    '''Accumulates the time spent obtaining items from an iterator.
+
+    Processing stages are chained generators, so the time spent getting an
+    item from a stage includes the time spent in all of the stages before it.
+    Each StageTimer refers to the timer of the preceding stage (upstream) and
+    subtracts its time to give the time spent in its own stage.
+
+    Attributes:
+        stage (str): The stage label.
+        index (int): The position of the stage.
+        upstream (StageTimer, None): The timer of the preceding stage.
+        wall (float): The total wall clock time (s), including upstream.
+        cpu (float): The total process CPU time (s), including upstream.
+        items (int): The number of items obtained.
+    '''
+    def __init__(self, stage: str, index: int = -1,
+                 upstream: Optional[StageTimer] = None):
+        self.stage = stage
+        self.index = index
+        self.upstream = upstream
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.items = 0
+
+    def timing(self)->StageTiming:
+        '''StageTiming: The time spent in this stage alone.'''
+        wall = self.wall
+        cpu = self.cpu
+        if self.upstream is not None:
+            wall -= self.upstream.wall
+            cpu -= self.upstream.cpu
+        return StageTiming(self.stage, self.index, self.items, wall, cpu)
+
+    def time_items(self, source: Iterable)->Iterator[Any]:
+        '''Yield the items from source, timing each request.
+
+        Args:
+            source (Iterable): The stage output.
+
+        Yields:
+            Any: The items from source.
+        '''
+        perf_counter = time.perf_counter
+        process_time = time.process_time
+        source = iter(source)
+        while True:
+            wall = perf_counter()
+            cpu = process_time()
+            try:
+                item = next(source)
+            except StopIteration:
+                return
+            finally:
+                self.wall += perf_counter() - wall
+                self.cpu += process_time() - cpu
+            self.items += 1
+            yield item
+
+    def time_iter(self, source: Iterable, section: Optional[str] = None
+                  )->Iterator[Any]:
+        '''Yield the items from source, timing each request.
+
+        When source is exhausted, or the generator is closed, a STAGE_TIMED
+        event is emitted.
+
+        Args:
+            source (Iterable): The stage output.
+            section (str, None): The name of the section the stage belongs to.
+
+        Yields:
+            Any: The items from source.
+        '''
+        try:
+            yield from self.time_items(source)
+        finally:
+            emit(STAGE_TIMED, section, self.stage, None, self.timing())
+
+
+def time_assemble(section: str, assemble: Callable[[Iterable, Any], Any],
+                  processed: Iterable, context: Any)->Any:
+    '''Call a section's assemble function, emitting an ASSEMBLE_TIMED event.
+
+    The time spent producing the processed items is excluded.
+
+    Args:
+        section (str): The name of the section.
+        assemble (Callable): The section's assemble function.
+        processed (Iterable): The processed section items.
+        context (Any): The context supplied to the assemble function.
+
+    Returns:
+        Any: The assembled section.
+    '''
+    processed_timer = StageTimer('Processed')
+    timer = StageTimer('Assemble', upstream=processed_timer)
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    assembled = assemble(processed_timer.time_items(processed), context)
+    timer.wall = time.perf_counter() - wall
+    timer.cpu = time.process_time() - cpu
+    timer.items = processed_timer.items
+    emit(ASSEMBLE_TIMED, section, section, None, timer.timing())
+    return assembled
+
+
+#%% Collector
+class TraceCollector():
+    '''A trace hook that stores events and builds a per-section timeline.
+
+    Events emitted without a section name (e.g. by a BufferedIterator or a
+    Rule) are assigned to the section of the most recent event that has one.
+
+    Attributes:
+        events (List[TraceEvent]): The events received, in order.
+        kinds (set[str], None): If given, only events of these kinds are
+            stored.
+        max_events (int, None): If given, stop storing events after this
+            many have been received.
+    '''
+    def __init__(self, kinds: List[str] = None, max_events: int = None):
+        '''Create an empty collector.
+
+        Args:
+            kinds (List[str], optional): The event kinds to store. Defaults to
+                None, which stores all kinds.
+            max_events (int, optional): The maximum number of events to store.
+                Defaults to None (no limit).
+        '''
+        self.kinds = set(kinds) if kinds else None
+        self.max_events = max_events
+        self.events: List[TraceEvent] = list()
+        self._current_section = None
+
+    def __call__(self, event: TraceEvent):
+        '''Store a trace event, assigning it to a section.
+
+        Args:
+            event (TraceEvent): The event to store.
+        '''
+        if event.section is None:
+            event = event._replace(section=self._current_section)
+        else:
+            self._current_section = event.section
+        if self.kinds is not None and event.kind not in self.kinds:
+            return
+        if self.max_events is not None:
+            if len(self.events) >= self.max_events:
+                return
+        self.events.append(event)
+
+    def clear(self):
+        '''Remove all stored events.'''
+        self.events.clear()
+        self._current_section = None
+
+    def timeline(self)->Dict[str, List[TraceEvent]]:
+        '''Group the stored events by section.
+
+        Returns:
+            Dict[str, List[TraceEvent]]: The events for each section, in the
+                order received.  Sections are ordered by their first event.
+        '''
+        section_events: Dict[str, List[TraceEvent]] = dict()
+        for event in self.events:
+            section_events.setdefault(event.section, []).append(event)
+        return section_events
+
+    def summary(self)->Dict[str, Dict[str, Any]]:
+        '''Summarize the timeline for each section.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: For each section:
+                'Start' (float): Timestamp of the first event.
+                'End' (float): Timestamp of the last event.
+                'Duration' (float): End - Start in seconds.
+                kind (int): The number of events of each kind.
+        '''
+        section_summary = dict()
+        for section, events in self.timeline().items():
+            counts = {ITEM_FETCHED: 0, TRIGGER_EVALUATED: 0,
+                      BREAK_FIRED: 0, STAGE_OUTPUT: 0}
+            for event in events:
+                counts[event.kind] = counts.get(event.kind, 0) + 1
+            start = events[0].timestamp
+            end = events[-1].timestamp
+            section_summary[section] = {
+                'Start': start,
+                'End': end,
+                'Duration': end - start,
+                **counts
+                }
+        return section_summary
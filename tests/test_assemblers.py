@@ -0,0 +1,175 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import text_reader as tp
+from sections import Assembler, Section
+
+
+#%% Test Text
+GENERIC_TEST_TEXT = [
+    'Dose Volume',
+    'Dose\tVolume',
+    '0\t100',
+    '',
+    '1\t99.5',
+    '2\t98',
+    'Structure: PTV',
+    ]
+
+DICT_LINES = [['a', 1], ['b'], [], ['c', 2, 3], ['d', 4]]
+
+
+def split_tabs(line):
+    return line.split('\t') if line else []
+
+
+def make_section(assembler)->Section:
+    return Section(start_section=('Dose Volume', 'START', 'After'),
+                   end_section=('Structure:', 'START', 'Before'),
+                   processor=[split_tabs], assemble=assembler)
+
+
+class CountAssembler(Assembler):
+    batch_size = 2
+
+    def start(self, context=None):
+        self.batches = []
+
+    def add(self, item):
+        self.batches[-1].append(item)
+
+    def add_batch(self, items):
+        self.batches.append([])
+        super().add_batch(items)
+
+    def finish(self):
+        return self.batches
+
+
+class TestAssembler(unittest.TestCase):
+    def test_batches(self):
+        assembler = CountAssembler()
+        self.assertListEqual(assembler(range(5)), [[0, 1], [2, 3], [4]])
+        # Each call starts a new result.
+        self.assertListEqual(assembler(range(1)), [[0]])
+
+    def test_subsections_share_assembler(self):
+        assembler = tp.DictAssembler()
+        sub_section = Section(name='Sub',
+                              start_section=('Start', 'START', 'Before'),
+                              end_section=('End', 'START', 'Before'),
+                              processor=[lambda line: line.split(':')],
+                              assemble=assembler)
+        section = Section(name='All', processor=[sub_section],
+                          assemble=lambda items: list(items))
+        text = ['Start:1', 'a:2', 'End', 'Start:3', 'b:4', 'End']
+        self.assertListEqual(section.read(text),
+                             [{'Start': '1', 'a': '2'},
+                              {'Start': '3', 'b': '4'}])
+
+
+class TestDictAssembler(unittest.TestCase):
+    def test_matches_to_dict(self):
+        for default_value in ['', None]:
+            for multi_value in [None, lambda line: {line[0]: line[1:]}]:
+                with self.subTest(default_value=default_value,
+                                  multi_value=multi_value):
+                    expected = tp.to_dict(DICT_LINES, default_value,
+                                          multi_value)
+                    assembler = tp.DictAssembler(default_value, multi_value)
+                    self.assertDictEqual(assembler(DICT_LINES), expected)
+
+
+class TestDataFrameAssembler(unittest.TestCase):
+    def test_matches_to_dataframe(self):
+        lines = [['A', 'B'], [1, 2], [], [3, 4], [5, 6]]
+        for header in [True, False, 2]:
+            with self.subTest(header=header):
+                expected = tp.to_dataframe(lines, header=header)
+                assembler = tp.DataFrameAssembler(header=header, chunk_size=2)
+                pd.testing.assert_frame_equal(assembler(lines), expected)
+
+    def test_section_assemble(self):
+        section = make_section(tp.DataFrameAssembler(chunk_size=1))
+        output = section.read(GENERIC_TEST_TEXT)
+        self.assertListEqual(list(output.columns), ['Dose', 'Volume'])
+        self.assertListEqual(output['Volume'].tolist(), ['100', '99.5', '98'])
+
+    def test_empty(self):
+        output = tp.DataFrameAssembler()([['A', 'B']])
+        self.assertListEqual(list(output.columns), ['A', 'B'])
+        self.assertEqual(len(output), 0)
+
+
+class TestArrayAssembler(unittest.TestCase):
+    def test_growth(self):
+        assembler = tp.ArrayAssembler(initial_rows=2)
+        assembler.batch_size = 3
+        rows = [[i, i * 0.5] for i in range(10)]
+        output = assembler(rows)
+        np.testing.assert_array_equal(output, np.array(rows, dtype=float))
+
+    def test_text_rows_and_columns(self):
+        assembler = tp.ArrayAssembler(columns=2, dtype=int)
+        output = assembler(['1 2 3', '', '4 5 6'])
+        np.testing.assert_array_equal(output, np.array([[1, 2], [4, 5]]))
+        self.assertEqual(output.dtype, np.dtype(int))
+
+    def test_empty(self):
+        output = tp.ArrayAssembler(columns=3)([])
+        self.assertTupleEqual(output.shape, (0, 3))
+
+    def test_ragged(self):
+        with self.assertRaises(ValueError):
+            tp.ArrayAssembler()([[1, 2], [3]])
+
+    def test_ragged_between_batches(self):
+        # The change in width falls in the second batch.
+        assembler = tp.ArrayAssembler()
+        assembler.batch_size = 2
+        with self.assertRaises(ValueError):
+            assembler(['1 2 3', '4 5 6', '7', '8'])
+        assembler = tp.ArrayAssembler(columns=3)
+        assembler.batch_size = 2
+        with self.assertRaises(ValueError):
+            assembler(['1 2 3', '4 5 6', '7', '8'])
+
+    def test_compiled_section(self):
+        section = make_section(tp.ArrayAssembler())
+        section.start_section = ('Dose\t', 'START', 'After')
+        expected = np.array([[0, 100], [1, 99.5], [2, 98]])
+        np.testing.assert_array_equal(section.read(GENERIC_TEST_TEXT),
+                                      expected)
+        np.testing.assert_array_equal(
+            section.compile().read(GENERIC_TEST_TEXT), expected)
+
+
+class TestFileWriterAssembler(unittest.TestCase):
+    def test_write_section(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = Path(temp_dir) / 'dvh.txt'
+            section = make_section(tp.FileWriterAssembler(file_path,
+                                                          delimiter=','))
+            self.assertEqual(section.read(GENERIC_TEST_TEXT), file_path)
+            self.assertEqual(file_path.read_text(),
+                             'Dose,Volume\n0,100\n\n1,99.5\n2,98\n')
+
+    def test_file_closed_on_error(self):
+        def bad_items():
+            yield 'a'
+            raise RuntimeError('Processing failed')
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = Path(temp_dir) / 'out.txt'
+            assembler = tp.FileWriterAssembler(file_path, mode='a')
+            with self.assertRaises(RuntimeError):
+                assembler(bad_items())
+            assembler(['b'])
+            self.assertEqual(file_path.read_text(), 'b\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
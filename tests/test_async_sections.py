@@ -0,0 +1,150 @@
+import asyncio
+import unittest
+
+from buffered_iterator import AsyncBufferedIterator, AsyncSourcePending
+from buffered_iterator import BufferOverflowWarning
+from sections import Section
+
+
+#%% Test Text
+GENERIC_TEST_TEXT = [
+    'Text to be ignored',
+    'StartSection Name: A',
+    'Field: 1',
+    'EndSection Name: A',
+    'StartSection Name: B',
+    'Field: 2',
+    'EndSection Name: B',
+    'More text to be ignored',
+    ]
+
+
+async def async_lines(lines, delay=0):
+    for line in lines:
+        await asyncio.sleep(delay)
+        yield line
+
+
+def make_section()->Section:
+    return Section(name='Block',
+                   start_section=('StartSection', 'START', 'Before'),
+                   end_section=('EndSection', 'START', 'After'))
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, timeout=10))
+
+
+class TestAsyncBufferedIterator(unittest.TestCase):
+    def test_iterate(self):
+        async def read_all():
+            return [line async for line in
+                    AsyncBufferedIterator(async_lines(GENERIC_TEST_TEXT))]
+        self.assertListEqual(run(read_all()), GENERIC_TEST_TEXT)
+
+    def test_backup_and_look_ahead(self):
+        async def navigate():
+            source = AsyncBufferedIterator(async_lines(GENERIC_TEST_TEXT),
+                                           buffer_size=10)
+            first = await source.__anext__()
+            ahead = await source.alook_ahead(2)
+            await source.aadvance(2)
+            source.backup(1)
+            again = await source.__anext__()
+            with self.assertRaises(BufferOverflowWarning):
+                await source.alook_ahead(len(GENERIC_TEST_TEXT))
+            return first, ahead, again, source.item_count
+        self.assertTupleEqual(run(navigate()),
+                              (GENERIC_TEST_TEXT[0], GENERIC_TEST_TEXT[2],
+                               GENERIC_TEST_TEXT[2], 3))
+
+    def test_sync_read_on_loop(self):
+        async def sync_next():
+            source = AsyncBufferedIterator(async_lines(GENERIC_TEST_TEXT))
+            await source.fill(1)
+            first = next(source)
+            with self.assertRaises(AsyncSourcePending):
+                next(source)
+            return first
+        self.assertEqual(run(sync_next()), GENERIC_TEST_TEXT[0])
+
+
+class TestSectionAsync(unittest.TestCase):
+    def test_aread(self):
+        expected = make_section().read(GENERIC_TEST_TEXT)
+        result = run(make_section().aread(async_lines(GENERIC_TEST_TEXT)))
+        self.assertListEqual(result, expected)
+
+    def test_aiter(self):
+        expected = list(make_section()(GENERIC_TEST_TEXT))
+        async def read_all(section):
+            return [item async for item in
+                    section.aiter(async_lines(GENERIC_TEST_TEXT))]
+        self.assertListEqual(run(read_all(make_section())), expected)
+        self.assertListEqual(run(read_all(make_section().compile())),
+                             expected)
+
+    def test_shared_source(self):
+        async def read_twice():
+            source = AsyncBufferedIterator(async_lines(GENERIC_TEST_TEXT))
+            section = make_section()
+            first = await section.aread(source)
+            second = await section.aread(source)
+            return first, second
+        self.assertTupleEqual(run(read_twice()),
+                              (GENERIC_TEST_TEXT[1:4], GENERIC_TEST_TEXT[4:7]))
+
+    def test_concurrent_streams(self):
+        async def read_many():
+            readers = [make_section().aread(async_lines(GENERIC_TEST_TEXT,
+                                                        delay=0.001))
+                       for _ in range(5)]
+            return await asyncio.gather(*readers)
+        self.assertListEqual(run(read_many()), [GENERIC_TEST_TEXT[1:4]] * 5)
+
+    def test_concurrent_streams_one_instance(self):
+        other_text = [line.replace('Name: A', 'Name: C')
+                      for line in GENERIC_TEST_TEXT]
+        texts = [GENERIC_TEST_TEXT, other_text] * 3
+        section = make_section()
+
+        async def read_many(reader):
+            readers = [reader.aread(async_lines(text, delay=0.001))
+                       for text in texts]
+            return await asyncio.gather(*readers)
+
+        async def iterate_many(reader):
+            async def read_all(text):
+                return [item async for item in
+                        reader.aiter(async_lines(text, delay=0.001))]
+            return await asyncio.gather(*[read_all(text) for text in texts])
+
+        expected_read = [section.read(text) for text in texts]
+        expected_iter = [list(section(text)) for text in texts]
+        for reader in [section, section.compile()]:
+            with self.subTest(reader=type(reader).__name__):
+                self.assertListEqual(run(read_many(reader)), expected_read)
+                self.assertListEqual(run(iterate_many(reader)),
+                                     expected_iter)
+
+    def test_error(self):
+        def fail(line):
+            raise ValueError('Bad line')
+        section = Section(processor=[fail])
+        with self.assertRaises(ValueError):
+            run(section.aread(async_lines(GENERIC_TEST_TEXT)))
+
+    def test_close_early(self):
+        async def first_item():
+            source = AsyncBufferedIterator(async_lines(GENERIC_TEST_TEXT * 10))
+            items = make_section().aiter(source)
+            async for item in items:
+                break
+            await items.aclose()
+            return item, source.closed
+        self.assertTupleEqual(run(first_item()),
+                              (GENERIC_TEST_TEXT[1:4], True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import re
+import unittest
+
+from buffered_iterator import BufferedIterator
+from sections import BoundaryEvaluator, Section, SectionBreak
+
+
+#%% Test Text
+GENERIC_TEST_TEXT = [
+    'Head',
+    'Record 1',
+    'a',
+    'Record 2',
+    'b',
+    'End',
+    'Tail',
+    ]
+
+
+class TestEarlyExit(unittest.TestCase):
+    def test_later_break_does_not_overwrite(self):
+        # Before, a later break that did not fire cancelled an earlier break
+        # that did.
+        record = Section(name='Record',
+                         start_section=('Record', 'START', 'Before'),
+                         end_section=[SectionBreak('Record', 'START'),
+                                      SectionBreak('End', 'START')])
+        section = Section(name='All', processor=[record])
+        self.assertListEqual(section.read(GENERIC_TEST_TEXT),
+                             [['Record 1', 'a'], ['Record 2', 'b']])
+
+    def test_precedence(self):
+        section = Section(end_section=[
+            SectionBreak('Rec', 'START', name='First'),
+            SectionBreak('Record', 'START', name='Second')])
+        section.read(GENERIC_TEST_TEXT)
+        self.assertEqual(section.context['Break'], 'First')
+        self.assertEqual(section.context['Event'], 'Rec')
+
+    def test_later_breaks_not_evaluated(self):
+        calls = []
+
+        def is_end(line):
+            calls.append(line)
+            return line == 'End'
+
+        section = Section(end_section=[SectionBreak('Record 2', 'START'),
+                                       SectionBreak(is_end)])
+        self.assertListEqual(section.read(GENERIC_TEST_TEXT),
+                             GENERIC_TEST_TEXT[:3])
+        # The first item starts the section and is not checked for an end.
+        self.assertListEqual(calls, ['Record 1', 'a'])
+
+    def test_count_down(self):
+        # A count down continues while earlier breaks are checked.
+        section = Section(end_section=[SectionBreak('Tail', 'START'),
+                                       SectionBreak('Record 2', 'START', 1)])
+        self.assertListEqual(section.read(GENERIC_TEST_TEXT),
+                             GENERIC_TEST_TEXT[:5])
+        section = Section(end_section=[SectionBreak('b', 'FULL'),
+                                       SectionBreak('Record 1', 'START', 2)])
+        self.assertListEqual(section.read(GENERIC_TEST_TEXT),
+                             GENERIC_TEST_TEXT[:4])
+
+
+class TestCombinedPattern(unittest.TestCase):
+    items = ['Head', 'head', 'Record 1', 'a value', 'END', 'x End', '',
+             'Record 22']
+
+    def first_break(self, breaks, item):
+        for brk in breaks:
+            if brk.evaluate(item):
+                return brk
+        return None
+
+    def compare(self, breaks):
+        evaluator = BoundaryEvaluator(breaks)
+        for item in self.items:
+            # A break with a negative offset steps back the source.
+            source = BufferedIterator([item])
+            next(source)
+            with self.subTest(item=item):
+                self.assertIs(evaluator.check(item, source),
+                              self.first_break(breaks, item))
+        return evaluator
+
+    def test_strings(self):
+        breaks = [SectionBreak('Record', 'START'), SectionBreak('End', 'END'),
+                  SectionBreak(['a value', 'head'], 'FULL'),
+                  SectionBreak(['valu', '1'], 'IN')]
+        evaluator = self.compare(breaks)
+        self.assertIsNotNone(evaluator._pattern)  # pylint: disable=protected-access
+
+    def test_patterns(self):
+        breaks = [SectionBreak(re.compile('^head$', re.I | re.M), 'FULL'),
+                  SectionBreak(re.compile(r'\d{2}'), 'IN'),
+                  SectionBreak(re.compile('x end', re.I), 'START'),
+                  SectionBreak('END', 'FULL')]
+        self.compare(breaks)
+
+    def test_never_fires(self):
+        # The default end break (a sentinel of False) is screened with the
+        # other breaks rather than checked for every item.
+        breaks = [SectionBreak(False), SectionBreak('End', 'END')]
+        evaluator = self.compare(breaks)
+        self.assertIsNotNone(evaluator._pattern)  # pylint: disable=protected-access
+
+    def test_unmerged(self):
+        breaks = [SectionBreak(re.compile(r'(\w)\1')),
+                  SectionBreak(re.compile('end', re.ASCII | re.I)),
+                  SectionBreak(lambda item: item == ''),
+                  SectionBreak('Record', 'START')]
+        self.compare(breaks)
+
+
+if __name__ == '__main__':
+    unittest.main()
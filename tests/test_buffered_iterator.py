@@ -4,6 +4,7 @@ import random
 from buffered_iterator import BufferedIterator
 from buffered_iterator import BufferedIteratorValueError
 from buffered_iterator import BufferOverflowWarning
+from buffered_iterator import IndexedSequence
 
 import logging
 logging.basicConfig(format='%(name)-20s - %(levelname)s: %(message)s')
@@ -449,6 +450,130 @@ class TestBufferedIterator_link(unittest.TestCase):
         self.to_iter.link(self.from_iter, include_future_items=True)
         self.assertListEqual(list(self.to_iter.future_items),
                              list(self.from_iter.future_items))
+
+class TestBufferedIteratorRingBuffer(unittest.TestCase):
+    '''Verify that moving the pointer within the ring buffer does not lose
+    or re-order stored items.
+    '''
+    def setUp(self):
+        self.buffer_size = 5
+        self.num_items = 20
+        self.int_source = BufferedIterator(range(self.num_items),
+                                           buffer_size=self.buffer_size)
+
+    def test_look_ahead_with_partial_future_items(self):
+        '''look_ahead beyond the stored future items reads the missing items
+        from the source.
+        '''
+        for i in range(4):
+            next(self.int_source)
+        self.int_source.backup(1)
+        self.assertEqual(self.int_source.look_ahead(3), 5)
+        self.assertEqual(self.int_source.item_count, 3)
+        self.assertListEqual(list(self.int_source.future_items), [3, 4, 5])
+        self.assertEqual(next(self.int_source), 3)
+
+    def test_look_ahead_keeps_previous_items(self):
+        '''look_ahead does not drop items from previous_items.
+        '''
+        for i in range(self.buffer_size + 2):
+            next(self.int_source)
+        previous = list(self.int_source.previous_items)
+        self.int_source.look_ahead(self.buffer_size)
+        self.assertListEqual(list(self.int_source.previous_items), previous)
+        self.int_source.backup(self.buffer_size)
+        self.assertEqual(next(self.int_source), 2)
+
+    def test_look_ahead_past_end_of_source(self):
+        '''look_ahead beyond the end of the source raises
+        BufferOverflowWarning without moving the pointer.
+        '''
+        for i in range(self.num_items - 2):
+            next(self.int_source)
+        with self.assertRaises(BufferOverflowWarning):
+            self.int_source.look_ahead(3)
+        self.assertEqual(self.int_source.item_count, self.num_items - 2)
+        self.assertEqual(next(self.int_source), self.num_items - 2)
+
+    def test_repeated_backup_wraps_ring(self):
+        '''Stepping back and forward repeatedly across the ring boundary
+        returns items in source order.
+        '''
+        returned = list()
+        while True:
+            try:
+                returned.append(next(self.int_source))
+                returned.append(next(self.int_source))
+            except StopIteration:
+                break
+            self.int_source.backup(1)
+        self.assertListEqual(returned[::2], list(range(self.num_items)))
+
+    def test_skip_drops_items(self):
+        '''Skipped items stored as future items cannot be recovered with
+        backup.
+        '''
+        for i in range(4):
+            next(self.int_source)
+        self.int_source.backup(2)
+        self.int_source.skip(1)
+        self.assertListEqual(list(self.int_source.previous_items), [0, 1])
+        self.assertListEqual(list(self.int_source.future_items), [3])
+        self.assertEqual(next(self.int_source), 3)
+
+
+class TestBufferedIteratorIndexedSource(unittest.TestCase):
+    '''Verify that an IndexedSource removes the buffer_size limits on moving
+    the pointer.
+    '''
+    def setUp(self):
+        self.buffer_size = 3
+        self.num_items = 30
+        self.int_source = BufferedIterator(
+            IndexedSequence(list(range(self.num_items))),
+            buffer_size=self.buffer_size)
+
+    def test_iteration(self):
+        self.assertListEqual(list(self.int_source),
+                             list(range(self.num_items)))
+
+    def test_backup_beyond_buffer(self):
+        for i in range(20):
+            next(self.int_source)
+        self.int_source.backup(15)
+        self.assertEqual(self.int_source.item_count, 5)
+        self.assertListEqual([next(self.int_source) for i in range(4)],
+                             [5, 6, 7, 8])
+
+    def test_goto_item(self):
+        self.int_source.goto_item(25)
+        self.assertEqual(next(self.int_source), 25)
+        self.assertListEqual(list(self.int_source.previous_items),
+                             [23, 24, 25])
+        self.int_source.goto_item(2)
+        self.assertEqual(next(self.int_source), 2)
+        self.assertEqual(self.int_source.item_count, 3)
+
+    def test_look_back_and_ahead(self):
+        self.int_source.goto_item(20)
+        self.assertEqual(self.int_source.look_back(10), 10)
+        self.assertEqual(self.int_source.look_ahead(8), 27)
+        self.assertEqual(self.int_source.item_count, 20)
+        self.assertEqual(next(self.int_source), 20)
+
+    def test_advance_past_end_of_source(self):
+        with self.assertRaises(BufferOverflowWarning):
+            self.int_source.advance(self.num_items + 1)
+        self.assertEqual(self.int_source.item_count, self.num_items)
+        self.int_source.backup(self.num_items)
+        self.assertEqual(next(self.int_source), 0)
+
+    def test_backup_before_start_error(self):
+        next(self.int_source)
+        with self.assertRaises(BufferedIteratorValueError):
+            self.int_source.backup(2)
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,173 @@
+import unittest
+
+from buffered_iterator import BufferedIterator
+from sections import Rule, Section, SectionBreak
+
+
+#%% Test Text
+GENERIC_TEST_TEXT = [
+    'Text to be ignored',
+    'StartSection A',
+    'Title: A1',
+    'Field: 1',
+    'Field: 2',
+    'EndSection A',
+    'Between sections',
+    'StartSection B',
+    'Title: B1',
+    'Field: 3',
+    'Title: B2',
+    'Field: 4',
+    'Field: 5',
+    'EndSection B',
+    'More text to be ignored',
+    ]
+
+
+def make_nested_section()->Section:
+    title = Section(name='Title',
+                    end_section=('Title', 'START', 'Before'),
+                    end_on_first_item=False,
+                    processor=[Rule('Title', pass_method='Original',
+                                    fail_method='None')],
+                    assemble=lambda items: [item for item in items if item])
+    record = Section(name='Record',
+                     start_section=('Title', 'START', 'Before'),
+                     end_section=('Title', 'START', 'Before'),
+                     processor=[title])
+    block = Section(name='Block',
+                    start_section=('StartSection', 'START', 'Before'),
+                    end_section=('EndSection', 'START', 'After'),
+                    processor=[record])
+    return block
+
+
+def make_group_section()->Section:
+    name = Section(name='Name',
+                   end_section=('StartSection', 'START', 'After'))
+    fields = Section(name='Fields',
+                     end_section=('EndSection', 'START', 'Before'),
+                     processor=[lambda item: item.split(': ')],
+                     assemble=lambda items: dict(items))
+    tail = Section(name='Tail', end_section=(True, None, 'After'))
+    group = Section(name='Group',
+                    start_section=('StartSection', 'START', 'Before'),
+                    processor=[(name, fields, tail)])
+    return group
+
+
+class TestCompiledSection(unittest.TestCase):
+    def assert_same_read(self, section: Section, source=GENERIC_TEST_TEXT,
+                         **kwargs):
+        context = {}
+        expected = section.read(source, context=context, **kwargs)
+        expected_index = section.source_index
+        compiled_context = {}
+        result = section.compile().read(source, context=compiled_context,
+                                        **kwargs)
+        self.assertEqual(result, expected)
+        self.assertListEqual(section.source_index, expected_index)
+        self.assertDictEqual(compiled_context, context)
+        return result
+
+    def test_leaf_section(self):
+        section = Section(name='Leaf',
+                          start_section=('StartSection', 'START', 'Before'),
+                          end_section=('EndSection', 'START', 'After'),
+                          processor=[str.upper])
+        result = self.assert_same_read(section)
+        self.assertEqual(result[0], 'STARTSECTION A')
+
+    def test_nested_sections(self):
+        result = self.assert_same_read(make_nested_section())
+        self.assertListEqual(result, [[['Title: A1']]])
+
+    def test_nested_sections_call(self):
+        section = make_nested_section()
+        expected = list(section(GENERIC_TEST_TEXT))
+        result = list(section.compile()(GENERIC_TEST_TEXT))
+        self.assertListEqual(result, expected)
+        self.assertListEqual(result, [[[['Title: A1']]],
+                                      [[['Title: B1']], [['Title: B2']]]])
+
+    def test_section_group(self):
+        self.assert_same_read(make_group_section())
+
+    def test_start_search(self):
+        section = make_group_section()
+        self.assert_same_read(section, start_search=False)
+
+    def test_post_processing(self):
+        record = Section(name='Record',
+                         start_section=('Title', 'START', 'Before'),
+                         end_section=('Title', 'START', 'Before'))
+        block = Section(name='Block',
+                        start_section=('StartSection', 'START', 'Before'),
+                        end_section=('EndSection', 'START', 'After'),
+                        processor=[record, lambda item: len(item)])
+        result = self.assert_same_read(block)
+        self.assertListEqual(result, [4])
+
+    def test_subsection_not_first(self):
+        record = Section(name='Record',
+                         end_section=('Title', 'START', 'Before'))
+        block = Section(name='Block',
+                        start_section=('StartSection', 'START', 'Before'),
+                        end_section=('EndSection', 'START', 'After'),
+                        processor=[str.lower, record])
+        compiled = block.compile()
+        self.assertIsNone(compiled.root.children)
+        self.assert_same_read(block)
+
+    def test_buffered_source(self):
+        section = make_nested_section()
+        source = BufferedIterator(GENERIC_TEST_TEXT)
+        expected = [section.read(source), section.read(source)]
+        expected_next = next(source)
+        compiled = section.compile()
+        source = BufferedIterator(GENERIC_TEST_TEXT)
+        result = [compiled.read(source), compiled.read(source)]
+        self.assertListEqual(result, expected)
+        self.assertEqual(next(source), expected_next)
+
+    def test_source_ends_during_start_search(self):
+        child = Section(name='Child', end_section=('Title', 'START', 'Before'))
+        section = Section(name='Missing',
+                          start_section=('Not present', 'START', 'Before'),
+                          start_search=True,
+                          processor=[(child, child)])
+        expected = list(section(GENERIC_TEST_TEXT))
+        result = list(section.compile()(GENERIC_TEST_TEXT))
+        self.assertListEqual(result, expected)
+
+    def test_context_items(self):
+        section = make_nested_section()
+        context = {}
+        section.compile().read(GENERIC_TEST_TEXT, context=context,
+                               Extra='Value')
+        self.assertEqual(context['Extra'], 'Value')
+        self.assertEqual(context['Current Section'], 'Block')
+
+    def test_subsection_buffer_size_call(self):
+        # Calling the compiled section buffers as many items as the largest
+        # subsection buffer_size, as read does.
+        def make_section()->Section:
+            fired = []
+
+            def end_once(line):
+                if line == 'line 8' and not fired:
+                    fired.append(line)
+                    return True
+                return False
+            child = Section(name='Child',
+                            end_section=SectionBreak(end_once,
+                                                     break_offset=-6))
+            child.buffer_size = 10
+            return Section(name='Parent', processor=[child])
+        text = [f'line {number}' for number in range(12)]
+        expected = list(make_section()(text))
+        self.assertListEqual(list(make_section().compile()(text)), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+import re
+import tempfile
+import unittest
+from pathlib import Path
+
+from buffered_iterator import IndexedSequence
+from sections import BoundaryEvaluator, Section, SectionBreak
+from text_reader import MappedTextFile
+
+
+#%% Test Text
+GENERIC_TEST_TEXT = [
+    'Text to be ignored',
+    'More text with Start in it',
+    'StartSection Name: A',
+    'Field: 1',
+    'EndSection Name: A',
+    'Ignored text ü',
+    'StartSection Name: B',
+    'Field: 2',
+    'EndSection Name: B',
+    ]
+
+
+class CountingFile(MappedTextFile):
+    '''A MappedTextFile that counts the lines read sequentially.'''
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lines_read = 0
+
+    def iter_from(self, item_num=0):
+        for line in super().iter_from(item_num):
+            self.lines_read += 1
+            yield line
+
+
+def write_file(folder, lines, newline='\n'):
+    file_path = Path(folder) / 'test.txt'
+    file_path.write_bytes(newline.join(lines).encode('utf-8'))
+    return file_path
+
+
+class TestSearch(unittest.TestCase):
+    def test_sequence(self):
+        source = IndexedSequence(GENERIC_TEST_TEXT)
+        source.search_block = 4
+        found = list(source.search(re.compile('Start'), 1))
+        self.assertListEqual(found, [1, 2, 6])
+        self.assertListEqual(list(source.search(re.compile('(?!)'))), [])
+
+    def test_mapped_file(self):
+        pattern = re.compile('Start|ü')
+        expected = [1, 2, 5, 6]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for newline in ['\n', '\r\n', '\r']:
+                file_path = write_file(temp_dir, GENERIC_TEST_TEXT, newline)
+                with MappedTextFile(file_path) as source:
+                    for search_bytes in [2**20, 40, 1]:
+                        with self.subTest(newline=newline,
+                                          search_bytes=search_bytes):
+                            source.search_bytes = search_bytes
+                            self.assertListEqual(
+                                list(source.search(pattern)), expected)
+                            self.assertListEqual(
+                                list(source.search(pattern, 3)), [5, 6])
+
+
+class TestBlockPattern(unittest.TestCase):
+    def test_combined(self):
+        evaluator = BoundaryEvaluator([
+            SectionBreak('Start', 'START'),
+            SectionBreak(re.compile('name: b', re.I), 'IN'),
+            SectionBreak(False)])
+        self.assertIsNotNone(evaluator.block_pattern)
+
+    def test_not_searchable(self):
+        for sentinel in [lambda line: True, True, re.compile('^Start'),
+                         re.compile('(Start)'), re.compile(r'(?<=x)Start')]:
+            with self.subTest(sentinel=sentinel):
+                evaluator = BoundaryEvaluator([SectionBreak('End'),
+                                               SectionBreak(sentinel)])
+                self.assertIsNone(evaluator.block_pattern)
+
+
+class TestFastForward(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        filler = [f'Filler line {idx}' for idx in range(2000)]
+        lines = filler + GENERIC_TEST_TEXT + filler
+        self.file_path = write_file(self.temp_dir.name, lines + [''])
+        # The lines read from the file include the line endings.
+        self.lines = [line + '\n' for line in lines]
+
+    def compare(self, start_section, keep_skipped='All', lines_limit=None):
+        def make_section():
+            return Section(name='Block', start_section=start_section,
+                           end_section=('EndSection', 'START', 'After'),
+                           keep_skipped=keep_skipped)
+        section = make_section()
+        expected = section.read(self.lines)
+        expected_skipped = section.context['Skipped Lines']
+        for compile_section in [False, True]:
+            with self.subTest(compiled=compile_section):
+                section = make_section()
+                reader = section.compile() if compile_section else section
+                with CountingFile(self.file_path) as source:
+                    result = reader.read(source)
+                self.assertListEqual(result, expected)
+                skipped = section.context['Skipped Lines']
+                if not isinstance(skipped, list):
+                    # Byte offsets are not available for a list.
+                    skipped = skipped[:3]
+                    expected_skipped = expected_skipped[:3]
+                self.assertEqual(skipped, expected_skipped)
+                if lines_limit is not None:
+                    self.assertLess(source.lines_read, lines_limit)
+
+    def test_string(self):
+        self.compare(('StartSection', 'START', 'Before'), 'None',
+                     lines_limit=100)
+
+    def test_regex(self):
+        self.compare((re.compile(r'name: \w$', re.I), 'IN', 'Before'),
+                     'None')
+        self.compare((re.compile(r'section name', re.I), 'IN', 'Before'),
+                     'None', lines_limit=100)
+
+    def test_locations(self):
+        for location in ['IN', 'END', 'FULL']:
+            with self.subTest(location=location):
+                sentinel = 'StartSection Name: A\n' if location == 'FULL' \
+                    else 'Name: A\n'
+                self.compare((sentinel, location, 'Before'), 'None',
+                             lines_limit=100)
+
+    def test_offsets(self):
+        self.compare(('More text', 'START', 'After'), 'None')
+        self.compare(('More text', 'START', 1), 'None')
+        self.compare([SectionBreak('Field', 'START', 2),
+                      SectionBreak('StartSection', 'START')], 'None')
+
+    def test_keep_skipped(self):
+        for keep_skipped in ['All', 3, 'Count']:
+            with self.subTest(keep_skipped=keep_skipped):
+                self.compare(('StartSection', 'START', 'Before'),
+                             keep_skipped)
+
+    def test_function_fallback(self):
+        self.compare((lambda line: line.startswith('StartSection'), None,
+                      'Before'), 'None')
+
+    def test_not_found(self):
+        self.compare(('Missing', 'START', 'Before'), 'Count', lines_limit=100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,9 +2,10 @@
 import unittest
 from itertools import chain
 import re
+import numpy as np
 import pandas as pd
 import text_reader as tp
-from sections import Rule, RuleSet, ProcessingMethods
+from sections import Rule, RuleSet, ProcessingMethods, Section, batch_func
 
 # %% old DVH Functions
 def make_prescribed_dose_rule() -> Rule:
@@ -131,6 +132,52 @@ class TestProcessingMethods(unittest.TestCase):
         test_output = method_set.read(source, {})
         self.assertListEqual(test_output, [0.0, 4.0, 8.0])
 
+    def test_batch_function_chunks(self):
+        chunks = []
+        @batch_func
+        def ml(num_list):
+            chunks.append(len(num_list))
+            return [x*10 for x in num_list]
+
+        method_set = ProcessingMethods([ml], chunk_size=4)
+        test_output = method_set.read(range(10), {})
+        self.assertListEqual(test_output, [x*10 for x in range(10)])
+        self.assertListEqual(chunks, [4, 4, 2])
+
+    def test_batch_function_chunk_size(self):
+        chunks = []
+        @batch_func(chunk_size=3)
+        def ml(num_list, context):
+            chunks.append(len(num_list))
+            context['Chunks'] = len(chunks)
+            for x in num_list:
+                yield x*10
+
+        context = {}
+        method_set = ProcessingMethods([ml], chunk_size=4)
+        test_output = method_set.read(range(7), context)
+        self.assertListEqual(test_output, [x*10 for x in range(7)])
+        self.assertListEqual(chunks, [3, 3, 1])
+        self.assertEqual(context['Chunks'], 3)
+
+    def test_batch_function_section_boundaries(self):
+        chunks = []
+        @batch_func
+        def upper(lines):
+            chunks.append(list(lines))
+            return [line.upper() for line in lines]
+
+        source = ['a', 'b', 'End', 'c', 'd', 'e', 'End', 'f']
+        section = Section(end_section=('End', 'START', 'After'),
+                          processor=[upper])
+        test_output = list(section(source))
+        self.assertListEqual(test_output, [['A', 'B', 'END'],
+                                           ['C', 'D', 'E', 'END'],
+                                           ['F']])
+        self.assertListEqual(chunks, [['a', 'b', 'End'],
+                                      ['c', 'd', 'e', 'End'],
+                                      ['f']])
+
 
 class TestParsers(unittest.TestCase):
     def test_csv_parser(self):
@@ -203,6 +250,27 @@ class TestParsers(unittest.TestCase):
         test_output = [row for row in chain.from_iterable(test_iter)]
         self.assertListEqual(test_output, expected_output)
 
+    def test_block_csv_parser(self):
+        test_text = [
+            'Patient Name:     ____, ____',
+            'Prescribed dose [cGy]: 5000.0',
+            '',
+            '% for dose (%): 100.0 '
+            ]
+        expected_output = [
+            ['Patient Name', '____, ____'],
+            ['Prescribed dose [cGy]', 5000.0],
+            [],
+            ['% for dose (%)', 100.0],
+            ]
+        test_parser = tp.define_csv_parser('dvh_info', delimiter=':',
+                                           skipinitialspace=True, block=True)
+        method_set = ProcessingMethods([test_parser, tp.trim_items_block,
+                                        tp.convert_numbers_block],
+                                       chunk_size=3)
+        test_output = method_set.read(test_text)
+        self.assertListEqual(test_output, expected_output)
+
 
 class TestParseRules(unittest.TestCase):
     def test_parse_prescribed_dose_rule(self):
@@ -384,5 +452,52 @@ class TestDataFrameOutput(unittest.TestCase):
         output = tp.to_dataframe(test_text, header=True)
         self.assertDictEqual(output.to_dict(), expected_output.to_dict())
 
+
+class TestNumericBlockParser(unittest.TestCase):
+    def test_whitespace_block(self):
+        test_text = [
+            '         0                       100',
+            '',
+            '         1             4.23876e-005',
+            '      3670               1.4257e-006',
+            ]
+        expected_output = np.array([[0, 100],
+                                    [1, 4.23876e-005],
+                                    [3670, 1.4257e-006]])
+        parser = tp.NumericBlockParser()
+        output = parser(test_text)
+        self.assertEqual(output.dtype, np.float64)
+        np.testing.assert_array_equal(output, expected_output)
+
+    def test_columns_and_missing_values(self):
+        test_text = ['1,2,extra', 'N/A,5,', '7,-,9']
+        parser = tp.NumericBlockParser(columns=2, delimiter=',',
+                                       missing_values=['N/A', '-'])
+        output = parser(test_text)
+        np.testing.assert_array_equal(output, np.array([[1, 2],
+                                                        [np.nan, 5],
+                                                        [7, np.nan]]))
+
+    def test_invalid_value(self):
+        parser = tp.NumericBlockParser()
+        with self.assertRaises(ValueError):
+            parser(['1 2', '3 N/A'])
+
+    def test_empty_block(self):
+        parser = tp.NumericBlockParser(columns=3, dtype=int)
+        output = parser(['', '  '])
+        self.assertTupleEqual(output.shape, (0, 3))
+        self.assertEqual(output.dtype, np.dtype(int))
+
+    def test_section_assemble(self):
+        test_text = ['Dose Volume', '0 100', '1 99.5', 'Structure: PTV']
+        section = Section(start_section=('Dose', 'START', 'After'),
+                          end_section=('Structure:', 'START', 'Before'),
+                          assemble=tp.NumericBlockParser())
+        output = section.read(test_text)
+        np.testing.assert_array_equal(output, np.array([[0, 100],
+                                                        [1, 99.5]]))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,104 @@
+import re
+import codecs
+import unittest
+import tempfile
+from pathlib import Path
+
+import text_reader as tp
+from sections import Section
+
+
+#%% Test Text
+TEST_BYTES = b''.join([
+    b'Header line\n',
+    b'StartSection A\r\n',
+    b'Value: 1\r',
+    b'Value: 2\n',
+    b'\n',
+    'Unit: cm³\n'.encode('utf-8'),
+    b'EndSection A\n',
+    b'Last line without line ending',
+    ])
+
+
+class TestMappedTextFile(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = Path(self.temp_dir.name) / 'test.txt'
+        self.file_path.write_bytes(TEST_BYTES)
+        self.mapped_file = tp.MappedTextFile(self.file_path)
+
+    def tearDown(self):
+        self.mapped_file.close()
+        self.temp_dir.cleanup()
+
+    def test_lines_match_file_reader(self):
+        expected = list(tp.file_reader(self.file_path))
+        self.assertListEqual(list(self.mapped_file), expected)
+        self.assertEqual(len(self.mapped_file), len(expected))
+
+    def test_random_access(self):
+        self.assertEqual(self.mapped_file[2], 'Value: 1\r')
+        self.assertEqual(self.mapped_file[5], 'Unit: cm³\n')
+        self.assertEqual(self.mapped_file[-1], 'Last line without line ending')
+        with self.assertRaises(IndexError):
+            self.mapped_file[len(self.mapped_file)]
+
+    def test_iter_from(self):
+        self.assertListEqual(list(self.mapped_file.iter_from(6)),
+                             ['EndSection A\n',
+                              'Last line without line ending'])
+
+    def test_small_blocks(self):
+        self.mapped_file.block_lines = 3
+        expected = list(tp.file_reader(self.file_path))
+        self.assertListEqual(list(self.mapped_file.iter_from(1)),
+                             expected[1:])
+
+    def test_empty_file(self):
+        empty_path = Path(self.temp_dir.name) / 'empty.txt'
+        empty_path.write_bytes(b'')
+        with tp.MappedTextFile(empty_path) as mapped_file:
+            self.assertEqual(len(mapped_file), 0)
+            self.assertListEqual(list(mapped_file), [])
+
+    def test_encoding_check(self):
+        with self.assertRaises(ValueError):
+            tp.MappedTextFile(self.file_path, encoding='utf-16')
+
+    def test_byte_order_mark(self):
+        bom_path = Path(self.temp_dir.name) / 'bom.txt'
+        bom_path.write_bytes(codecs.BOM_UTF8 + TEST_BYTES)
+        with open(bom_path, encoding='utf_8_sig', newline='') as text_file:
+            expected = list(text_file)
+        with tp.MappedTextFile(bom_path, encoding='utf_8_sig') as mapped_file:
+            self.assertListEqual(list(mapped_file), expected)
+            self.assertEqual(mapped_file[0], 'Header line\n')
+            self.assertListEqual(list(mapped_file.search(re.compile('Head'))),
+                                 [0])
+        # Only the byte order mark is skipped.
+        bom_path.write_bytes(codecs.BOM_UTF8)
+        with tp.MappedTextFile(bom_path, encoding='utf_8_sig') as mapped_file:
+            self.assertEqual(len(mapped_file), 0)
+        with tp.MappedTextFile(self.file_path,
+                               encoding='utf_8_sig') as mapped_file:
+            self.assertListEqual(list(mapped_file), list(self.mapped_file))
+
+    def test_file_reader_goto_item(self):
+        source = tp.file_reader(self.file_path, memory_map=True)
+        source.goto_item(6)
+        self.assertEqual(next(source), 'EndSection A\n')
+        source.goto_item(0)
+        self.assertEqual(next(source), 'Header line\n')
+
+    def test_section_read(self):
+        section = Section(start_section=('StartSection', 'START', 'Before'),
+                          end_section=('EndSection', 'START', 'After'),
+                          processor=[str.strip])
+        self.assertListEqual(section.read(self.mapped_file),
+                             ['StartSection A', 'Value: 1', 'Value: 2', '',
+                              'Unit: cm³', 'EndSection A'])
+
+
+if __name__ == '__main__':
+    unittest.main()
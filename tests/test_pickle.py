@@ -0,0 +1,115 @@
+import pickle
+import re
+import unittest
+
+from sections import Rule, RuleSet, Section, SectionBreak, Trigger
+
+
+#%% Test Text
+GENERIC_TEST_TEXT = [
+    'Text to be ignored',
+    'StartSection Name: A',
+    'Title: A1',
+    'Field: 1',
+    'EndSection Name: A',
+    'StartSection Name: B',
+    'Title: B1',
+    'Field: 2',
+    'EndSection Name: B',
+    'More text to be ignored',
+    ]
+
+
+def split_field(line: str, event):
+    return [part.strip() for part in line.split(':', maxsplit=1)]
+
+
+def is_title(line, context):
+    return line.startswith('Title')
+
+
+def round_trip(obj):
+    return pickle.loads(pickle.dumps(obj))
+
+
+def make_section()->Section:
+    field_rules = RuleSet([Rule('Title', location='START',
+                                pass_method=split_field),
+                           Rule(re.compile(r'^Field'),
+                                pass_method='Original')],
+                          default='None')
+    record = Section(name='Record',
+                     start_section=SectionBreak(is_title),
+                     end_section=('Field', 'START', 'After'),
+                     processor=[field_rules],
+                     assemble=lambda items: dict(items[:1]))
+    name = Section(name='Name',
+                   end_section=('StartSection', 'START', 'After'),
+                   processor=['Original'])
+    block = Section(name='Block',
+                    start_section=('StartSection', 'START', 'Before'),
+                    end_section=('EndSection', 'START', 'After'),
+                    processor=[(name, record)])
+    return block
+
+
+def make_picklable_section()->Section:
+    record = Section(name='Record',
+                     start_section=SectionBreak(is_title),
+                     end_section=('Field', 'START', 'After'),
+                     processor=[Rule('Title', pass_method=split_field,
+                                     fail_method='Original')])
+    block = Section(name='Block',
+                    start_section=('StartSection', 'START', 'Before'),
+                    end_section=('EndSection', 'START', 'After'),
+                    processor=[record])
+    return block
+
+
+class TestPickleTriggers(unittest.TestCase):
+    def test_trigger_types(self):
+        for sentinel in ['Title', ['Title', 'Field'], re.compile('Fi(eld)'),
+                         is_title, True]:
+            with self.subTest(sentinel=sentinel):
+                trigger = round_trip(Trigger(sentinel))
+                self.assertEqual(trigger.evaluate('Field: 1', {}),
+                                 Trigger(sentinel).evaluate('Field: 1', {}))
+
+    def test_rule(self):
+        rule = round_trip(Rule('Title', location='START',
+                               pass_method=split_field, fail_method='None'))
+        self.assertListEqual(rule.apply('Title: A1'), ['Title', 'A1'])
+        self.assertIsNone(rule.apply('Field: 1'))
+
+    def test_rule_set(self):
+        rule_set = round_trip(RuleSet([Rule('Title', pass_method='Value'),
+                                       Rule('Field', pass_method='Name')],
+                                      default='Blank'))
+        self.assertEqual(rule_set.apply('Title: A1'), 'Title')
+        self.assertEqual(rule_set.apply('Other'), '')
+
+
+class TestPickleSection(unittest.TestCase):
+    def test_section_tree(self):
+        section = make_picklable_section()
+        expected = list(section(GENERIC_TEST_TEXT))
+        copied = round_trip(section)
+        self.assertListEqual(list(copied(GENERIC_TEST_TEXT)), expected)
+
+    def test_section_after_read(self):
+        section = make_picklable_section()
+        section.read(iter(GENERIC_TEST_TEXT))
+        copied = round_trip(section)
+        self.assertIsNone(copied.source)
+        self.assertEqual(copied.scan_status, 'Not Started')
+        self.assertListEqual(copied.read(GENERIC_TEST_TEXT),
+                             make_picklable_section().read(GENERIC_TEST_TEXT))
+
+    def test_unpicklable_user_function(self):
+        # Lambdas supplied by the user still prevent pickling.
+        with self.assertRaises((pickle.PicklingError, AttributeError)):
+            pickle.dumps(make_section())
+
+
+if __name__ == '__main__':
+    unittest.main()
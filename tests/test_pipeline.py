@@ -0,0 +1,100 @@
+import threading
+import time
+import unittest
+
+from sections import Section, pipeline_read
+
+
+#%% Test Text
+GENERIC_TEST_TEXT = [f'Record {i}' for i in range(20)]
+
+
+def make_section()->Section:
+    return Section(name='Record',
+                   start_section=('Record', 'START', 'Before'),
+                   end_section=('Record', 'START', 'Before'))
+
+
+def pipeline_threads():
+    return [thread for thread in threading.enumerate()
+            if thread.name.startswith('Pipeline') and thread.is_alive()]
+
+
+class TestPipelineRead(unittest.TestCase):
+    def test_ordered(self):
+        expected = list(make_section()(GENERIC_TEST_TEXT))
+        def slow_sink(item):
+            # Later items finish first.
+            time.sleep(0.001 * (20 - int(item[0].split()[1])))
+            return item
+        results = list(pipeline_read(make_section(), GENERIC_TEST_TEXT,
+                                     slow_sink, workers=4))
+        self.assertListEqual(results, expected)
+        self.assertListEqual(pipeline_threads(), [])
+
+    def test_unordered(self):
+        expected = list(make_section()(GENERIC_TEST_TEXT))
+        results = list(pipeline_read(make_section(), GENERIC_TEST_TEXT,
+                                     lambda item: item, workers=3,
+                                     ordered=False))
+        self.assertCountEqual(results, expected)
+
+    def test_compiled(self):
+        expected = list(make_section()(GENERIC_TEST_TEXT))
+        results = list(pipeline_read(make_section().compile(),
+                                     GENERIC_TEST_TEXT, lambda item: item))
+        self.assertListEqual(results, expected)
+
+    def test_backpressure(self):
+        parsed = []
+        def record(line):
+            parsed.append(line)
+            return line
+        section = Section(start_section=('Record', 'START', 'Before'),
+                          end_section=('Record', 'START', 'Before'),
+                          processor=[record])
+        results = pipeline_read(section, GENERIC_TEST_TEXT,
+                                lambda item: item, max_pending=2)
+        next(results)
+        time.sleep(0.1)
+        # One item yielded, two pending and one being assembled.
+        self.assertLessEqual(len(parsed), 5)
+        results.close()
+        self.assertListEqual(pipeline_threads(), [])
+
+    def test_sink_error(self):
+        def failing_sink(item):
+            if item == ['Record 3']:
+                raise IOError('Write failed')
+            return item
+        results = []
+        with self.assertRaises(IOError):
+            for result in pipeline_read(make_section(), GENERIC_TEST_TEXT,
+                                        failing_sink, workers=2):
+                results.append(result)
+        self.assertListEqual(results, [['Record 0'], ['Record 1'],
+                                       ['Record 2']])
+        self.assertListEqual(pipeline_threads(), [])
+
+    def test_parse_error(self):
+        def fail(line):
+            if line == 'Record 5':
+                raise ValueError('Bad line')
+            return line
+        section = Section(start_section=('Record', 'START', 'Before'),
+                          end_section=('Record', 'START', 'Before'),
+                          processor=[fail])
+        results = []
+        with self.assertRaises(ValueError):
+            for result in pipeline_read(section, GENERIC_TEST_TEXT,
+                                        lambda item: item):
+                results.append(result)
+        self.assertEqual(len(results), 5)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            next(pipeline_read(make_section(), [], print, workers=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from buffered_iterator import BufferedIterator, PrefetchSource
+from sections import Section
+import text_reader as tp
+
+
+#%% Test Text
+GENERIC_TEST_TEXT = ''.join(f'Line {i}\n' for i in range(1000))
+
+
+def prefetch_threads():
+    return [thread for thread in threading.enumerate()
+            if thread.name == 'PrefetchSource' and thread.is_alive()]
+
+
+def wait_for_threads(timeout=2.0):
+    end = time.monotonic() + timeout
+    while prefetch_threads() and time.monotonic() < end:
+        time.sleep(0.01)
+    return prefetch_threads()
+
+
+def failing_blocks():
+    yield ['a', 'b']
+    raise OSError('Read failed')
+
+
+class TestPrefetchSource(unittest.TestCase):
+    def test_items(self):
+        blocks = [[1, 2], [], [3], [4, 5, 6]]
+        source = PrefetchSource(blocks, queue_depth=1)
+        self.assertListEqual(list(source), [1, 2, 3, 4, 5, 6])
+        self.assertTrue(source.closed)
+        self.assertListEqual(wait_for_threads(), [])
+
+    def test_error_raised(self):
+        source = PrefetchSource(failing_blocks())
+        items = []
+        with self.assertRaises(OSError):
+            for item in source:
+                items.append(item)
+        self.assertListEqual(items, ['a', 'b'])
+
+    def test_close_early(self):
+        # An endless source is stopped while the queue is full.
+        blocks = iter(lambda: ['x'] * 10, None)
+        with PrefetchSource(blocks, queue_depth=2) as source:
+            self.assertEqual(next(iter(source)), 'x')
+        self.assertListEqual(wait_for_threads(), [])
+
+    def test_iterate_after_close(self):
+        source = PrefetchSource([[1, 2], [3]])
+        source.close()
+        self.assertListEqual(list(source), [])
+
+    def test_buffered_iterator_close(self):
+        source = BufferedIterator(PrefetchSource(iter(lambda: [0], None)))
+        next(source)
+        source.close()
+        self.assertListEqual(wait_for_threads(), [])
+
+
+class TestPrefetchTextFile(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = Path(self.temp_dir.name) / 'test.txt'
+        self.file_path.write_text(GENERIC_TEST_TEXT + 'Last\r\nNo end',
+                                  encoding='utf-8', newline='')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_lines_match_file_reader(self):
+        expected = list(tp.file_reader(self.file_path))
+        source = tp.file_reader(self.file_path, prefetch=True, block_size=64,
+                                queue_depth=2)
+        self.assertListEqual(list(source), expected)
+
+    def test_section_stops_early(self):
+        section = Section(end_section=('Line 3', 'START', 'Before'))
+        source = tp.PrefetchTextFile(self.file_path, block_size=64,
+                                     queue_depth=1)
+        self.assertListEqual(section.read(source),
+                             ['Line 0\n', 'Line 1\n', 'Line 2\n'])
+        self.assertTrue(source.closed)
+        self.assertListEqual(wait_for_threads(), [])
+
+    def test_shared_source_continues(self):
+        source = tp.file_reader(self.file_path, prefetch=True, block_size=64)
+        section = Section(end_section=('Line 3', 'START', 'Before'))
+        section.read(source)
+        self.assertEqual(next(source), 'Line 3\n')
+        source.close()
+        self.assertListEqual(wait_for_threads(), [])
+
+    def test_section_error(self):
+        def fail(line):
+            if line.startswith('Line 5'):
+                raise ValueError('Bad line')
+            return line
+        for section in [Section(processor=[fail]),
+                        Section(processor=[fail]).compile()]:
+            with self.subTest(section=section):
+                source = tp.file_reader(self.file_path, prefetch=True,
+                                        block_size=64, queue_depth=1)
+                with self.assertRaises(ValueError):
+                    section.read(source)
+                self.assertTrue(source.prefetch_source.closed)
+        self.assertListEqual(wait_for_threads(), [])
+
+    def test_memory_map_conflict(self):
+        with self.assertRaises(ValueError):
+            tp.file_reader(self.file_path, memory_map=True, prefetch=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
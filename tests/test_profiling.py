@@ -0,0 +1,122 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import tracing
+from profiling import Profiler, profile
+from sections import Rule, Section, SectionBreak
+
+
+#%% Test Text
+GENERIC_TEST_TEXT = [
+    'Text to be ignored',
+    'StartSection Name: A',
+    'Title: A1',
+    'Field: 1',
+    'EndSection Name: A',
+    'StartSection Name: B',
+    'Title: B1',
+    'Field: 2',
+    'EndSection Name: B',
+    'More text to be ignored',
+    ]
+
+
+def make_section()->Section:
+    title = Section(name='Title',
+                    processor=[Rule('Title', pass_method='Original',
+                                    fail_method='Original',
+                                    name='Title Rule'),
+                               str.lower])
+    block = Section(name='Block',
+                    start_section=('StartSection', 'START', 'Before'),
+                    end_section=('EndSection', 'START', 'After'),
+                    processor=[title])
+    return block
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.section = make_section()
+
+    def test_profile_restores_hook(self):
+        with profile() as profiler:
+            self.assertIs(tracing.trace_hook, profiler)
+        self.assertIsNone(tracing.trace_hook)
+
+    def test_result_unchanged(self):
+        expected = make_section().read(GENERIC_TEST_TEXT)
+        with profile():
+            result = self.section.read(GENERIC_TEST_TEXT)
+        self.assertListEqual(result, expected)
+
+    def test_section_counters(self):
+        with profile() as profiler:
+            self.section.read(GENERIC_TEST_TEXT)
+        block = profiler.sections['Block']
+        self.assertEqual(block['Reads'], 1)
+        self.assertEqual(block['Items Skipped'], 1)
+        self.assertEqual(block['Breaks Fired'], 2)
+        self.assertEqual(block['Stages']['Scan']['Items'], 4)
+        self.assertEqual(block['Stages']['Title']['Index'], 0)
+        title = profiler.sections['Title']
+        self.assertDictEqual(title['Triggers']['Title Rule'],
+                             {'Evaluations': 4, 'Hits': 1})
+        self.assertListEqual(list(title['Stages']),
+                             ['Scan', 'Title Rule', 'lower'])
+        self.assertEqual(title['Assemble']['Items'], 4)
+        for stage in title['Stages'].values():
+            self.assertGreaterEqual(stage['Wall Time'], 0)
+            self.assertGreaterEqual(stage['CPU Time'], 0)
+
+    def test_compiled_read(self):
+        with profile() as profiler:
+            self.section.compile().read(GENERIC_TEST_TEXT)
+        block = profiler.sections['Block']
+        self.assertEqual(block['Items Skipped'], 1)
+        self.assertEqual(block['Breaks Fired'], 2)
+        title = profiler.sections['Title']
+        self.assertEqual(title['Triggers']['Title Rule']['Hits'], 1)
+
+    def test_break_counters(self):
+        # Start and end breaks without names of their own are counted
+        # separately.
+        expected = {"Start 0: 'StartSection'": {'Evaluations': 2, 'Hits': 1},
+                    "End 0: 'EndSection'": {'Evaluations': 3, 'Hits': 1}}
+        for reader in [self.section, self.section.compile()]:
+            with self.subTest(reader=type(reader).__name__):
+                with profile() as profiler:
+                    reader.read(GENERIC_TEST_TEXT)
+                self.assertDictEqual(
+                    profiler.sections['Block']['Triggers'], expected)
+        section = Section(name='Named', end_section=SectionBreak(
+            'EndSection', 'START', 'After', name='Block End'))
+        with profile() as profiler:
+            section.read(GENERIC_TEST_TEXT)
+        self.assertListEqual(list(profiler.sections['Named']['Triggers']),
+                             ['Block End'])
+
+    def test_nested_report(self):
+        with profile() as profiler:
+            self.section.read(GENERIC_TEST_TEXT)
+        report = profiler.report(self.section)
+        self.assertEqual(report['Name'], 'Block')
+        self.assertListEqual([sub['Name'] for sub in report['Subsections']],
+                             ['Title'])
+        self.assertListEqual(report['Subsections'][0]['Subsections'], [])
+
+    def test_json_export(self):
+        profiler = Profiler()
+        with profile(profiler):
+            self.section.read(GENERIC_TEST_TEXT)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = Path(temp_dir) / 'profile.json'
+            profiler.save(file_path, self.section)
+            saved = json.loads(file_path.read_text())
+        self.assertEqual(saved['Subsections'][0]['Name'], 'Title')
+        self.assertIn('Block', json.loads(profiler.to_json()))
+
+
+if __name__ == '__main__':
+    unittest.main()
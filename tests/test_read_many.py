@@ -0,0 +1,105 @@
+import multiprocessing
+import tempfile
+import unittest
+from pathlib import Path
+
+from sections import Section, read_many
+
+
+#%% Test Text
+GENERIC_TEST_TEXT = [
+    'Text to be ignored',
+    'StartSection Name: A',
+    'Field: 1',
+    'EndSection Name: A',
+    'More text to be ignored',
+    ]
+
+
+def make_section()->Section:
+    return Section(name='Block',
+                   start_section=('StartSection', 'START', 'Before'),
+                   end_section=('EndSection', 'START', 'After'),
+                   processor=[str.upper])
+
+
+def failing_opener(file_path: Path):
+    if 'bad' in Path(file_path).name:
+        raise ValueError(f'Cannot read {file_path}')
+    return Path(file_path).read_text().splitlines()
+
+
+class TestReadMany(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        folder = Path(self.temp_dir.name)
+        self.paths = list()
+        for idx in range(6):
+            file_path = folder / f'file_{idx}.txt'
+            text = [line.replace('A', str(idx)) for line in GENERIC_TEST_TEXT]
+            file_path.write_text('\n'.join(text))
+            self.paths.append(file_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def expected(self, idx):
+        return [line.replace('A', str(idx)).upper()
+                for line in GENERIC_TEST_TEXT[1:4]]
+
+    def test_ordered_results(self):
+        results = list(read_many(make_section(), self.paths, workers=2))
+        self.assertListEqual([result.path for result in results], self.paths)
+        for idx, file_result in enumerate(results):
+            self.assertTrue(file_result.ok)
+            self.assertListEqual(file_result.result, self.expected(idx))
+
+    def test_completion_order(self):
+        results = list(read_many(make_section(), self.paths, workers=2,
+                                 ordered=False))
+        self.assertSetEqual({result.path for result in results},
+                            set(self.paths))
+        self.assertTrue(all(result.ok for result in results))
+
+    def test_section_factory(self):
+        results = list(read_many(make_section, self.paths[:2], workers=1))
+        self.assertListEqual(results[1].result, self.expected(1))
+
+    def test_spawned_workers(self):
+        # Spawned workers receive a pickled copy of the section.
+        results = list(read_many(make_section(), self.paths[:2], workers=1,
+                                 mp_context=multiprocessing.get_context(
+                                     'spawn')))
+        self.assertTrue(all(result.ok for result in results))
+        self.assertListEqual(results[1].result, self.expected(1))
+
+    def test_sequential(self):
+        parallel = [file_result.result for file_result in
+                    read_many(make_section(), self.paths, workers=2)]
+        sequential = [file_result.result for file_result in
+                      read_many(make_section(), self.paths, workers=0)]
+        self.assertListEqual(parallel, sequential)
+
+    def test_errors_captured(self):
+        bad_path = Path(self.temp_dir.name) / 'bad_file.txt'
+        bad_path.write_text('')
+        paths = [self.paths[0], bad_path, self.paths[1]]
+        results = list(read_many(make_section(), paths, workers=2,
+                                 opener=failing_opener))
+        self.assertListEqual([result.ok for result in results],
+                             [True, False, True])
+        self.assertIsInstance(results[1].error, ValueError)
+        self.assertIn('Cannot read', results[1].traceback)
+        self.assertListEqual(results[2].result, self.expected(1))
+
+    def test_context_copied(self):
+        context = {'Source': 'Test'}
+        results = list(read_many(make_section(), self.paths[:2], workers=0,
+                                 context=context))
+        self.assertEqual(results[0].context['Source'], 'Test')
+        self.assertIsNot(results[0].context, results[1].context)
+        self.assertDictEqual(context, {'Source': 'Test'})
+
+
+if __name__ == '__main__':
+    unittest.main()
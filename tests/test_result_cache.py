@@ -0,0 +1,195 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from sections import ProcessingMethods, Rule, RuleSet, Section
+from result_cache import ResultCache
+from section_index import section_fingerprint
+
+
+#%% Test Text
+GENERIC_TEST_TEXT = [
+    'Text to be ignored',
+    'StartSection Name: A',
+    'Field: 1',
+    'EndSection Name: A',
+    'StartSection Name: B',
+    'Field: 2',
+    'EndSection Name: B',
+    'More text to be ignored',
+    ]
+
+
+# Referenced by name, so the calls recorded are not part of the fingerprint.
+CALLS = []
+
+
+def counting_upper(line: str)->str:
+    CALLS.append(line)
+    return line.upper()
+
+
+def make_section(processor=None, end_text='EndSection')->Section:
+    block = Section(name='Block',
+                    start_section=('StartSection', 'START', 'Before'),
+                    end_section=(end_text, 'START', 'After'),
+                    processor=processor)
+    return Section(name='All', processor=[block])
+
+
+def split_field(line: str)->list:
+    return line.split(':')
+
+
+class TestFingerprint(unittest.TestCase):
+    def test_stable(self):
+        self.assertEqual(section_fingerprint(make_section()),
+                         section_fingerprint(make_section()))
+
+    def test_break_change(self):
+        self.assertNotEqual(section_fingerprint(make_section()),
+                            section_fingerprint(make_section(end_text='End')))
+
+    def test_processor_change(self):
+        rule = Rule('Field', pass_method=split_field)
+        other_rule = Rule('Field', pass_method='Blank')
+        self.assertEqual(section_fingerprint(make_section([rule])),
+                         section_fingerprint(make_section([rule])))
+        self.assertNotEqual(section_fingerprint(make_section([rule])),
+                            section_fingerprint(make_section([other_rule])))
+        rule_set = RuleSet([rule], default='None')
+        self.assertNotEqual(section_fingerprint(make_section([rule])),
+                            section_fingerprint(make_section([rule_set])))
+
+    def test_function_change(self):
+        # Functions with the same name but different code differ.
+        self.assertNotEqual(section_fingerprint(make_section([str.upper])),
+                            section_fingerprint(make_section([str.lower])))
+        first = section_fingerprint(make_section([lambda line: line]))
+        second = section_fingerprint(make_section([lambda line: line * 2]))
+        self.assertNotEqual(first, second)
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cache_dir = Path(self.temp_dir.name) / 'cache'
+        self.file_path = Path(self.temp_dir.name) / 'test.txt'
+        self.file_path.write_text('\n'.join(GENERIC_TEST_TEXT) + '\n')
+
+    def test_hit_skips_parsing(self):
+        cache = ResultCache(self.cache_dir)
+        CALLS.clear()
+        section = make_section([counting_upper])
+        expected = make_section([str.upper]).read(self.file_path.read_text(
+            ).splitlines())
+        self.assertListEqual(cache.read(section, self.file_path), expected)
+        call_count = len(CALLS)
+        self.assertGreater(call_count, 0)
+        self.assertListEqual(section.read_cached(self.file_path, cache),
+                             expected)
+        self.assertEqual(len(CALLS), call_count)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_hit_across_instances(self):
+        ResultCache(self.cache_dir).read(make_section(), self.file_path)
+        cache = ResultCache(self.cache_dir)
+        cache.read(make_section(), self.file_path)
+        self.assertEqual(cache.hits, 1)
+
+    def test_file_change(self):
+        cache = ResultCache(self.cache_dir)
+        section = make_section()
+        first = cache.read(section, self.file_path)
+        self.file_path.write_text('\n'.join(GENERIC_TEST_TEXT[:4]) + '\n')
+        second = cache.read(section, self.file_path)
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+
+    def test_definition_change(self):
+        cache = ResultCache(self.cache_dir)
+        cache.read(make_section(), self.file_path)
+        cache.read(make_section(end_text='EndSection Name: B'),
+                   self.file_path)
+        cache.read(make_section([str.upper]), self.file_path)
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+
+    def test_section_changed_between_reads(self):
+        cache = ResultCache(self.cache_dir)
+        block = Section(name='Block',
+                        start_section=('StartSection', 'START', 'Before'),
+                        end_section=('EndSection', 'START', 'After'))
+        section = Section(name='All', processor=[block])
+        cache.read(section, GENERIC_TEST_TEXT)
+        block.processor = ProcessingMethods([str.upper])
+        result = cache.read(section, GENERIC_TEST_TEXT)
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+        self.assertListEqual(result,
+                             make_section([str.upper]).read(GENERIC_TEST_TEXT))
+
+    def test_sequence_source(self):
+        cache = ResultCache(self.cache_dir)
+        section = make_section()
+        expected = section.read(GENERIC_TEST_TEXT)
+        self.assertListEqual(cache.read(section, GENERIC_TEST_TEXT), expected)
+        self.assertListEqual(cache.read(section, iter(GENERIC_TEST_TEXT)),
+                             expected)
+        self.assertEqual(cache.hits, 1)
+        cache.read(section, GENERIC_TEST_TEXT[:4])
+        self.assertEqual(cache.misses, 2)
+
+    def test_context(self):
+        def set_context(line, context):
+            context['Last'] = line
+            return line
+        cache = ResultCache(self.cache_dir)
+        for expected_hits in (0, 1):
+            context = {'Start': 1}
+            make_section([set_context]).read_cached(GENERIC_TEST_TEXT, cache,
+                                                    context)
+            self.assertEqual(cache.hits, expected_hits)
+            self.assertEqual(context['Last'], 'EndSection Name: B')
+        # A different initial context is a different entry.
+        cache.read(make_section([set_context]), GENERIC_TEST_TEXT,
+                   {'Start': 2})
+        self.assertEqual(cache.misses, 2)
+
+    def test_unpicklable_result(self):
+        cache = ResultCache(self.cache_dir)
+        section = Section(assemble=lambda lines: (line for line in lines))
+        cache.read(section, GENERIC_TEST_TEXT)
+        self.assertListEqual(cache.entries(), [])
+
+    def test_lru_eviction(self):
+        cache = ResultCache(self.cache_dir)
+        section = make_section()
+        sources = [GENERIC_TEST_TEXT[:4 + index] for index in range(3)]
+        cache.read(section, sources[0])
+        entry_size = cache.size()
+        cache.max_bytes = entry_size * 2 + entry_size // 2
+        cache.read(section, sources[1])
+        # Give the entries distinct, old use times; the hit on sources[0]
+        # then makes it the most recently used.
+        for number, entry in enumerate(cache.entries()):
+            os.utime(entry.path, ns=(number, number))
+        cache.read(section, sources[0])
+        self.assertEqual(cache.hits, 1)
+        cache.read(section, sources[2])
+        self.assertEqual(len(cache.entries()), 2)
+        cache.read(section, sources[0])
+        self.assertEqual(cache.hits, 2)
+        cache.read(section, sources[1])
+        self.assertEqual(cache.misses, 4)
+
+    def test_clear(self):
+        cache = ResultCache(self.cache_dir)
+        cache.read(make_section(), GENERIC_TEST_TEXT)
+        cache.clear()
+        self.assertEqual(cache.size(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -283,6 +283,83 @@ class TestRuleSet(unittest.TestCase):
         self.assertEqual(result, expected)
 
 
+class TestRuleSetPrefixIndex(unittest.TestCase):
+    '''START string Rules are indexed by prefix without changing which Rule
+    is selected.
+    '''
+    def setUp(self):
+        self.rules = [
+            Rule('Plan:', 'START', pass_method=lambda line: 'Plan', name='Plan'),
+            Rule(re.compile(r'P\w+ sum'), 'START',
+                 pass_method=lambda line: 'RE', name='RE'),
+            Rule(['Plan sum:', 'Course:'], 'START',
+                 pass_method=lambda line: 'Sum or Course', name='Sum'),
+            Rule('Structure', 'IN', pass_method=lambda line: 'In',
+                 name='In'),
+            Rule('Structure:', 'START', pass_method=lambda line: 'Structure',
+                 name='Structure'),
+            ]
+        self.test_set = RuleSet(self.rules,
+                                default=lambda line: 'Default')
+        self.test_pairs = [
+            ('Plan: PARR', 'Plan'),
+            ('Plan sum: Sum1', 'RE'),
+            ('Course: C1', 'Sum or Course'),
+            ('Structure: PTV', 'In'),
+            ('Comment: Structure', 'In'),
+            ('Pla', 'Default'),
+            ('', 'Default'),
+            ('Volume [cc]: 12.3', 'Default'),
+            ]
+
+    def test_rule_selection(self):
+        for line, expected in self.test_pairs:
+            with self.subTest(line=line):
+                self.assertEqual(self.test_set.apply(line), expected)
+
+    def test_candidates_keep_order(self):
+        candidates = self.test_set.candidate_rules('Plan sum: Sum1')
+        names = [rule.name for rule in candidates]
+        self.assertListEqual(names, ['RE', 'Sum', 'In'])
+
+    def test_unindexed_candidates(self):
+        candidates = self.test_set.candidate_rules('Random text')
+        names = [rule.name for rule in candidates]
+        self.assertListEqual(names, ['RE', 'In'])
+
+    def test_non_string_item(self):
+        candidates = self.test_set.candidate_rules(['Plan:', 'PARR'])
+        self.assertListEqual(list(candidates), self.rules)
+
+    def test_rebuild_index(self):
+        self.test_set.rule_seq = self.rules[3:]
+        self.assertEqual(self.test_set.apply('Plan: PARR'), 'Default')
+        self.assertEqual(self.test_set.apply('Structure: PTV'), 'In')
+
+    def test_fail_method_side_effects(self):
+        # A Rule whose fail method is a function is always applied.
+        def count_misses(line, event, context):
+            context['Misses'] = context.get('Misses', 0) + 1
+            return line
+        rule_set = RuleSet([Rule('Plan:', 'START', fail_method=count_misses),
+                            Rule('Course:', 'START', pass_method='Value')])
+        context = {}
+        for line in ['Course: C1', 'Random text', 'Plan: PARR']:
+            rule_set.apply(line, context)
+        self.assertEqual(context['Misses'], 2)
+        self.assertListEqual(
+            [rule.name for rule in rule_set.candidate_rules('Course: C1')],
+            ['Rule', 'Rule'])
+
+    def test_skipped_rule_event_reset(self):
+        # A skipped Rule's event is left as a failed test leaves it.
+        self.test_set.apply('Plan: PARR')
+        self.assertTrue(self.rules[0].event.test_passed)
+        self.test_set.apply('Course: C1')
+        self.assertFalse(self.rules[0].event.test_passed)
+        self.assertIsNone(self.rules[0].event.test_value)
+
+
 class TestSingleLineParse(unittest.TestCase):
     def setUp(self):
         test_text = '\n'.join([
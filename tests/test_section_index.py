@@ -0,0 +1,184 @@
+import json
+import multiprocessing
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from sections import Rule, Section
+from section_index import SectionIndex, default_index_path
+
+
+#%% Test Text
+GENERIC_TEST_TEXT = [
+    'Text to be ignored',
+    'StartSection A',
+    'Title: A1',
+    'Field: 1',
+    'Field: 2',
+    'EndSection A',
+    'Between sections',
+    'StartSection B',
+    'Title: B1',
+    'Field: 3',
+    'Title: B2',
+    'Field: 4',
+    'Field: 5',
+    'EndSection B',
+    'More text to be ignored',
+    ]
+
+
+def make_nested_section()->Section:
+    title = Section(name='Title',
+                    end_section=('Title', 'START', 'Before'),
+                    end_on_first_item=False,
+                    processor=[Rule('Title', pass_method='Original',
+                                    fail_method='None')],
+                    assemble=lambda items: [item for item in items if item])
+    record = Section(name='Record',
+                     start_section=('Title', 'START', 'Before'),
+                     end_section=('Title', 'START', 'Before'),
+                     processor=[title])
+    block = Section(name='Block',
+                    start_section=('StartSection', 'START', 'Before'),
+                    end_section=('EndSection', 'START', 'After'),
+                    processor=[record])
+    return block
+
+
+def add_label(item: str, context)->str:
+    return f"{context['Label']}: {item}"
+
+
+class TestSectionIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = Path(self.temp_dir.name) / 'test_text.txt'
+        self.file_path.write_text('\n'.join(GENERIC_TEST_TEXT) + '\n')
+        self.section = make_nested_section()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_lines(self):
+        with open(self.file_path, newline='') as text_file:
+            return list(text_file)
+
+    def test_entries(self):
+        index = SectionIndex.build(self.section, self.file_path)
+        blocks = index.find()
+        self.assertListEqual([(entry.start_line, entry.end_line)
+                              for entry in blocks], [(1, 6), (7, 14)])
+        records = index.find('Record')
+        self.assertEqual(len(records), 3)
+        self.assertTrue(all(entry.path == 'Block/Record'
+                            for entry in records))
+        self.assertIs(index.entries[records[2].parent], blocks[1])
+
+    def test_byte_offsets(self):
+        index = SectionIndex.build(self.section, self.file_path)
+        data = self.file_path.read_bytes()
+        for entry in index.entries:
+            text = data[entry.start_byte:entry.end_byte].decode()
+            lines = self.read_lines()[entry.start_line:entry.end_line]
+            self.assertEqual(text, ''.join(lines))
+
+    def test_read_matches_full_read(self):
+        expected = list(self.section(self.read_lines()))
+        result = self.section.read_indexed(self.file_path)
+        self.assertListEqual(result, expected)
+
+    def test_read_single_instance(self):
+        result = self.section.read_indexed(self.file_path, key='Record',
+                                           instance=2)
+        self.assertListEqual(result, [['Title: B2\n']])
+        result = self.section.read_indexed(self.file_path,
+                                           key='Block/Record/Title',
+                                           instance=-1)
+        self.assertListEqual(result, ['Title: B2\n'])
+
+    def test_unknown_key(self):
+        with self.assertRaises(KeyError):
+            self.section.read_indexed(self.file_path, key='Missing')
+
+    def test_index_saved(self):
+        self.section.read_indexed(self.file_path)
+        index_path = default_index_path(self.section, self.file_path)
+        self.assertTrue(index_path.exists())
+        index = SectionIndex.load(index_path)
+        self.assertTrue(index.is_current(self.section, self.file_path))
+        self.assertListEqual(index.entries,
+                             SectionIndex.build(self.section,
+                                                self.file_path).entries)
+
+    def test_rebuilt_when_file_changes(self):
+        self.section.read_indexed(self.file_path)
+        index_path = default_index_path(self.section, self.file_path)
+        with open(self.file_path, 'a') as text_file:
+            text_file.write('StartSection C\nTitle: C1\nEndSection C\n')
+        index = SectionIndex.load(index_path)
+        self.assertFalse(index.is_current(self.section, self.file_path))
+        result = self.section.read_indexed(self.file_path, key='Title')
+        self.assertEqual(result[-1], ['Title: C1\n'])
+
+    def test_rebuilt_when_section_changes(self):
+        index = SectionIndex.open(self.section, self.file_path)
+        self.section.end_section = ('Title', 'START', 'Before')
+        self.assertFalse(index.is_current(self.section, self.file_path))
+
+    def test_invalid_index_file(self):
+        index_path = default_index_path(self.section, self.file_path)
+        index_path.write_text(json.dumps({'version': 0}))
+        index = SectionIndex.open(self.section, self.file_path)
+        self.assertEqual(len(index.find()), 2)
+        self.assertTrue(os.path.getsize(index_path) > 20)
+
+
+class TestReadParallel(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = Path(self.temp_dir.name) / 'test_text.txt'
+        self.lines = [line + '\r\n' for line in GENERIC_TEST_TEXT * 3]
+        with open(self.file_path, 'w', newline='') as text_file:
+            text_file.writelines(self.lines)
+        self.section = make_nested_section()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_file_source(self):
+        expected = list(self.section(self.lines))
+        result = self.section.read_parallel(self.file_path, workers=2)
+        self.assertEqual(len(result), 6)
+        self.assertListEqual(result, expected)
+
+    def test_list_source(self):
+        expected = list(self.section(self.lines))
+        result = self.section.read_parallel(self.lines, workers=2,
+                                            chunk_size=2)
+        self.assertListEqual(result, expected)
+
+    def test_sequential(self):
+        expected = self.section.read_parallel(self.lines, workers=2)
+        result = self.section.read_parallel(self.lines, workers=0)
+        self.assertListEqual(result, expected)
+
+    def test_context_snapshot(self):
+        section = Section(name='Block',
+                          start_section=('StartSection', 'START', 'Before'),
+                          end_section=('EndSection', 'START', 'After'),
+                          processor=[add_label])
+        context = {'Label': 'File 1', 'Other': 'Not needed'}
+        result = section.read_parallel(
+            self.file_path, workers=1, context=context,
+            context_keys=['Label'],
+            mp_context=multiprocessing.get_context('spawn'))
+        self.assertEqual(result[0][0], 'File 1: StartSection A\r\n')
+        with self.assertRaises(KeyError):
+            section.read_parallel(self.lines, workers=0, context=context,
+                                  context_keys=['Missing'])
+
+
+if __name__ == '__main__':
+    unittest.main()
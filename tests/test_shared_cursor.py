@@ -0,0 +1,96 @@
+import unittest
+
+from buffered_iterator import BufferedIterator
+from sections import Section, SectionBreak
+
+
+#%% Test Text
+GENERIC_TEST_TEXT = [
+    'Head',
+    'Record 1',
+    'a',
+    '',
+    'Record 2',
+    'b',
+    'c',
+    'End',
+    ]
+
+
+def drop_blanks(lines):
+    for line in lines:
+        if line:
+            yield line
+
+
+def make_section()->Section:
+    record = Section(name='Record',
+                     start_section=('Record', 'START', 'Before'),
+                     end_section=('Record', 'START', 'Before'),
+                     processor=[drop_blanks])
+    return Section(name='All', start_section=('Head', 'START', 'After'),
+                   processor=[record])
+
+
+class TestSharedCursor(unittest.TestCase):
+    def test_supplied_source_shared(self):
+        source = BufferedIterator(GENERIC_TEST_TEXT)
+        section = Section(end_section=('Record 2', 'START', 'Before'))
+        self.assertListEqual(section.read(source), GENERIC_TEST_TEXT[:4])
+        self.assertIs(section.source, source)
+        # The item stepped back at the break is the next item in the source.
+        self.assertEqual(next(source), 'Record 2')
+
+    def test_unread_items_not_returned(self):
+        # Items dropped by the processor before the break are not presented
+        # to the next reader again.
+        source = BufferedIterator(GENERIC_TEST_TEXT)
+        section = Section(end_section=('Record 2', 'START', 'Before'),
+                          processor=[drop_blanks])
+        self.assertListEqual(section.read(source), GENERIC_TEST_TEXT[:3])
+        self.assertEqual(next(source), 'Record 2')
+
+    def test_compiled_supplied_source(self):
+        source = BufferedIterator(GENERIC_TEST_TEXT)
+        compiled = Section(end_section=('Record 2', 'START', 'Before'),
+                           processor=[drop_blanks]).compile()
+        self.assertListEqual(compiled.read(source), GENERIC_TEST_TEXT[:3])
+        self.assertEqual(next(source), 'Record 2')
+
+    def test_subsections(self):
+        expected = [['Record 1', 'a'], ['Record 2', 'b', 'c', 'End']]
+        self.assertListEqual(make_section().read(GENERIC_TEST_TEXT), expected)
+        self.assertListEqual(make_section().compile().read(GENERIC_TEST_TEXT),
+                             expected)
+
+    def test_deep_nesting(self):
+        # Pass-through levels, whose default end breaks never fire, give the
+        # same result read directly or compiled.
+        section = make_section()
+        for number in range(5):
+            section = Section(name=f'Level {number}', processor=[section])
+        expected = section.read(GENERIC_TEST_TEXT)
+        self.assertListEqual(section.compile().read(GENERIC_TEST_TEXT),
+                             expected)
+
+    def test_count_downs_end_together(self):
+        # Only one item is stepped back when two offset count downs end on
+        # the same item.
+        text = ['AB', 'x1', 'x2', 'x3', 'x4', 'x5']
+        expected = [['AB', 'x1', 'x2'], ['x3', 'x4', 'x5']]
+        end_breaks = [
+            [SectionBreak('B', location='END', break_offset=2),
+             SectionBreak('B', location='IN', break_offset=2)],
+            [SectionBreak('AB', location='START', break_offset=2),
+             SectionBreak('x1', location='START', break_offset=1)],
+            ]
+        for breaks in end_breaks:
+            inner = Section(end_section=breaks, end_on_first_item=True)
+            section = Section(processor=[inner])
+            with self.subTest(breaks=breaks):
+                self.assertListEqual(section.read(text), expected)
+                self.assertListEqual(section.compile().read(text), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
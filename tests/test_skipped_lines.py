@@ -0,0 +1,86 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from sections import Section, SkippedItems
+from text_reader import MappedTextFile
+
+
+#%% Test Text
+GENERIC_TEST_TEXT = [
+    'Text to be ignored 1',
+    'Text to be ignored 2',
+    'Text to be ignored 3',
+    'StartSection Name: A',
+    'Field: 1',
+    'EndSection Name: A',
+    'More text to be ignored',
+    ]
+
+
+def make_section(keep_skipped='All')->Section:
+    return Section(name='Block',
+                   start_section=('StartSection', 'START', 'Before'),
+                   end_section=('EndSection', 'START', 'After'),
+                   keep_skipped=keep_skipped)
+
+
+class TestKeepSkipped(unittest.TestCase):
+    def test_all(self):
+        section = make_section()
+        section.read(GENERIC_TEST_TEXT)
+        self.assertListEqual(section.context['Skipped Lines'],
+                             GENERIC_TEST_TEXT[:3])
+
+    def test_last_n(self):
+        section = make_section(2)
+        result = section.read(GENERIC_TEST_TEXT)
+        self.assertListEqual(section.context['Skipped Lines'],
+                             GENERIC_TEST_TEXT[1:3])
+        self.assertListEqual(result, GENERIC_TEST_TEXT[3:6])
+
+    def test_none(self):
+        section = make_section('none')
+        section.read(GENERIC_TEST_TEXT)
+        self.assertEqual(section.keep_skipped, 'None')
+        self.assertListEqual(section.context['Skipped Lines'], [])
+
+    def test_count(self):
+        section = make_section('Count')
+        section.read(GENERIC_TEST_TEXT)
+        self.assertEqual(section.context['Skipped Lines'],
+                         SkippedItems(3, 0, 3))
+
+    def test_compiled(self):
+        for keep_skipped in ['All', 1, 'Count', 'None']:
+            with self.subTest(keep_skipped=keep_skipped):
+                section = make_section(keep_skipped)
+                section.read(GENERIC_TEST_TEXT)
+                expected = section.context['Skipped Lines']
+                compiled = make_section(keep_skipped).compile()
+                compiled.read(GENERIC_TEST_TEXT)
+                self.assertEqual(compiled.section.context['Skipped Lines'],
+                                 expected)
+
+    def test_count_byte_range(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = Path(temp_dir) / 'test.txt'
+            file_path.write_bytes('\n'.join(GENERIC_TEST_TEXT).encode())
+            with MappedTextFile(file_path) as source:
+                section = make_section('Count')
+                section.read(source)
+        skipped = section.context['Skipped Lines']
+        self.assertEqual(skipped.count, 3)
+        self.assertEqual(skipped.start_byte, 0)
+        self.assertEqual(skipped.end_byte,
+                         sum(len(line) + 1 for line in GENERIC_TEST_TEXT[:3]))
+
+    def test_invalid(self):
+        for keep_skipped in ['Some', -1, True, 1.5]:
+            with self.subTest(keep_skipped=keep_skipped):
+                with self.assertRaises(ValueError):
+                    make_section(keep_skipped)
+
+
+if __name__ == '__main__':
+    unittest.main()
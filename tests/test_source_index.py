@@ -0,0 +1,96 @@
+import unittest
+
+from buffered_iterator import BufferedIterator
+from sections import Section, SourceIndex
+
+
+#%% Test Text
+GENERIC_TEST_TEXT = [
+    'Text to be ignored',
+    'StartSection Name: A',
+    'Title: A1',
+    'Field: 1',
+    'EndSection Name: A',
+    'StartSection Name: B',
+    'Title: B1',
+    'Field: 2',
+    'EndSection Name: B',
+    'More text to be ignored',
+    ]
+
+
+def make_section(track_source_index=True)->Section:
+    field = Section(name='Field',
+                    start_section=('Field', 'START', 'Before'),
+                    end_section=('EndSection', 'START', 'Before'),
+                    track_source_index=track_source_index)
+    block = Section(name='Block',
+                    start_section=('StartSection', 'START', 'Before'),
+                    end_section=('EndSection', 'START', 'After'),
+                    processor=[field],
+                    track_source_index=track_source_index)
+    return Section(name='All', processor=[block],
+                   track_source_index=track_source_index)
+
+
+class TestSourceIndex(unittest.TestCase):
+    def test_complete(self):
+        index = SourceIndex(2)
+        for value in [3, 3, 5, 6]:
+            index.append(value)
+        self.assertEqual(len(index), 5)
+        self.assertListEqual(index.tolist(), [2, 3, 3, 5, 6])
+        self.assertEqual(index[0], 2)
+        self.assertEqual(index[-2], 5)
+
+    def test_recent(self):
+        index = SourceIndex(2, keep=3)
+        for value in range(3, 10):
+            index.append(value)
+        self.assertEqual(len(index), 8)
+        self.assertEqual(index[0], 2)
+        self.assertListEqual([index[-3], index[-2], index[-1]], [7, 8, 9])
+        with self.assertRaises(IndexError):
+            index[-4]  # pylint: disable=pointless-statement
+        with self.assertRaises(IndexError):
+            index[8]  # pylint: disable=pointless-statement
+        with self.assertRaises(ValueError):
+            index.tolist()
+
+
+class TestSectionTracking(unittest.TestCase):
+    def test_source_index(self):
+        section = Section(processor=[lambda line: [line, line]])
+        section.read(GENERIC_TEST_TEXT[:3])
+        self.assertListEqual(section.source_index, [0, 1, 2, 3])
+        self.assertEqual(section.item_count, 3)
+
+    def test_untracked(self):
+        section = Section(track_source_index=False)
+        section.read(GENERIC_TEST_TEXT)
+        self.assertIsNone(section.source_index)
+        self.assertEqual(section.item_count, len(GENERIC_TEST_TEXT))
+        self.assertEqual(section.source_item_count, len(GENERIC_TEST_TEXT))
+
+    def test_untracked_subsections(self):
+        expected = make_section().read(GENERIC_TEST_TEXT)
+        result = make_section(track_source_index=False).read(GENERIC_TEST_TEXT)
+        self.assertListEqual(result, expected)
+
+    def test_untracked_compiled(self):
+        expected = make_section().read(GENERIC_TEST_TEXT)
+        compiled = make_section(track_source_index=False).compile()
+        self.assertListEqual(compiled.read(GENERIC_TEST_TEXT), expected)
+
+    def test_untracked_supplied_source(self):
+        # The supplied source is positioned after the last item in the
+        # section, even though the section ended by stepping back.
+        source = BufferedIterator(GENERIC_TEST_TEXT)
+        section = Section(end_section=('StartSection', 'START', 'Before'),
+                          track_source_index=False)
+        self.assertListEqual(section.read(source), GENERIC_TEST_TEXT[:1])
+        self.assertEqual(next(source), GENERIC_TEST_TEXT[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
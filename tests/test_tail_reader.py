@@ -0,0 +1,109 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from sections import Section
+from tail_reader import ParseCheckpoint, TailReader
+
+
+#%% Test Text
+GENERIC_TEST_TEXT = [
+    'Header',
+    'StartSection Name: A',
+    'Field: 1',
+    'StartSection Name: B',
+    'Field: 2',
+    ]
+APPENDED_TEXT = [
+    'Field: 3',
+    'StartSection Name: C',
+    'Field: 4',
+    ]
+
+
+def count_sections(line, context):
+    context['Count'] = context.get('Count', 0) + 1
+    return line.strip()
+
+
+def make_section()->Section:
+    return Section(name='Block',
+                   start_section=('StartSection', 'START', 'Before'),
+                   end_section=('StartSection', 'START', 'Before'),
+                   processor=[count_sections])
+
+
+def write_lines(file_path, lines, mode='w'):
+    with open(file_path, mode, encoding='utf-8', newline='') as text_file:
+        text_file.write(''.join(line + '\n' for line in lines))
+
+
+class TestTailReader(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = Path(self.temp_dir.name) / 'test.log'
+        write_lines(self.file_path, GENERIC_TEST_TEXT)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_incomplete_section_held(self):
+        reader = TailReader(make_section(), self.file_path)
+        self.assertListEqual(reader.read_new(),
+                             [['StartSection Name: A', 'Field: 1']])
+        # The checkpoint is at the start of section B.
+        self.assertEqual(reader.checkpoint.line_number, 3)
+        self.assertEqual(reader.checkpoint.offset,
+                         sum(len(line) + 1 for line in GENERIC_TEST_TEXT[:3]))
+        # Nothing new has been completed.
+        self.assertListEqual(reader.read_new(), [])
+
+    def test_resume(self):
+        items, checkpoint = make_section().read_tail(self.file_path)
+        write_lines(self.file_path, APPENDED_TEXT, mode='a')
+        new_items, checkpoint = make_section().read_tail(self.file_path,
+                                                         checkpoint)
+        self.assertListEqual(new_items, [['StartSection Name: B', 'Field: 2',
+                                          'Field: 3']])
+        final_items, _ = make_section().read_tail(self.file_path, checkpoint,
+                                                  final=True)
+        self.assertListEqual(final_items, [['StartSection Name: C',
+                                            'Field: 4']])
+        expected = list(make_section()(
+            [line + '\n' for line in GENERIC_TEST_TEXT + APPENDED_TEXT]))
+        expected = [[line.strip() for line in item] for item in expected]
+        self.assertListEqual(items + new_items + final_items, expected)
+
+    def test_saved_checkpoint_and_context(self):
+        reader = TailReader(make_section(), self.file_path)
+        reader.read_new()
+        self.assertEqual(reader.checkpoint.context['Count'], 2)
+        checkpoint_path = Path(self.temp_dir.name) / 'test.checkpoint'
+        reader.checkpoint.save(checkpoint_path)
+        checkpoint = ParseCheckpoint.load(checkpoint_path)
+        self.assertEqual(checkpoint, reader.checkpoint)
+        write_lines(self.file_path, APPENDED_TEXT, mode='a')
+        reader = TailReader(make_section(), self.file_path, checkpoint)
+        reader.read_new()
+        self.assertEqual(reader.checkpoint.context['Count'], 5)
+        self.assertListEqual(reader.checkpoint.previous_items[-1:],
+                             ['Field: 3\n'])
+
+    def test_partial_line(self):
+        with open(self.file_path, 'a', encoding='utf-8') as text_file:
+            text_file.write('StartSection Name: C')
+        reader = TailReader(make_section(), self.file_path)
+        # The unfinished line does not end section B.
+        self.assertEqual(len(reader.read_new()), 1)
+
+    def test_replaced_file(self):
+        reader = TailReader(make_section(), self.file_path)
+        reader.read_new()
+        write_lines(self.file_path, ['StartSection Name: X', 'Field: 9',
+                                     'StartSection Name: Y'])
+        self.assertListEqual(reader.read_new(),
+                             [['StartSection Name: X', 'Field: 9']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+
+import tracing
+from tracing import TraceCollector, trace
+from sections import Rule, Section
+
+
+#%% Test Text
+GENERIC_TEST_TEXT = [
+    'Text to be ignored',
+    'StartSection Name: A',
+    'EndSection Name: A',
+    'StartSection Name: B',
+    'EndSection Name: B',
+    'More text to be ignored',
+    ]
+
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.section = Section(
+            name='Trace Test',
+            start_section=('StartSection', 'START', 'Before'),
+            end_section=('EndSection', 'START', 'After'),
+            processor=[Rule('Name', pass_method='Original',
+                            fail_method='Original', name='Name Rule')]
+            )
+
+    def test_tracing_disabled_by_default(self):
+        self.assertFalse(tracing.tracing_enabled())
+        self.assertIsNone(tracing.trace_hook)
+
+    def test_hook_restored(self):
+        collector = TraceCollector()
+        with trace(collector):
+            self.assertIs(tracing.trace_hook, collector)
+        self.assertIsNone(tracing.trace_hook)
+
+    def test_event_kinds(self):
+        collector = TraceCollector()
+        with trace(collector):
+            self.section.read(GENERIC_TEST_TEXT)
+        kinds = {event.kind for event in collector.events}
+        self.assertSetEqual(kinds, {tracing.ITEM_FETCHED,
+                                    tracing.TRIGGER_EVALUATED,
+                                    tracing.BREAK_FIRED,
+                                    tracing.STAGE_OUTPUT,
+                                    tracing.ITEMS_SKIPPED,
+                                    tracing.STAGE_TIMED,
+                                    tracing.ASSEMBLE_TIMED})
+
+    def test_stage_output_matches_read(self):
+        collector = TraceCollector(kinds=[tracing.STAGE_OUTPUT])
+        with trace(collector):
+            result = self.section.read(GENERIC_TEST_TEXT)
+        output = [event.value for event in collector.events]
+        self.assertListEqual(output, result)
+
+    def test_break_fired(self):
+        collector = TraceCollector(kinds=[tracing.BREAK_FIRED])
+        with trace(collector):
+            self.section.read(GENERIC_TEST_TEXT)
+        self.assertListEqual([event.value for event in collector.events],
+                             ['SectionBreak', 'SectionBreak'])
+
+    def test_timeline(self):
+        collector = TraceCollector()
+        with trace(collector):
+            self.section.read(GENERIC_TEST_TEXT)
+        timeline = collector.timeline()
+        self.assertListEqual(list(timeline.keys()), ['Trace Test'])
+        summary = collector.summary()['Trace Test']
+        self.assertEqual(summary[tracing.STAGE_OUTPUT], 2)
+        self.assertGreaterEqual(summary['Duration'], 0)
+
+    def test_max_events(self):
+        collector = TraceCollector(max_events=3)
+        with trace(collector):
+            self.section.read(GENERIC_TEST_TEXT)
+        self.assertEqual(len(collector.events), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
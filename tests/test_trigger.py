@@ -132,5 +132,61 @@ class TestReTriggers(unittest.TestCase):
         self.assertIsNone(event)
 
 
+class TestMultiStringTriggers(unittest.TestCase):
+    '''List of string sentinels report the first matching sentinel in the
+    list for every location.
+    '''
+    def check_winner(self, sentinel, location, line, expected):
+        trigger = Trigger(sentinel, location=location, name='Multi')
+        is_match = trigger.evaluate(line)
+        if expected is None:
+            self.assertFalse(is_match)
+            self.assertIsNone(trigger.event.test_value)
+        else:
+            self.assertTrue(is_match)
+            self.assertEqual(trigger.event.test_value, expected)
+            self.assertEqual(trigger.event.test_name, expected)
+
+    def test_start_precedence(self):
+        self.check_winner(['Plan', 'Plan sum:'], 'START',
+                          'Plan sum: Plan Sum', 'Plan')
+        self.check_winner(['Plan sum:', 'Plan'], 'START',
+                          'Plan sum: Plan Sum', 'Plan sum:')
+        self.check_winner(['Plan:', 'Plan sum:'], 'START',
+                          'Comment: Plan sum:', None)
+
+    def test_in_precedence(self):
+        # 'dose' occurs earlier in the line, but 'Total' is first in the list.
+        self.check_winner(['Total', 'dose'], 'IN',
+                          'dose [cGy]: Total', 'Total')
+        self.check_winner(['Total', 'dose'], None,
+                          'dose [cGy]: 5000', 'dose')
+
+    def test_end_precedence(self):
+        self.check_winner(['cGy', 'Dose cGy'], 'END',
+                          'Max Dose cGy', 'cGy')
+        self.check_winner(['Dose cGy', 'cGy'], 'END',
+                          'Max Dose cGy', 'Dose cGy')
+        self.check_winner(['Gy', '%'], 'END', 'Max Dose cGy ', None)
+
+    def test_full_match(self):
+        self.check_winner(['Plan', 'Plan sum:'], 'FULL',
+                          'Plan sum:', 'Plan sum:')
+        self.check_winner(['Plan', 'Plan sum:'], 'FULL',
+                          'Plan sum: Plan Sum', None)
+
+    def test_special_characters(self):
+        self.check_winner(['% for dose (%):', '[cGy]'], 'IN',
+                          'Prescribed dose [cGy]: 5000', '[cGy]')
+
+    def test_empty_sentinel(self):
+        self.check_winner(['Plan', ''], 'START', 'Course: C1', '')
+
+    def test_non_string_item(self):
+        trigger = Trigger(['a', 'b'], location='IN')
+        self.assertTrue(trigger.evaluate(['x', 'b']))
+        self.assertEqual(trigger.event.test_value, 'b')
+
+
 if __name__ == '__main__':
     unittest.main()